@@ -12,12 +12,14 @@ class BetanoScraper:
 
     def __init__(self, output_file="betano_data.json",
                  executable_path=r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-                 headless=True):
+                 headless=True, url='https://www.betano.bg/en/live/', sport="soccer"):
         self.executable_path = executable_path
         self.headless = headless
-        self.url = 'https://www.betano.bg/en/live/'
+        self.url = url
+        self.sport = sport
         self.output_file = output_file
-        self.previous_data = []
+        self.previous_digest = None  # hash of the last written payload, not a copy of it
+        self.last_html = None  # markup of the latest extraction, for the capture archive
         self.REFRESH_INTERVAL = 10
         logging.basicConfig(level=logging.INFO)
 
@@ -40,6 +42,13 @@ class BetanoScraper:
         except Exception:
             return None
 
+    @staticmethod
+    def extract_event_id(match):
+        """Betano event id taken from the card's event link (/live/<slug>/<id>/)"""
+        link = match.select_one('a[href]')
+        found = re.search(r'/(\d{5,})/?', link['href']) if link else None
+        return found.group(1) if found else None
+
     async def setup_browser(self):
         """Browser setup with anti-bot measures"""
         return await launch(
@@ -61,7 +70,10 @@ class BetanoScraper:
             time_str = self.safe_text(time_element, "00:00")
             minutes = self.extract_time_minutes(time_str)
 
-            if minutes is None or minutes > 120:
+            if self.sport != "soccer":
+                # Set/quarter clocks don't map to match minutes; keep the event regardless
+                minutes = minutes if minutes is not None and minutes <= 120 else 0
+            elif minutes is None or minutes > 120:
                 return None
 
             # Teams extraction
@@ -85,6 +97,7 @@ class BetanoScraper:
             odds = odds[:3] + ["N/A"] * (3 - len(odds))  # Ensure 3 odds
 
             return {
+                'event_id': self.extract_event_id(match),
                 'minutes': minutes,
                 'time_str': time_str,
                 'teams': teams,
@@ -103,14 +116,20 @@ class BetanoScraper:
         await asyncio.sleep(3)  # Allow dynamic loading
 
         content = await page.content()
-        soup = BeautifulSoup(content, 'html.parser')
-        matches = soup.select('[data-qa="event-card"]')
+        self.last_html = content
+        return await self.parse_html(content)
 
+    async def parse_html(self, content):
+        """Parse live page markup into match dicts (also used to replay captured pages)"""
+        soup = BeautifulSoup(content, 'html.parser')
         valid_matches = []
-        for match in matches:
-            match_data = await self.extract_match_data(match)
-            if match_data:
-                valid_matches.append(match_data)
+        try:
+            for match in soup.select('[data-qa="event-card"]'):
+                match_data = await self.extract_match_data(match)
+                if match_data:
+                    valid_matches.append(match_data)
+        finally:
+            soup.decompose()  # break the tree's reference cycles so it is freed right away
 
         return sorted(valid_matches, key=lambda x: x['minutes'], reverse=True)
 
@@ -130,11 +149,13 @@ class BetanoScraper:
 
     def save_to_file(self, matches):
         """Original saving logic"""
-        if matches != self.previous_data:
+        payload = json.dumps(matches, ensure_ascii=False, indent=4)
+        digest = hash(payload)
+        if digest != self.previous_digest:
             with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump(matches, f, ensure_ascii=False, indent=4)
-            self.previous_data = matches.copy()
-            logging.info(f"Data saved to {self.output_file}")
+                f.write(payload)
+            self.previous_digest = digest
+            logging.debug(f"Data saved to {self.output_file}")
 
     async def monitor_page(self):
         """Enhanced monitoring loop"""
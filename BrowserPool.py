@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import time
+
+from pyppeteer.errors import NetworkError
+
+try:
+    import psutil
+except ImportError:  # per-instance CPU / memory figures are optional
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserEndpoint:
+    """One local Chrome instance reachable over CDP on its own debugging port."""
+
+    def __init__(self, port):
+        self.port = port
+        self.process = None
+        self.browser = None
+        self.connected = False  # CDP answered the last probe (or the connect that set browser)
+        self.pages = {}  # page -> key of the provider it serves; a key briefly has two while recycling
+        self.cpu = None  # % of the whole machine, summed over the Chrome process tree
+        self.rss = None  # bytes, summed over the Chrome process tree
+        self.failures = 0
+        self.next_attempt = 0
+        self._processes = {}  # pid -> psutil.Process, kept so cpu_percent has a baseline
+
+    async def probe(self, timeout=5):
+        """Cheap CDP round trip (Browser.getVersion); a closed or hung connection marks the instance dead."""
+        if self.browser is None:
+            self.connected = False
+            return False
+        try:
+            await asyncio.wait_for(self.browser.version(), timeout)
+            self.connected = True
+        except (NetworkError, ConnectionError, asyncio.TimeoutError):
+            self.connected = False
+        return self.connected
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def sample(self):
+        if psutil is None or not self.alive:
+            self.cpu = self.rss = None
+            return
+        try:
+            root = psutil.Process(self.process.pid)
+            tree = [root] + root.children(recursive=True)
+        except psutil.Error:
+            self.cpu = self.rss = None
+            return
+        self._processes = {p.pid: self._processes.get(p.pid, p) for p in tree}
+        cpu = rss = 0
+        for process in self._processes.values():
+            try:
+                cpu += process.cpu_percent(None)
+                rss += process.memory_info().rss
+            except psutil.Error:
+                continue  # renderer exited between listing and sampling
+        self.cpu = cpu / (psutil.cpu_count() or 1)
+        self.rss = rss
+
+
+class BrowserPool:
+    """
+    Provider pages spread over several Chrome instances instead of one.
+    New pages go to the connected instance with the fewest pages, skipping
+    saturated ones; a crashed instance is relaunched with backoff and its pages
+    restarted elsewhere, and one page at a time is moved off an instance whose
+    CPU stays above saturation_cpu.
+    """
+
+    def __init__(self, ports, launch, connect, saturation_cpu=80.0, move_cooldown=120, max_backoff=120):
+        self.endpoints = [BrowserEndpoint(port) for port in ports]
+        self.launch = launch  # port -> subprocess.Popen of the Chrome instance
+        self.connect = connect  # async port -> pyppeteer Browser
+        self.saturation_cpu = saturation_cpu
+        self.move_cooldown = move_cooldown
+        self.max_backoff = max_backoff
+        self.assignments = {}  # page -> endpoint
+        self.last_move = 0
+
+    def is_connected(self):
+        """Whether any instance answered its last probe; cheap enough for the Tk thread."""
+        return any(endpoint.connected for endpoint in self.endpoints)
+
+    async def probe(self):
+        """Probe every instance's CDP connection; True when at least one answers."""
+        return any(await asyncio.gather(*(endpoint.probe() for endpoint in self.endpoints)))
+
+    def saturated(self, endpoint):
+        return endpoint.cpu is not None and endpoint.cpu >= self.saturation_cpu
+
+    async def start_endpoint(self, endpoint, attempts=10):
+        if not endpoint.alive:
+            if endpoint.process is None:
+                # Chrome left running by a previous session is reused with its tabs (warm start)
+                try:
+                    endpoint.browser = await self.connect(endpoint.port)
+                    endpoint.connected = True
+                    endpoint.failures = 0
+                    logger.info(f"Reattached to running Chrome on port {endpoint.port}.")
+                    return True
+                except Exception:
+                    pass
+            endpoint.process = self.launch(endpoint.port)
+        for _ in range(attempts):
+            try:
+                endpoint.browser = await self.connect(endpoint.port)
+                endpoint.connected = True
+                endpoint.failures = 0
+                logger.info(f"Connected to Chrome on port {endpoint.port}.")
+                return True
+            except Exception as e:
+                logger.debug(f"Connection to port {endpoint.port} failed: {e}")
+                await asyncio.sleep(1)
+        endpoint.failures += 1
+        endpoint.next_attempt = time.time() + min(2 ** endpoint.failures, self.max_backoff)
+        logger.warning(f"Chrome on port {endpoint.port} unreachable (attempt {endpoint.failures})")
+        return False
+
+    async def start(self, attempts=10):
+        """Launch and connect every instance concurrently; True when at least one is usable."""
+        results = await asyncio.gather(*(self.start_endpoint(e, attempts) for e in self.endpoints
+                                         if not e.connected))
+        return any(results) or self.is_connected()
+
+    async def reconnect(self):
+        return await self.start(attempts=3)
+
+    def least_loaded(self):
+        connected = [e for e in self.endpoints if e.connected]
+        if not connected:
+            raise RuntimeError("no Chrome instance connected")
+        candidates = [e for e in connected if not self.saturated(e)] or connected
+        return min(candidates, key=lambda e: (len(e.pages), e.cpu or 0))
+
+    async def new_page(self, key):
+        """Open a tab for key on the least loaded instance."""
+        endpoint = self.least_loaded()
+        page = await endpoint.browser.newPage()
+        endpoint.pages[page] = key
+        self.assignments[page] = endpoint
+        return page
+
+    async def existing_pages(self):
+        """(page, endpoint) for every tab open on the connected instances."""
+        found = []
+        for endpoint in self.endpoints:
+            if not endpoint.connected:
+                continue
+            try:
+                found.extend((page, endpoint) for page in await endpoint.browser.pages())
+            except Exception as e:
+                logger.warning(f"Listing tabs on port {endpoint.port} failed: {e}")
+        return found
+
+    def adopt(self, page, key, endpoint):
+        """Account for a tab that was already open, as if new_page had opened it."""
+        endpoint.pages[page] = key
+        self.assignments[page] = endpoint
+
+    def release(self, page):
+        endpoint = self.assignments.pop(page, None)
+        if endpoint is not None:
+            endpoint.pages.pop(page, None)
+
+    async def maintain(self, restart):
+        """One balancing pass; restart(key) re-opens a provider, which lands via new_page."""
+        await self.probe()
+        for endpoint in self.endpoints:
+            endpoint.sample()
+        now = time.time()
+        for endpoint in self.endpoints:
+            if endpoint.connected:
+                continue
+            orphaned = set(endpoint.pages.values())
+            for page in list(endpoint.pages):
+                self.release(page)
+            if orphaned and self.is_connected():
+                logger.warning(f"Chrome on port {endpoint.port} lost, moving {len(orphaned)} page(s)")
+                for key in orphaned:
+                    restart(key)
+            if now >= endpoint.next_attempt:
+                await self.start_endpoint(endpoint, attempts=1)
+
+        if now - self.last_move < self.move_cooldown:
+            return
+        busy = [e for e in self.endpoints if e.connected and self.saturated(e) and len(e.pages) > 1]
+        spare = [e for e in self.endpoints if e.connected and not self.saturated(e)]
+        if busy and spare:
+            endpoint = max(busy, key=lambda e: e.cpu)
+            page, key = next(iter(endpoint.pages.items()))
+            logger.info(f"Chrome on port {endpoint.port} at {endpoint.cpu:.0f}% CPU, moving {key}")
+            self.release(page)
+            self.last_move = now
+            restart(key)
+
+    async def run(self, restart, interval=15):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.maintain(restart)
+            except Exception as e:
+                logger.error(f"Browser pool maintenance failed: {e}")
+
+    def metrics(self):
+        return [{'port': e.port, 'connected': e.connected, 'pages': len(e.pages), 'cpu': e.cpu,
+                 'rss_mb': e.rss / 2 ** 20 if e.rss is not None else None} for e in self.endpoints]
+
+    def terminate(self):
+        for endpoint in self.endpoints:
+            if endpoint.alive:
+                endpoint.process.terminate()
+                endpoint.process.wait()
@@ -0,0 +1,366 @@
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:  # gzip always works; zstd packs consecutive pages far tighter
+    zstandard = None
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(html):
+    """Hash of the markup with whitespace runs collapsed, so reflowed but identical pages dedupe."""
+    return hashlib.sha1(WHITESPACE.sub(' ', html).strip().encode('utf-8')).hexdigest()
+
+
+def _without_timestamps(value):
+    if isinstance(value, dict):
+        return {k: _without_timestamps(v) for k, v in value.items() if k != 'timestamp'}
+    if isinstance(value, list):
+        return [_without_timestamps(v) for v in value]
+    return value
+
+
+def rows_digest(rows):
+    """Digest of parsed rows ignoring capture timestamps, so two parses of one page compare equal."""
+    payload = json.dumps(_without_timestamps(rows), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class CaptureArchive:
+    """
+    Archive of the raw page markup each extraction parsed, for replaying parser changes.
+    Captures whose markup matches the previous one of the same provider/sport
+    (ignoring whitespace) are only indexed, pointing at the earlier file. The rest
+    are compressed with zstd against the previous capture as a dictionary, so a
+    page where a few odds moved costs a few KB; every keyframe_every-th capture
+    stands alone to bound the chain a reader has to unpack. Without zstandard
+    installed every capture is gzipped on its own.
+    index.jsonl holds one line per capture with the provider, sport, time and
+    what the live parser made of it (match count and digest).
+    Retention works on segments: a keyframe with the captures compressed
+    against it. Closed segments whose newest capture is older than max_age
+    seconds, and the oldest ones while the archive exceeds max_bytes, are
+    deleted together with their index lines, so whatever remains can be read.
+    """
+
+    def __init__(self, root, keyframe_every=50, level=6, max_bytes=None, max_age=None, check_every=60):
+        self.root = root
+        self.keyframe_every = keyframe_every
+        self.level = level
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.check_every = check_every  # seconds between age checks; a full archive is checked on every store
+        self.index_path = os.path.join(root, "index.jsonl")
+        self.streams = {}  # (provider, sport) -> state of the latest stored capture
+        self.segments = {}  # keyframe id -> {'files', 'bytes', 'last'}, oldest first
+        self.lock = threading.Lock()  # store() may run on executor threads
+        self.stored = 0
+        self.deduped = 0
+        self.bytes_raw = 0
+        self.bytes_stored = 0
+        self.bytes_on_disk = 0
+        self.pruned = 0
+        self.checked_at = 0.0
+        os.makedirs(root, exist_ok=True)
+        self._load_segments()
+
+    def _load_segments(self):
+        """Rebuild the segments of captures kept by earlier sessions from the index."""
+        if not os.path.exists(self.index_path):
+            return
+        chain_of = {}
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry['same_as']:
+                    chain = chain_of.get(entry['same_as'])
+                else:
+                    chain = entry['id'] if entry['base'] is None else chain_of.get(entry['base'])
+                    chain_of[entry['id']] = chain
+                if chain is None:
+                    continue
+                self._track(chain, entry)
+
+    def _track(self, chain, entry):
+        segment = self.segments.setdefault(chain, {'files': [], 'bytes': 0, 'last': 0.0})
+        if not entry['same_as']:
+            segment['files'].append(entry['path'])
+            segment['bytes'] += entry['bytes_stored']
+            self.bytes_on_disk += entry['bytes_stored']
+        segment['last'] = max(segment['last'], entry['captured_at'])
+
+    def _enforce(self, now):
+        """Delete expired segments and the oldest ones over max_bytes; the segments still being written stay."""
+        over = self.max_bytes is not None and self.bytes_on_disk > self.max_bytes
+        if not over and (self.max_age is None or now - self.checked_at < self.check_every):
+            return
+        self.checked_at = now
+        current = {stream['chain'] for stream in self.streams.values()}
+        doomed = set()
+        for chain, segment in list(self.segments.items()):
+            if chain in current:
+                continue
+            expired = self.max_age is not None and now - segment['last'] > self.max_age
+            if not expired and not (self.max_bytes is not None and self.bytes_on_disk > self.max_bytes):
+                continue
+            for path in segment['files']:
+                try:
+                    os.remove(os.path.join(self.root, path))
+                except FileNotFoundError:
+                    pass
+                try:
+                    os.rmdir(os.path.dirname(os.path.join(self.root, path)))
+                except OSError:
+                    pass  # the day's directory still holds other captures
+            doomed.update(segment['files'])
+            self.bytes_on_disk -= segment['bytes']
+            self.pruned += 1
+            del self.segments[chain]
+        if doomed:
+            self._rewrite_index(doomed)
+
+    def _rewrite_index(self, removed_paths):
+        kept = []
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    if json.loads(line)['path'] in removed_paths:
+                        continue
+                except ValueError:
+                    continue
+                kept.append(line)
+        temporary = self.index_path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.writelines(kept)
+        os.replace(temporary, self.index_path)
+
+    def store(self, provider, sport, html, captured_at, parsed):
+        """Archive one capture; returns its index entry, or None when there is no markup."""
+        if not html:
+            return None
+        raw = html.encode('utf-8')
+        digest = fingerprint(html)
+        with self.lock:
+            stream = self.streams.get((provider, sport))
+            entry = {
+                'id': f"{provider}_{sport}_{int(captured_at * 1000)}",
+                'provider': provider,
+                'sport': sport,
+                'captured_at': captured_at,
+                'sha1': digest,
+                'bytes_raw': len(raw),
+                'parsed_count': len(parsed) if parsed is not None else None,
+                'parsed_digest': rows_digest(parsed) if parsed is not None else None
+            }
+            if stream is not None and stream['sha1'] == digest:
+                entry.update(path=stream['path'], codec=stream['codec'], base=stream['base'],
+                             same_as=stream['id'], bytes_stored=0)
+                self._track(stream['chain'], entry)
+                self.deduped += 1
+            else:
+                directory = os.path.join(self.root, f"{provider}_{sport}",
+                                         datetime.fromtimestamp(captured_at).strftime('%Y%m%d'))
+                os.makedirs(directory, exist_ok=True)
+                keyframe = stream is None or stream['since_keyframe'] + 1 >= self.keyframe_every
+                if zstandard is not None:
+                    codec, suffix = 'zstd', '.html.zst'
+                    if keyframe:
+                        compressed = zstandard.ZstdCompressor(level=self.level).compress(raw)
+                        base = None
+                    else:
+                        dictionary = zstandard.ZstdCompressionDict(stream['raw'],
+                                                                   dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+                        compressed = zstandard.ZstdCompressor(level=self.level, dict_data=dictionary).compress(raw)
+                        base = stream['id']
+                else:
+                    codec, suffix, base = 'gzip', '.html.gz', None
+                    compressed = gzip.compress(raw, compresslevel=self.level)
+                path = os.path.join(directory, entry['id'] + suffix)
+                with open(path, 'wb') as f:
+                    f.write(compressed)
+                entry.update(path=os.path.relpath(path, self.root), codec=codec, base=base,
+                             same_as=None, bytes_stored=len(compressed))
+                chain = entry['id'] if base is None else stream['chain']
+                self.streams[(provider, sport)] = {
+                    'id': entry['id'], 'sha1': digest, 'raw': raw, 'path': entry['path'], 'chain': chain,
+                    'codec': codec, 'base': base, 'since_keyframe': 0 if base is None else stream['since_keyframe'] + 1
+                }
+                self._track(chain, entry)
+                self.stored += 1
+                self.bytes_stored += len(compressed)
+            self.bytes_raw += len(raw)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._enforce(captured_at)
+        return entry
+
+    def metrics(self):
+        return {'stored': self.stored, 'deduped': self.deduped, 'pruned': self.pruned,
+                'mb_on_disk': self.bytes_on_disk / 2 ** 20,
+                'ratio': self.bytes_raw / self.bytes_stored if self.bytes_stored else None}
+
+
+class CaptureReader:
+    """Walks an archive's index and unpacks captures, following zstd dictionary chains."""
+
+    def __init__(self, root):
+        self.root = root
+        self.latest = {}  # (provider, sport) -> (file id, markup) of the last unpacked file
+
+    def entries(self, providers=None, sport=None, since=None):
+        """(entry, index so far) for every matching capture, oldest first."""
+        by_id = {}
+        with open(os.path.join(self.root, "index.jsonl"), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a crash
+                by_id[entry['id']] = entry
+                if providers and entry['provider'] not in providers:
+                    continue
+                if sport and entry['sport'] != sport:
+                    continue
+                if since is not None and entry['captured_at'] < since:
+                    continue
+                yield entry, by_id
+
+    def load(self, entry, by_id):
+        """Markup of one capture."""
+        file_id = entry['same_as'] or entry['id']
+        stream = (entry['provider'], entry['sport'])
+        latest = self.latest.get(stream)
+        if latest is not None and latest[0] == file_id:
+            return latest[1]
+        with open(os.path.join(self.root, entry['path']), 'rb') as f:
+            compressed = f.read()
+        if entry['codec'] == 'gzip':
+            raw = gzip.decompress(compressed)
+        elif zstandard is None:
+            raise RuntimeError("zstandard is needed to read zstd captures")
+        elif entry['base'] is None:
+            raw = zstandard.ZstdDecompressor().decompress(compressed)
+        else:
+            base = self.load(by_id[entry['base']], by_id).encode('utf-8')
+            dictionary = zstandard.ZstdCompressionDict(base, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            raw = zstandard.ZstdDecompressor(dict_data=dictionary).decompress(compressed)
+        html = raw.decode('utf-8')
+        self.latest[stream] = (file_id, html)
+        return html
+
+
+def describe_diff(before, after, limit=3):
+    """A few human readable differences between two parses of the same page."""
+    before, after = _without_timestamps(before), _without_timestamps(after)
+    lines = []
+    if len(before) != len(after):
+        lines.append(f"{len(before)} -> {len(after)} rows")
+    for i, (a, b) in enumerate(zip(before, after)):
+        if a != b:
+            keys = sorted(set(a) | set(b)) if isinstance(a, dict) and isinstance(b, dict) else [None]
+            for key in keys:
+                old, new = (a, b) if key is None else (a.get(key), b.get(key))
+                if old != new:
+                    lines.append(f"row {i} {key or ''}: {json.dumps(old, default=str)[:80]} -> "
+                                 f"{json.dumps(new, default=str)[:80]}")
+                    break
+        if len(lines) >= limit:
+            break
+    return lines
+
+
+async def replay(args):
+    from utils.Providers import PROVIDERS
+    if args.parser_path:
+        for provider in PROVIDERS.values():
+            provider.scraper_path = args.parser_path
+
+    reference = {}
+    if args.against:
+        with open(args.against, 'r', encoding='utf-8') as f:
+            for line in f:
+                result = json.loads(line)
+                reference[result['id']] = result['rows']
+    saved = open(args.save, 'w', encoding='utf-8') if args.save else None
+
+    reader = CaptureReader(args.root)
+    scrapers = {}
+    parse_seconds = 0.0
+    captures = matches = bytes_parsed = 0
+    live_mismatches = reference_diffs = failures = 0
+    since = datetime.fromisoformat(args.since).timestamp() if args.since else None
+    try:
+        for entry, by_id in reader.entries(args.provider, args.sport, since):
+            provider = PROVIDERS.get(entry['provider'])
+            if provider is None:
+                continue
+            key = (entry['provider'], entry['sport'])
+            if key not in scrapers:
+                scrapers[key] = provider.create(entry['sport'], os.devnull, None)
+            html = reader.load(entry, by_id)
+            started = time.perf_counter()
+            try:
+                rows = await provider.parse(scrapers[key], html)
+            except Exception as e:
+                failures += 1
+                print(f"{entry['id']}: parser failed: {e}")
+                continue
+            parse_seconds += time.perf_counter() - started
+            captures += 1
+            matches += len(rows)
+            bytes_parsed += len(html)
+
+            if entry.get('parsed_digest') and rows_digest(rows) != entry['parsed_digest']:
+                live_mismatches += 1
+                if args.verbose:
+                    print(f"{entry['id']}: {len(rows)} rows, the live parse had {entry['parsed_count']}")
+            if entry['id'] in reference and rows_digest(rows) != rows_digest(reference[entry['id']]):
+                reference_diffs += 1
+                print(f"{entry['id']}:")
+                for line in describe_diff(reference[entry['id']], rows):
+                    print(f"    {line}")
+            if saved is not None:
+                saved.write(json.dumps({'id': entry['id'], 'rows': rows}, ensure_ascii=False, default=str) + '\n')
+    finally:
+        if saved is not None:
+            saved.close()
+
+    print(f"\n{captures} captures replayed, {failures} parser failures")
+    if parse_seconds:
+        print(f"Throughput: {captures / parse_seconds:.1f} captures/s, "
+              f"{bytes_parsed / parse_seconds / 2 ** 20:.1f} MB/s, {matches / parse_seconds:.0f} matches/s")
+    print(f"Differs from the live parse: {live_mismatches}")
+    if args.against:
+        print(f"Differs from {args.against}: {reference_diffs}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay archived page captures through the provider parsers")
+    parser.add_argument("root", help="capture directory (CAPTURE_DIR in mBot.py)")
+    parser.add_argument("--provider", nargs="+", help="only these providers")
+    parser.add_argument("--sport")
+    parser.add_argument("--since", help="ISO time, e.g. 2024-05-01T18:00")
+    parser.add_argument("--parser-path", help="directory holding the scraper modules to replay with "
+                                              "(e.g. a checkout of another version)")
+    parser.add_argument("--save", metavar="RESULTS", help="write the parsed rows as JSON lines")
+    parser.add_argument("--against", metavar="RESULTS", help="diff against rows saved by an earlier --save")
+    parser.add_argument("--verbose", action="store_true", help="list every capture that differs from the live parse")
+    args = parser.parse_args()
+    asyncio.run(replay(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import bisect
+
+from utils.MatchRecords import MergedEntry
+
+
+class SortedIndex:
+    """Ids kept ordered by a per-id sort key; updates move one item instead of re-sorting."""
+
+    def __init__(self):
+        self.items = []  # sorted (sort key, id)
+        self.keys = {}
+
+    def set(self, item_id, sort_key):
+        if self.keys.get(item_id) == sort_key:
+            return
+        self.discard(item_id)
+        bisect.insort(self.items, (sort_key, item_id))
+        self.keys[item_id] = sort_key
+
+    def discard(self, item_id):
+        sort_key = self.keys.pop(item_id, None)
+        if sort_key is not None:
+            position = bisect.bisect_left(self.items, (sort_key, item_id))
+            del self.items[position]
+
+    def __iter__(self):
+        return (item_id for _, item_id in self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class IncrementalBoard:
+    """
+    Merged board of one sport, maintained from provider deltas.
+    Every provider record feeds the merged entry with the same canonical key; only
+    entries whose inputs changed are re-merged and re-analyzed, and both the row
+    order and the opportunity ranking are updated in place.
+    """
+
+    def __init__(self, providers, analyze, row_sort_key, ttl, skew):
+        self.providers = list(providers)  # provider names, in display order
+        self.analyze = analyze  # entry -> list of opportunities
+        self.row_sort_key = row_sort_key  # entry -> sort key for display order
+        self.ttl = ttl
+        self.skew = skew
+        self.snapshots = dict.fromkeys(self.providers)  # last provider dict object applied
+        self.records = {provider: {} for provider in self.providers}
+        self.entries = {}
+        self.opportunities = {}  # key -> opportunities of that entry
+        self.time_sensitive = set()  # keys whose legs were too far apart in capture time
+        self.rows = SortedIndex()
+        self.ranked = SortedIndex()  # opportunity id -> ordered by profit
+        self.opportunity_by_id = {}
+
+    def apply(self, provider_dicts, now):
+        """Fold new provider snapshots ({provider name: {key: record}}) in; returns the recomputed keys."""
+        dirty = set()
+        for provider, snapshot in provider_dicts.items():
+            if snapshot is self.snapshots[provider]:
+                continue  # parse cache returned the same object: provider unchanged
+            self.snapshots[provider] = snapshot
+            previous_records = self.records[provider]
+            fresh = {k: r for k, r in snapshot.items() if now - r.captured_at <= self.ttl}
+            for key, record in fresh.items():
+                previous = previous_records.get(key)
+                if previous is None or not previous.same_quote(record):
+                    dirty.add(key)
+                elif previous.captured_at != record.captured_at:
+                    # Same prices, newer tick: only matters where capture alignment decides the result
+                    if key in self.opportunities or key in self.time_sensitive:
+                        dirty.add(key)
+                    elif key in self.entries:
+                        self.entries[key].refresh(provider, record)
+            dirty.update(previous_records.keys() - fresh.keys())
+            self.records[provider] = fresh
+        for key in dirty:
+            self._recompute(key)
+        return dirty
+
+    def _recompute(self, key):
+        for opportunity_id in [self._opportunity_id(o) for o in self.opportunities.pop(key, ())]:
+            self.ranked.discard(opportunity_id)
+            self.opportunity_by_id.pop(opportunity_id, None)
+        self.time_sensitive.discard(key)
+        parts = {provider: self.records[provider][key] for provider in self.providers
+                 if key in self.records[provider]}
+        entry = MergedEntry(key, parts)
+        if len(entry.original_teams) != 2:
+            self.entries.pop(key, None)
+            self.rows.discard(key)
+            return
+        self.entries[key] = entry
+        self.rows.set(key, self.row_sort_key(entry))
+
+        captured = [r.captured_at for r in parts.values()]
+        if max(captured) - min(captured) > self.skew:
+            self.time_sensitive.add(key)
+        opportunities = self.analyze(entry)
+        if opportunities:
+            self.opportunities[key] = opportunities
+        for opportunity in opportunities:
+            opportunity_id = self._opportunity_id(opportunity)
+            self.opportunity_by_id[opportunity_id] = opportunity
+            self.ranked.set(opportunity_id, -opportunity['profit'])
+
+    @staticmethod
+    def _opportunity_id(opportunity):
+        return opportunity['match_key'], opportunity['market'], opportunity['line'], opportunity['outcome']
+
+    def board_rows(self):
+        """(entry, opportunities) in display order."""
+        return [(self.entries[key], self.opportunities.get(key, [])) for key in self.rows]
+
+    def ranked_opportunities(self):
+        """Open opportunities, most profitable first."""
+        return [self.opportunity_by_id[opportunity_id] for opportunity_id in self.ranked]
@@ -0,0 +1,344 @@
+import argparse
+import asyncio
+import contextlib
+import html
+import io
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from utils.LogPipeline import setup_logging
+from utils.MatchRecords import main_market_keys
+from utils.Providers import PROVIDERS, point_providers_at
+
+POLL_MS = 100  # how often the stand-in pages pull fresh odds, part of the measured latency
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body><div id="root">{body}</div>
+<script>
+let version = {version};
+async function poll() {{
+  try {{
+    const response = await fetch('/fragment/{provider}/{sport}?v=' + version);
+    if (response.status === 200) {{
+      const update = await response.json();
+      version = update.version;
+      document.getElementById('root').innerHTML = update.html;
+    }}
+  }} catch (e) {{}}
+  setTimeout(poll, {poll_ms});
+}}
+setTimeout(poll, {poll_ms});
+</script></body></html>"""
+
+EFBET_OUTER = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Efbet</title></head>
+<body><iframe id="inplayAppMain" src="/efbet-frame/{sport}" width="1200" height="900"></iframe></body></html>"""
+
+
+def render_winbet(matches, labels):
+    parts = []
+    for m in matches:
+        odds = "".join(f'<span class="egtd-odds__odd">{o:.2f}</span>' for o in m['odds'])
+        parts.append(
+            f'<div class="egtd-s-accordion--level-2" data-event-id="{m["id"]}">'
+            f'<span class="team">{m["home"]}</span><span class="team">{m["away"]}</span>'
+            f'<div class="score">{m["score"][0]}</div><div class="score">{m["score"][1]}</div>'
+            f'<span class="egtd-s-clock">{m["minute"]}:00</span>{odds}</div>')
+    return "".join(parts)
+
+
+def render_betano(matches, labels):
+    parts = []
+    for m in matches:
+        odds = "".join(f'<div data-qa="event-selection"><span class="tw-text-sem-color-text-highlight">{o:.2f}</span></div>'
+                       for o in m['odds'])
+        parts.append(
+            f'<div data-qa="event-card"><a href="/live/match/{m["id"]}/">{m["home"]}</a>'
+            f'<div data-qa="live-event-time"><span>{m["minute"]}:00</span></div>'
+            f'<div data-qa="participants"><div class="tw-truncate">{m["home"]}</div>'
+            f'<div class="tw-truncate">{m["away"]}</div></div>'
+            f'<div data-qa="score"><span class="tw-text-white-snow">{m["score"][0]}</span>'
+            f'<span class="tw-text-white-snow">{m["score"][1]}</span></div>'
+            f'<div class="tw-flex tw-flex-row tw-flex-1 tw-items-center tw-justify-center">{odds}</div></div>')
+    return "".join(parts)
+
+
+def render_efbet(matches, labels):
+    parts = []
+    for m in matches:
+        selections = "".join(f'<div class="selection"><div class="selectionName">{label}</div>'
+                             f'<span class="priceUpDown">{o:.2f}</span></div>' for label, o in zip(labels, m['odds']))
+        parts.append(
+            f'<div class="eventTbl"><div class="evntTitle" data-idfoevent="{m["id"]}">{m["home"]} - {m["away"]}</div>'
+            f'<div class="min">{m["minute"]} minute</div>'
+            f'<div class="result"><span class="ng-binding">{m["score"][0]}-{m["score"][1]}</span></div>'
+            f'<div class="eventMarkets"><div class="marketTbl"><div class="marketName">Match Result</div>'
+            f'{selections}</div></div></div>')
+    return '<div class="sportEvents">' + "".join(parts) + '</div>'
+
+
+def render_orbitx(matches, labels):
+    parts = []
+    for m in matches:
+        containers = "".join(
+            f'<div class="betContentContainer">'
+            f'<div class="biab_back-0"><span class="styles_betOdds__bxapE">{o:.2f}</span>'
+            f'<span class="biab_bet-amount">€250</span></div>'
+            f'<div class="biab_lay-0"><span class="styles_betOdds__bxapE">{o + 0.04:.2f}</span>'
+            f'<span class="biab_bet-amount">€180</span></div></div>' for o in m['odds'])
+        parts.append(
+            f'<div class="biab_group-markets-table-row"><a href="/customer/sport/1/market/1.{m["id"]}">market</a>'
+            f'<span class="styles_sport__time__h1">{m["minute"]}\'</span>'
+            f'<span class="styles_sport__score__h1">{m["score"][0]}</span>'
+            f'<span class="styles_sport__score__h1">{m["score"][1]}</span>'
+            f'<div class="styles_participantsNames__-aY7w"><p>{m["home"]}</p><p>{m["away"]}</p></div>'
+            f'<span class="cursor-help">€12,345</span>{containers}</div>')
+    return "".join(parts)
+
+
+RENDERERS = {"WinBet": render_winbet, "Betano": render_betano, "Efbet": render_efbet, "OrbitX": render_orbitx}
+
+
+class StandInSites:
+    """
+    In-memory odds for every stand-in provider page plus the HTTP server that
+    renders them with each provider's DOM. Pages pull a fresh fragment every
+    POLL_MS, so odds change in place the way the live sites do.
+    """
+
+    def __init__(self, sport="soccer", match_count=20):
+        self.sport = sport
+        self.labels = [key[2] for key in main_market_keys(sport)]
+        self.lock = threading.Lock()
+        self.version = 0
+        # Team names avoid words the Efbet parser treats as navigation ("Home", "Sport", ...)
+        self.matches = {name: [{'id': 100000 + i, 'home': f"Lions {i}", 'away': f"Tigers {i}",
+                                'minute': 10 + i, 'score': [1, 0],
+                                'odds': [round(2.0 + 0.1 * k + 0.01 * i, 2) for k in range(len(self.labels))]}
+                               for i in range(match_count)]
+                        for name in RENDERERS}
+        self.server = None
+
+    def change(self, provider, index, outcome, odds):
+        """Apply one scripted odds change; returns the time it became visible to page polls."""
+        with self.lock:
+            self.matches[provider][index]['odds'][outcome] = odds
+            self.version += 1
+            return time.time()
+
+    def fragment(self, provider):
+        with self.lock:
+            return self.version, RENDERERS[provider](self.matches[provider], self.labels)
+
+    def start(self, port=0):
+        sites = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def send(self, status, body=b"", content_type="text/html; charset=utf-8"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Cache-Control", "no-store")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path, _, query = self.path.partition("?")
+                parts = path.strip("/").split("/")
+                if parts[0] == "fragment" and len(parts) == 3:
+                    provider = {name.lower(): name for name in RENDERERS}.get(parts[1])
+                    if provider is None:
+                        return self.send(404)
+                    version, body = sites.fragment(provider)
+                    if query == f"v={version}":
+                        return self.send(204)
+                    return self.send(200, json.dumps({'version': version, 'html': body}).encode(), "application/json")
+                if parts[0] == "efbet" and len(parts) == 2:
+                    return self.send(200, EFBET_OUTER.format(sport=parts[1]).encode())
+                provider = {name.lower(): name for name in RENDERERS}.get(parts[0])
+                if parts[0] == "efbet-frame":
+                    provider = "Efbet"
+                if provider is None or len(parts) != 2:
+                    return self.send(404)
+                version, body = sites.fragment(provider)
+                page = PAGE.format(title=html.escape(provider), body=body, version=version,
+                                   provider=provider.lower(), sport=parts[1], poll_ms=POLL_MS)
+                self.send(200, page.encode())
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def observed_odds(provider, path, sport, selection):
+    """{home team: odds of the selection} as mBot's loader would see the provider's output file."""
+    try:
+        file_time = os.path.getmtime(path)
+        rows = provider.read(path)
+    except (OSError, ValueError):
+        return {}  # not written yet, or caught mid-write
+    seen = {}
+    for row in rows:
+        normalized = provider.normalize(row, sport, file_time)
+        if normalized is None:
+            continue
+        _, teams, record = normalized
+        prices = record.back_prices if provider.exchange else record.prices
+        if teams and selection in prices:
+            seen[teams[0]] = prices[selection]
+    return seen
+
+
+async def run_harness(args):
+    sites = StandInSites(args.sport, args.matches)
+    base_url = sites.start()
+    point_providers_at(base_url)
+    providers = [PROVIDERS[name] for name in args.providers]
+    selections = main_market_keys(args.sport)
+    output_dir = tempfile.mkdtemp(prefix="mbot_latency_")
+    paths = {p.name: os.path.join(output_dir, f"{p.data_file}.json") for p in providers}
+
+    from pyppeteer import launch
+    from utils import mBot
+    mBot.capture_archive = None  # time extraction, not the archive's compression and disk writes
+    browser = await launch(headless=not args.headed, executablePath=args.chrome,
+                           args=['--no-sandbox', '--disable-dev-shm-usage', '--window-size=1920,1080'],
+                           handleSIGINT=False, handleSIGTERM=False, handleSIGHUP=False)
+    quiet = io.StringIO()
+    monitors = []
+    try:
+        with contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(quiet):
+            for provider in providers:
+                page = await browser.newPage()
+                scraper = provider.create(args.sport, paths[provider.name], page)
+                monitors.append(asyncio.ensure_future(mBot.monitor_provider(provider, scraper, page, args.sport)))
+
+            # Warm-up: every provider must have written its board once
+            deadline = time.time() + args.warmup
+            while time.time() < deadline and not all(
+                    observed_odds(p, paths[p.name], args.sport, selections[0]) for p in providers):
+                await asyncio.sleep(0.5)
+            ready = [p for p in providers if observed_odds(p, paths[p.name], args.sport, selections[0])]
+
+            # Scripted timeline: one change per provider per step, each to a unique price
+            pending = []
+            started = time.time()
+            for step in range(args.steps):
+                await asyncio.sleep(max(0.0, started + step * args.step_seconds - time.time()))
+                for provider in ready:
+                    index, outcome = step % args.matches, step % len(selections)
+                    odds = round(5.0 + 0.01 * (step + 1), 2)
+                    applied_at = sites.change(provider.name, index, outcome, odds)
+                    pending.append({'provider': provider, 'team': f"Lions {index}", 'selection': selections[outcome],
+                                    'odds': odds, 'applied_at': applied_at, 'extracted_at': None})
+                # Poll outputs until the next step is due
+                next_step = started + (step + 1) * args.step_seconds
+                while time.time() < next_step:
+                    observe(pending, paths, args.sport)
+                    await asyncio.sleep(0.05)
+
+            deadline = time.time() + args.max_wait
+            while time.time() < deadline and any(c['extracted_at'] is None for c in pending):
+                observe(pending, paths, args.sport)
+                await asyncio.sleep(0.05)
+    finally:
+        for task in monitors:
+            task.cancel()
+        await browser.close()
+        sites.stop()
+
+    report(pending, providers, ready, started, args.refresh)
+
+
+def observe(pending, paths, sport):
+    now = time.time()
+    cache = {}
+    for change in pending:
+        if change['extracted_at'] is not None:
+            continue
+        provider = change['provider']
+        key = (provider.name, change['selection'])
+        if key not in cache:
+            cache[key] = observed_odds(provider, paths[provider.name], sport, change['selection'])
+        if cache[key].get(change['team']) == change['odds']:
+            change['extracted_at'] = now
+
+
+def report(pending, providers, ready, started, refresh):
+    """Latency per provider and mode: 'extracted' (in the output file) and 'displayed' (next board refresh)."""
+    print(f"\n{'provider':<8} {'mode':<10} {'n':>4} {'missed':>6} {'p50':>7} {'p95':>7} {'max':>7}")
+    for provider in providers:
+        if provider not in ready:
+            print(f"{provider.name:<8} never produced data during warm-up")
+            continue
+        changes = [c for c in pending if c['provider'] is provider]
+        seen = [c for c in changes if c['extracted_at'] is not None]
+        extracted = [c['extracted_at'] - c['applied_at'] for c in seen]
+        # The analysis view refreshes on a fixed cadence; a change shows on the first refresh after extraction
+        displayed = [started + math.ceil((c['extracted_at'] - started) / refresh) * refresh - c['applied_at']
+                     for c in seen]
+        for mode, latencies in (("extracted", extracted), ("displayed", displayed)):
+            if latencies:
+                print(f"{provider.name:<8} {mode:<10} {len(latencies):>4} {len(changes) - len(seen):>6} "
+                      f"{percentile(latencies, 0.5):>6.2f}s {percentile(latencies, 0.95):>6.2f}s "
+                      f"{max(latencies):>6.2f}s")
+            else:
+                print(f"{provider.name:<8} {mode:<10} {0:>4} {len(changes):>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Odds-change-to-display latency against local stand-in sites")
+    parser.add_argument("--providers", nargs="+", default=list(PROVIDERS), choices=list(PROVIDERS))
+    parser.add_argument("--sport", default="soccer", choices=["soccer", "tennis", "basketball"])
+    parser.add_argument("--matches", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--step-seconds", type=float, default=7.0)
+    parser.add_argument("--refresh", type=float, default=10.0, help="analysis view refresh period")
+    parser.add_argument("--warmup", type=float, default=120.0)
+    parser.add_argument("--max-wait", type=float, default=60.0)
+    parser.add_argument("--chrome", default=None, help="Chrome executable (pyppeteer's bundled Chromium by default)")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--verbose", action="store_true",
+                        help="keep the scrapers' console output and per-extraction log lines")
+    parser.add_argument("--serve", type=int, metavar="PORT",
+                        help="only serve the stand-in sites (for MBOT_SITE_BASE_URL) until interrupted")
+    args = parser.parse_args()
+
+    if args.serve is not None:
+        sites = StandInSites(args.sport, args.matches)
+        print(f"Stand-in sites at {sites.start(args.serve)}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            sites.stop()
+        return
+    # Monitor errors always show; the per-extraction summaries only with --verbose
+    listener = setup_logging(logging.INFO if args.verbose else logging.ERROR, summary_interval=10)
+    try:
+        asyncio.run(run_harness(args))
+    finally:
+        listener.stop()
+
+
+if __name__ == "__main__":
+    main()
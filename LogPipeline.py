@@ -0,0 +1,110 @@
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+DUMPS = "mbot.dumps"  # full extraction rows, only emitted with full_dumps on
+
+
+def _value(value):
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+    return f'"{text}"' if ' ' in text else text
+
+
+class StructuredFormatter(logging.Formatter):
+    """Console line: '<time> <level> <logger>: <message> key=value ...' from extra={'fields': {...}}."""
+
+    def format(self, record):
+        text = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            text += " " + " ".join(f"{key}={_value(value)}" for key, value in fields.items())
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            text += f" (+{suppressed} suppressed)"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, for the log file."""
+
+    def format(self, record):
+        entry = {'time': record.created, 'level': record.levelname, 'logger': record.name,
+                 'message': record.getMessage()}
+        entry.update(getattr(record, 'fields', None) or {})
+        if getattr(record, 'suppressed', 0):
+            entry['suppressed'] = record.suppressed
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets one record per rate key (extra={'rate_key': ...}) through every interval
+    seconds and counts the rest; the next record that passes reports how many
+    were suppressed. Records without a rate key always pass.
+    """
+
+    def __init__(self, interval=60):
+        super().__init__()
+        self.interval = interval
+        self.last = {}
+        self.suppressed = {}
+
+    def filter(self, record):
+        key = getattr(record, 'rate_key', None)
+        if key is None:
+            return True
+        key = (key, record.levelno)
+        if record.created - self.last.get(key, 0) < self.interval:
+            self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return False
+        self.last[key] = record.created
+        record.suppressed = self.suppressed.pop(key, 0)
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Never blocks the caller: when the listener falls behind, records are dropped and counted."""
+
+    dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(level=logging.INFO, log_file=None, full_dumps=False, summary_interval=60, queue_size=10000):
+    """
+    Route every logger through one bounded queue; a listener thread does the
+    console and file I/O, so logging from the event loop costs a put. Rate
+    limits apply before the queue. Returns the QueueListener (stop() it on exit).
+    """
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(StructuredFormatter('%(asctime)s %(levelname)-7s %(name)s: %(message)s', '%H:%M:%S'))
+    handlers = [console]
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=20 * 2 ** 20, backupCount=5,
+                                                            encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    records = queue.Queue(maxsize=queue_size)
+    queue_handler = DroppingQueueHandler(records)
+    queue_handler.addFilter(RateLimitFilter(summary_interval))
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    logging.getLogger(DUMPS).setLevel(logging.DEBUG if full_dumps else logging.WARNING)
+    for noisy in ('pyppeteer', 'websockets'):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
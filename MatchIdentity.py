@@ -0,0 +1,65 @@
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class MatchIdentityCache:
+    """
+    Persistent (provider, provider event id) -> canonical match id map.
+    Known ids resolve with a single dict lookup; only unseen ids fall back to
+    name normalization, so a team renamed mid-match keeps its original identity.
+    """
+
+    def __init__(self, path, normalize, max_age_hours=48):
+        self.path = path
+        self.normalize = normalize
+        self.max_age = max_age_hours * 3600
+        self.ids = {}  # "provider|event_id" -> [canonical key (tuple), last seen epoch]
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            self.ids = {k: [tuple(v[0]), v[1]] for k, v in stored.items()}
+        except FileNotFoundError:
+            self.ids = {}
+        except Exception as e:
+            logger.warning(f"Error loading match identity cache: {e}")
+            self.ids = {}
+
+    def name_key(self, teams):
+        return tuple(sorted(self.normalize(t) for t in teams))
+
+    def resolve(self, provider, event_id, teams):
+        """Return the canonical key for a provider event, learning unseen ids by name."""
+        if not event_id or event_id == 'N/A':
+            return self.name_key(teams)
+        cache_key = f"{provider}|{event_id}"
+        known = self.ids.get(cache_key)
+        if known is not None:
+            known[1] = time.time()
+            return known[0]
+        canonical = self.name_key(teams)
+        self.ids[cache_key] = [canonical, time.time()]
+        self.dirty = True
+        return canonical
+
+    def save(self):
+        """Write the cache atomically, dropping ids not seen for max_age_hours."""
+        if not self.dirty:
+            return
+        cutoff = time.time() - self.max_age
+        self.ids = {k: v for k, v in self.ids.items() if v[1] >= cutoff}
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({k: [list(v[0]), v[1]] for k, v in self.ids.items()}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except Exception as e:
+            logger.warning(f"Error saving match identity cache: {e}")
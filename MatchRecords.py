@@ -0,0 +1,263 @@
+import math
+import re
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+NAN = float("nan")
+OUTCOMES = ("1", "X", "2")
+MISSING_ODDS = (NAN, NAN, NAN)
+
+# Selections are keyed (market, line, outcome); markets listed here have a known
+# complete outcome set, which is what makes cross-bookmaker dutching possible.
+MATCH_RESULT_KEYS = tuple(("1x2", "", oc) for oc in OUTCOMES)
+MONEYLINE_KEYS = (("12", "", "1"), ("12", "", "2"))
+MARKET_OUTCOMES = {
+    "1x2": OUTCOMES,
+    "12": ("1", "2"),
+    "ou": ("over", "under"),
+    "btts": ("yes", "no"),
+}
+# Main market shown in the list pages of each sport (draw only exists in soccer)
+SPORT_MAIN_MARKET = {
+    "soccer": MATCH_RESULT_KEYS,
+    "tennis": MONEYLINE_KEYS,
+    "basketball": MONEYLINE_KEYS,
+}
+MATCH_RESULT_NAMES = {"match result", "1x2", "full time result", "match odds", "match winner"}
+# Full-time match totals only; corners, cards, halves and team totals stay separate markets
+TOTAL_NAMES = {"total goals", "goals over/under", "over/under", "under/over", "o/u", "total", "totals"}
+
+
+def parse_odds(value):
+    """Parse a scraped odds string once; anything unparsable (e.g. 'N/A') becomes NaN."""
+    if isinstance(value, float):
+        return value
+    try:
+        return float(str(value).strip().replace(",", "."))
+    except (TypeError, ValueError):
+        return NAN
+
+
+def parse_capture_time(value, default):
+    """Epoch seconds from a scraper's ISO 'timestamp' field, else the given default."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return default
+
+
+def format_odds(value):
+    return "N/A" if math.isnan(value) else f"{value:.2f}"
+
+
+def parse_ladder(levels):
+    """Scraped [[odds, amount], ...] -> tuple of float pairs, dropping unusable levels."""
+    ladder = []
+    for level in levels or []:
+        try:
+            odds, amount = float(level[0]), float(level[1])
+        except (TypeError, ValueError, IndexError):
+            continue
+        if odds == odds and amount > 0:
+            ladder.append((odds, amount))
+    return tuple(ladder)
+
+
+def main_market_keys(sport):
+    return SPORT_MAIN_MARKET.get(sport, MATCH_RESULT_KEYS)
+
+
+def normalize_market(market_name, outcome_names, sport="soccer"):
+    """
+    Map a scraped market name and its selection names to (market, line, outcome) keys.
+    Unknown markets pass through under their lower-cased names, so identical markets
+    still line up across providers. Over/under selections become "ou" only for the
+    full-time match total; any other total keeps its market name (without the line).
+    """
+    name = market_name.strip().lower()
+    if name in MATCH_RESULT_NAMES:
+        return list(main_market_keys(sport)[:len(outcome_names)])
+    keys = []
+    for outcome_name in outcome_names:
+        outcome = outcome_name.strip().lower()
+        if "both teams to score" in name or name == "btts":
+            keys.append(("btts", "", outcome) if outcome in ("yes", "no") else None)
+        elif outcome.startswith(("over", "under")):
+            line = re.search(r'\d+(?:\.\d+)?', outcome) or re.search(r'\d+(?:\.\d+)?', name)
+            market = re.sub(r'\s+\d+(?:\.\d+)?$', '', name)
+            keys.append(("ou" if market in TOTAL_NAMES else market, line.group(0) if line else "",
+                         outcome.split()[0]))
+        else:
+            keys.append((name, "", outcome))
+    return keys
+
+
+def build_prices(keys, values):
+    """Parse odds for the given selection keys, dropping anything missing."""
+    prices = {}
+    for key, value in zip(keys, values):
+        odds = parse_odds(value)
+        if key is not None and odds == odds:
+            prices[key] = odds
+    return prices
+
+
+def main_market_prices(values, sport="soccer"):
+    """Parse a list page's positional odds (1/X/2, or 1/2 without a draw) for the sport."""
+    keys = main_market_keys(sport)
+    return build_prices(keys, (values or [])[:len(keys)])
+
+
+def describe_selection(market, line, outcome):
+    if market == "1x2":
+        return outcome
+    return " ".join(part for part in (market.upper(), line, outcome) if part)
+
+
+class ProviderMatch:
+    """One bookmaker's view of a match: every market as (market, line, outcome) -> float."""
+    __slots__ = ("teams", "prices", "minutes", "score", "captured_at")
+
+    def __init__(self, teams, prices=None, minutes=0, score="N/A", captured_at=0.0):
+        self.teams = teams
+        self.prices = prices or {}
+        self.minutes = minutes
+        self.score = score
+        self.captured_at = captured_at
+
+    @property
+    def original_teams(self):
+        return self.teams
+
+    def same_quote(self, other):
+        """True when nothing but the capture time differs."""
+        return (self.prices == other.prices and self.minutes == other.minutes
+                and self.score == other.score and self.teams == other.teams)
+
+
+class ExchangeMatch:
+    """
+    OrbitX view of a match: best back and lay prices per selection key, plus the
+    visible lay ladder ((odds, amount), ...) best first for liquidity sizing.
+    """
+    __slots__ = ("teams", "back_prices", "lay_prices", "lay_ladders", "minutes", "score", "captured_at")
+
+    def __init__(self, teams, back_prices=None, lay_prices=None, minutes=0, score="N/A", captured_at=0.0,
+                 lay_ladders=None):
+        self.teams = teams
+        self.back_prices = back_prices or {}
+        self.lay_prices = lay_prices or {}
+        self.lay_ladders = lay_ladders or {}
+        self.minutes = minutes
+        self.score = score
+        self.captured_at = captured_at
+
+    @property
+    def original_teams(self):
+        return self.teams
+
+    def same_quote(self, other):
+        """True when nothing but the capture time differs."""
+        return (self.lay_prices == other.lay_prices and self.back_prices == other.back_prices
+                and self.lay_ladders == other.lay_ladders and self.minutes == other.minutes
+                and self.score == other.score and self.teams == other.teams)
+
+
+class MergedEntry:
+    """All providers' records for one normalized match key, in provider order."""
+    __slots__ = ("key", "records", "bookmakers", "exchanges", "minutes", "provider_count", "original_teams")
+
+    def __init__(self, key, records):
+        self.key = key
+        self.records = records  # provider name -> record, only providers that list the match
+        self.bookmakers = {name: r for name, r in records.items() if not isinstance(r, ExchangeMatch)}
+        self.exchanges = {name: r for name, r in records.items() if isinstance(r, ExchangeMatch)}
+        self.minutes = max((r.minutes for r in records.values()), default=0)
+        self.provider_count = len(self.bookmakers)
+        self.original_teams = next(iter(records.values())).original_teams if records else []
+
+    def refresh(self, name, record):
+        """Swap in a newer tick of a record already in the entry (same prices)."""
+        self.records[name] = record
+        (self.exchanges if name in self.exchanges else self.bookmakers)[name] = record
+
+
+# -----------------------
+# Benchmark: the original dict pipeline vs the record pipeline
+# -----------------------
+def _benchmark(match_count=2000, refreshes=50):
+    import json
+    from utils.Providers import PROVIDERS, get_minutes
+
+    # One WinBet output file as the scraper writes it; json.loads gives fresh objects per match
+    payload = json.dumps([{"event_id": str(10000 + i), "teams": [f"Home {i}", f"Away {i}"], "score": f"{i % 3}-{i % 2}",
+                           "time": f"{i % 90}'", "minutes": i % 90,
+                           "odds": [f"{1 + i % 7}.{i % 100:02d}", f"3.{i % 10}0", "N/A"],
+                           "timestamp": "2026-01-01T12:00:00"} for i in range(match_count)])
+
+    def as_dicts():
+        # What load_site_data kept per WinBet/Betano match before the records
+        dicts = []
+        for match in json.loads(payload):
+            processed_match = {"teams": [], "odds": ["N/A", "N/A", "N/A"], "minutes": 0, "score": "N/A",
+                               "original_teams": []}
+            processed_match["teams"] = match.get("teams", [])
+            processed_match["odds"] = match.get("odds", ["N/A", "N/A", "N/A"])
+            processed_match["minutes"] = get_minutes(match)
+            processed_match["score"] = match.get("score", "N/A")
+            processed_match["original_teams"] = processed_match["teams"]
+            dicts.append(processed_match)
+        return dicts
+
+    def as_records():
+        provider = PROVIDERS["WinBet"]
+        return [provider.normalize(match, "soccer", 0.0)[2] for match in json.loads(payload)]
+
+    for label, build in (("dict", as_dicts), ("record", as_records)):
+        tracemalloc.start()
+        built = build()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label:<7} {size / match_count:8.1f} bytes/match "
+              f"(container {sys.getsizeof(built[0])} bytes)")
+
+    # Refresh loop: the best price per selection over the board, as get_best_back_prices does
+    # every refresh; the dicts re-parse their strings each pass, the records were parsed at ingestion
+    dicts, records = as_dicts(), as_records()
+
+    def best_from_dicts():
+        best = {}
+        for m in dicts:
+            for outcome, odds in zip(OUTCOMES, m["odds"]):
+                try:
+                    odds = float(odds)
+                except ValueError:
+                    continue  # 'N/A'
+                if odds > best.get(outcome, 0.0):
+                    best[outcome] = odds
+        return best
+
+    def best_from_records():
+        best = {}
+        for m in records:
+            for selection, odds in m.prices.items():
+                if odds > best.get(selection, 0.0):  # NaN never wins
+                    best[selection] = odds
+        return best
+
+    assert sorted(best_from_dicts().values()) == sorted(best_from_records().values())
+    start = time.perf_counter()
+    for _ in range(refreshes):
+        best_from_dicts()
+    dict_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(refreshes):
+        best_from_records()
+    record_time = time.perf_counter() - start
+    print(f"refresh x{refreshes}: dict {dict_time * 1000:.1f} ms | record {record_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    _benchmark()
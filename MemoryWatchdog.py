@@ -0,0 +1,107 @@
+import asyncio
+import gc
+import logging
+import os
+import time
+
+try:
+    import psutil
+except ImportError:  # without psutil only the per-page budgets are enforced
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+MB = 2 ** 20
+
+
+class MemoryWatchdog:
+    """
+    Keeps a long unattended session at flat memory.
+    Every interval it reads each provider page's JS heap and DOM size over CDP
+    (Performance.getMetrics) and the process RSS. A page over its budget is
+    recycled: a fresh tab is swapped in before the old one is closed, so data
+    keeps flowing. Chrome tabs do not count towards this process's RSS, so when
+    the process itself is over budget only Python-side state is trimmed: the
+    trim callback drops caches and the cycle collector runs.
+    """
+
+    def __init__(self, tasks, recycle, page_budget_mb=400, site_budgets_mb=None, process_budget_mb=1500,
+                 interval=60, min_page_age=600, metrics_timeout=5, trim=None):
+        self.tasks = tasks  # shared key -> (future, page) registry
+        self.recycle = recycle  # async key -> bool
+        self.trim = trim  # () -> number of cache entries dropped
+        self.page_budget_mb = page_budget_mb
+        self.site_budgets_mb = site_budgets_mb or {}  # site name -> MB, overrides page_budget_mb
+        self.process_budget_mb = process_budget_mb
+        self.interval = interval
+        self.min_page_age = min_page_age  # never recycle a page younger than this
+        self.metrics_timeout = metrics_timeout
+        self.process = psutil.Process(os.getpid()) if psutil is not None else None
+        self.page_born = {}  # page -> first time it was sampled
+        self.pages = {}  # key -> {'heap_mb', 'nodes'} of the current page
+        self.rss_mb = None
+        self.recycled = {}  # key -> count
+        self.in_flight = set()
+
+    def budget_mb(self, key):
+        return self.site_budgets_mb.get(key[0], self.page_budget_mb)
+
+    async def sample_page(self, page):
+        metrics = await asyncio.wait_for(page.metrics(), self.metrics_timeout)
+        return {'heap_mb': metrics.get('JSHeapTotalSize', 0) / MB, 'nodes': metrics.get('Nodes', 0)}
+
+    async def check(self):
+        now = time.time()
+        live_pages = set()
+        for key, (_, page) in list(self.tasks.items()):
+            if page is None:
+                continue
+            live_pages.add(page)
+            self.page_born.setdefault(page, now)
+            try:
+                self.pages[key] = await self.sample_page(page)
+            except Exception:
+                self.pages.pop(key, None)  # unresponsive pages are the supervisor's business
+        for page in list(self.page_born):
+            if page not in live_pages:
+                del self.page_born[page]
+        for key in list(self.pages):
+            if key not in self.tasks:
+                del self.pages[key]
+
+        def recyclable(key):
+            return (key not in self.in_flight and key in self.tasks
+                    and now - self.page_born.get(self.tasks[key][1], now) >= self.min_page_age)
+
+        over = [key for key, sample in self.pages.items()
+                if sample['heap_mb'] > self.budget_mb(key) and recyclable(key)]
+
+        if self.process is not None:
+            self.rss_mb = self.process.memory_info().rss / MB
+            if self.rss_mb > self.process_budget_mb:
+                trimmed = self.trim() if self.trim is not None else 0
+                freed = gc.collect()
+                logger.warning(f"Process RSS {self.rss_mb:.0f} MB over the {self.process_budget_mb} MB budget; "
+                               f"dropped {trimmed} cache entries, collected {freed} objects",
+                               extra={'rate_key': 'process rss'})
+
+        for key in over:
+            logger.warning(f"♻️ Recycling {key}: JS heap {self.pages[key]['heap_mb']:.0f} MB, "
+                           f"{self.pages[key]['nodes']} nodes (budget {self.budget_mb(key)} MB)")
+            self.in_flight.add(key)
+            asyncio.ensure_future(self._recycle(key))
+
+    async def _recycle(self, key):
+        try:
+            if await self.recycle(key):
+                self.recycled[key] = self.recycled.get(key, 0) + 1
+        finally:
+            self.in_flight.discard(key)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Memory watchdog check failed: {e}")
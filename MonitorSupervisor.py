@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class MonitorSupervisor:
+    """
+    Health-checks every provider monitor task and brings dead ones back.
+    A task is unhealthy when its coroutine has exited, it has not produced a
+    successful extraction for stall_seconds, or its page stops answering.
+    Pages are restarted and the CDP connection re-established with exponential
+    backoff; outage and recovery times are kept per task as metrics.
+    """
+
+    def __init__(self, tasks, restart, reconnect, is_connected, check_interval=10, stall_seconds=180,
+                 page_timeout=5, base_backoff=2, max_backoff=300, release_page=None):
+        self.tasks = tasks  # shared key -> (future, page) registry
+        self.restart = restart  # async (key, future, page) -> (future, page)
+        self.reconnect = reconnect  # async () -> bool
+        self.is_connected = is_connected  # async () -> bool, probes the CDP connection
+        self.release_page = release_page  # page -> None, once it is closed
+        self.check_interval = check_interval
+        self.stall_seconds = stall_seconds
+        self.page_timeout = page_timeout
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.started_at = {}
+        self.last_success = {}
+        self.failed_since = {}  # key -> (detected at, last success before the failure)
+        self.failures = {}
+        self.next_attempt = {}
+        self.metrics = {}
+
+    def heartbeat(self, key):
+        """Mark a successful extraction; closes any open outage for the task."""
+        now = time.time()
+        self.last_success[key] = now
+        failure = self.failed_since.pop(key, None)
+        if failure is not None:
+            detected_at, last_success = failure
+            stats = self._stats(key)
+            stats['last_recovery_s'] = now - detected_at
+            stats['last_outage_s'] = now - last_success
+            stats['recoveries'] = (stats['recoveries'] + [now - detected_at])[-20:]
+            self.failures[key] = 0
+            logger.info(f"✅ {key} recovered in {now - detected_at:.1f}s (outage {now - last_success:.1f}s)")
+
+    def forget(self, key):
+        """Drop all health state for a task the user stopped."""
+        for state in (self.started_at, self.last_success, self.failed_since, self.failures, self.next_attempt):
+            state.pop(key, None)
+
+    def _stats(self, key):
+        return self.metrics.setdefault(key, {'restarts': 0, 'recoveries': [],
+                                             'last_recovery_s': None, 'last_outage_s': None})
+
+    def _backoff(self, key):
+        return min(self.base_backoff * 2 ** self.failures.get(key, 0), self.max_backoff)
+
+    async def _page_alive(self, page):
+        try:
+            await asyncio.wait_for(page.evaluate('1'), self.page_timeout)
+            return True
+        except Exception:
+            return False
+
+    async def diagnose(self, key, future, page):
+        """Return a reason string when the task needs a restart, else None."""
+        if future.done():
+            return "monitor task exited"
+        last = self.last_success.get(key, self.started_at[key])
+        if time.time() - last > self.stall_seconds:
+            return f"no successful extraction for {time.time() - last:.0f}s"
+        if page is not None and not await self._page_alive(page):
+            return "page unresponsive"
+        return None
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.check_all()
+            except Exception as e:
+                logger.error(f"Supervisor check failed: {e}")
+
+    async def check_all(self):
+        if not await self.is_connected():
+            await self.recover_browser()
+            return
+        for key, (future, page) in list(self.tasks.items()):
+            now = time.time()
+            self.started_at.setdefault(key, now)
+            problem = await self.diagnose(key, future, page)
+            if problem is None:
+                continue
+            self.failed_since.setdefault(key, (now, self.last_success.get(key, self.started_at[key])))
+            if now < self.next_attempt.get(key, 0):
+                continue
+            self.next_attempt[key] = now + self._backoff(key)
+            self.failures[key] = self.failures.get(key, 0) + 1
+            logger.warning(f"🔁 Restarting {key}: {problem} (attempt {self.failures[key]})")
+            try:
+                new_future, new_page = await self.restart(key, future, page)
+            except Exception as e:
+                logger.error(f"Restart of {key} failed: {e}")
+                continue
+            if key not in self.tasks:
+                # Stopped by the user while we were restarting it
+                new_future.cancel()
+                try:
+                    await asyncio.wait_for(new_page.close(), self.page_timeout)
+                except Exception:
+                    pass  # page already gone with its renderer or connection
+                if self.release_page is not None:
+                    self.release_page(new_page)
+                continue
+            self.tasks[key] = (new_future, new_page)
+            self.started_at[key] = time.time()
+            self._stats(key)['restarts'] += 1
+
+    async def recover_browser(self):
+        """Reconnect to Chrome with backoff; every page then gets restarted on the next checks."""
+        now = time.time()
+        self.failed_since.setdefault('browser', (now, now))
+        if now < self.next_attempt.get('browser', 0):
+            return
+        self.next_attempt['browser'] = now + self._backoff('browser')
+        self.failures['browser'] = self.failures.get('browser', 0) + 1
+        logger.warning(f"🔌 CDP connection lost, reconnecting (attempt {self.failures['browser']})")
+        if await self.reconnect():
+            self.heartbeat('browser')
+            for key in list(self.tasks):
+                self.next_attempt[key] = 0
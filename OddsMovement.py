@@ -0,0 +1,200 @@
+import math
+import time
+from datetime import datetime
+
+import numpy as np
+
+MARKS = {'steam': '▼', 'drift': '▲', 'off_mid': '◆'}
+
+
+class OddsMovement:
+    """
+    Rolling price movement per (match, provider, selection).
+    Every series is one row of preallocated NumPy ring buffers holding up to
+    capacity price changes from the last horizon seconds. A tick appends one
+    sample, evicts the expired ones and updates running sums, so velocity,
+    volatility of log returns and drift against the exchange mid cost O(1) per
+    tick however long the session runs. Series of matches that stop quoting are
+    freed by prune() and their rows reused.
+    A series moving by move_threshold (log odds) over the window raises a steam
+    (shortening) or drift (lengthening) signal; a bookmaker price moving
+    away from the exchange mid by premium_threshold raises off_mid.
+    """
+
+    def __init__(self, horizon=300, capacity=32, move_threshold=0.05, premium_threshold=0.04, series=1024):
+        self.horizon = horizon
+        self.capacity = capacity
+        self.move_threshold = move_threshold
+        self.premium_threshold = premium_threshold
+        self.index = {}  # (sport, match key, provider, selection) -> row
+        self.keys = [None] * series  # row -> series key
+        self.free = list(range(series - 1, -1, -1))
+        self.times = np.zeros((series, capacity))
+        self.logp = np.zeros((series, capacity))
+        self.returns = np.zeros((series, capacity))
+        self.premium = np.full((series, capacity), np.nan)  # log(book / exchange mid)
+        self.head = np.zeros(series, dtype=np.int64)
+        self.count = np.zeros(series, dtype=np.int64)
+        self.sum_r = np.zeros(series)
+        self.sum_r2 = np.zeros(series)
+        self.velocity = np.zeros(series)  # log change per minute over the window
+        self.volatility = np.zeros(series)  # standard deviation of the window's log returns
+        self.drift = np.full(series, np.nan)  # change of the premium over the exchange mid
+        self.signals = {}  # series key -> active signal
+        self.raised = []  # signals raised since the last take_new()
+
+    def _grow(self):
+        size = len(self.keys)
+        for name in ('times', 'logp', 'returns', 'premium'):
+            array = getattr(self, name)
+            extra = np.full_like(array, np.nan) if name == 'premium' else np.zeros_like(array)
+            setattr(self, name, np.concatenate([array, extra]))
+        for name in ('head', 'count', 'sum_r', 'sum_r2', 'velocity', 'volatility', 'drift'):
+            array = getattr(self, name)
+            extra = np.full_like(array, np.nan) if name == 'drift' else np.zeros_like(array)
+            setattr(self, name, np.concatenate([array, extra]))
+        self.keys.extend([None] * size)
+        self.free.extend(range(2 * size - 1, size - 1, -1))
+
+    def _allocate(self, key):
+        if not self.free:
+            self._grow()
+        row = self.free.pop()
+        self.index[key] = row
+        self.keys[row] = key
+        self.head[row] = self.count[row] = 0
+        self.sum_r[row] = self.sum_r2[row] = self.velocity[row] = self.volatility[row] = 0.0
+        self.drift[row] = np.nan
+        return row
+
+    def tick(self, key, captured_at, odds, mid=None):
+        """Record one quote; ignored when neither the price nor the exchange mid moved."""
+        row = self.index.get(key)
+        if row is None:
+            row = self._allocate(key)
+        size = self.capacity
+        x = math.log(odds)
+        premium = x - math.log(mid) if mid is not None else math.nan
+        n = int(self.count[row])
+        if n:
+            last = (self.head[row] - 1) % size
+            if captured_at <= self.times[row, last]:
+                return
+            previous = self.premium[row, last]
+            if self.logp[row, last] == x and (previous == premium or (previous != previous and premium != premium)):
+                return
+
+        # Evict samples older than the horizon, and the oldest one when the ring is full
+        while n and (n == size or self.times[row, (self.head[row] - n) % size] < captured_at - self.horizon):
+            if n > 1:
+                r = self.returns[row, (self.head[row] - n + 1) % size]
+                self.sum_r[row] -= r
+                self.sum_r2[row] -= r * r
+            n -= 1
+
+        slot = self.head[row]
+        r = x - self.logp[row, (slot - 1) % size] if n else 0.0
+        self.times[row, slot] = captured_at
+        self.logp[row, slot] = x
+        self.returns[row, slot] = r
+        self.premium[row, slot] = premium
+        if n:
+            self.sum_r[row] += r
+            self.sum_r2[row] += r * r
+        else:
+            self.sum_r[row] = self.sum_r2[row] = 0.0  # drop accumulated rounding with the window
+        n += 1
+        self.head[row] = (slot + 1) % size
+        self.count[row] = n
+
+        oldest = (slot - n + 1) % size
+        change = x - self.logp[row, oldest]
+        span = captured_at - self.times[row, oldest]
+        self.velocity[row] = change / span * 60 if span > 0 else 0.0
+        if n > 2:
+            mean = self.sum_r[row] / (n - 1)
+            self.volatility[row] = math.sqrt(max(self.sum_r2[row] / (n - 1) - mean * mean, 0.0))
+        else:
+            self.volatility[row] = 0.0
+        self.drift[row] = premium - self.premium[row, oldest]
+        self._flag(key, row, odds, change, captured_at)
+
+    def _flag(self, key, row, odds, change, captured_at):
+        drift = self.drift[row]
+        if abs(change) >= self.move_threshold:
+            kind = 'steam' if change < 0 else 'drift'
+        elif drift == drift and abs(drift) >= self.premium_threshold:
+            kind = 'off_mid'
+        else:
+            self.signals.pop(key, None)
+            return
+        previous = self.signals.get(key)
+        sport, match_key, provider, (market, line, outcome) = key
+        signal = {
+            'sport': sport,
+            'match_key': "|".join(match_key),
+            'provider': provider,
+            'market': market,
+            'line': line,
+            'outcome': outcome,
+            'kind': kind,
+            'odds': odds,
+            'change_pct': round((math.exp(change) - 1) * 100, 1),
+            'velocity': round(float(self.velocity[row]), 4),
+            'volatility': round(float(self.volatility[row]), 4),
+            'mid_drift': round(float(drift), 4) if drift == drift else None,
+            'captured_at': captured_at,
+            'detected_at': previous['detected_at'] if previous and previous['kind'] == kind
+            else datetime.now().isoformat()
+        }
+        self.signals[key] = signal
+        if previous is None or previous['kind'] != kind:
+            self.raised.append(signal)
+
+    def update(self, sport, entry, selections):
+        """Tick every provider's quotes of the given selections for one merged entry."""
+        mids = {}
+        for exchange in entry.exchanges.values():
+            for selection in selections:
+                back = exchange.back_prices.get(selection, math.nan)
+                lay = exchange.lay_prices.get(selection, math.nan)
+                if back > 1 and lay > 1:
+                    mids[selection] = (back + lay) / 2
+        for name, record in entry.records.items():
+            exchange = name in entry.exchanges
+            prices = record.back_prices if exchange else record.prices
+            for selection in selections:
+                odds = prices.get(selection, math.nan)
+                if odds > 1:  # NaN compares False
+                    self.tick((sport, entry.key, name, selection), record.captured_at, odds,
+                              None if exchange else mids.get(selection))
+
+    def prune(self, now=None):
+        """Free the rows of series without a tick in the last horizon, and expire their signals."""
+        now = time.time() if now is None else now
+        newest = self.times[np.arange(len(self.keys)), (self.head - 1) % self.capacity]
+        for row in np.nonzero((self.count > 0) & (newest < now - self.horizon))[0]:
+            key = self.keys[row]
+            del self.index[key]
+            self.signals.pop(key, None)
+            self.keys[row] = None
+            self.count[row] = 0
+            self.free.append(int(row))
+
+    def mark(self, sport, match_key, provider, selection):
+        """Arrow for the view: ▼ steam, ▲ drift, ◆ off the exchange mid, '' when quiet."""
+        signal = self.signals.get((sport, match_key, provider, selection))
+        return MARKS[signal['kind']] if signal else ""
+
+    def active(self, sport=None):
+        return [s for s in self.signals.values() if sport is None or s['sport'] == sport]
+
+    def take_new(self):
+        raised, self.raised = self.raised, []
+        return raised
+
+    def metrics(self):
+        kinds = {}
+        for signal in self.signals.values():
+            kinds[signal['kind']] = kinds.get(signal['kind'], 0) + 1
+        return {'series': len(self.index), 'signals': kinds}
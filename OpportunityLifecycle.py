@@ -0,0 +1,95 @@
+from collections import deque
+from datetime import datetime
+
+
+def _timestamp(value):
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class Lifecycle:
+    """Life of one opportunity identity, from its first detection to its last."""
+    __slots__ = ('identity', 'first_seen', 'last_seen', 'peak_profit', 'peak_at', 'captured_at', 'detections')
+
+    def __init__(self, identity, detected_at, captured_at, profit):
+        self.identity = identity
+        self.first_seen = detected_at
+        self.last_seen = detected_at
+        self.peak_profit = profit
+        self.peak_at = detected_at
+        self.captured_at = captured_at
+        self.detections = 1
+
+    @property
+    def duration(self):
+        return self.last_seen - self.first_seen
+
+
+class OpportunityTracker:
+    """
+    Gives every (match, market, outcome, legs) opportunity an identity across
+    refreshes and records first/last seen, peak profit and duration.
+    Detection latency is the time from the capture of the newest contributing
+    tick to the detection, sampled whenever an identity is (re)detected from a
+    newer tick. Statistics are rolling over the last `window` samples.
+    """
+
+    def __init__(self, window=500):
+        self.open = {}  # identity -> Lifecycle
+        self.closed = deque(maxlen=window)
+        self.latencies = deque(maxlen=window)
+
+    @staticmethod
+    def identity(opportunity):
+        legs = tuple(sorted(opportunity['providers'].items()))
+        return (opportunity['sport'], opportunity['match_key'], opportunity['market'],
+                opportunity['line'], opportunity['outcome'], legs)
+
+    def observe(self, opportunities, now):
+        """Fold one refresh's full opportunity list in; returns the lifecycles that closed."""
+        seen = set()
+        for opportunity in opportunities:
+            identity = self.identity(opportunity)
+            seen.add(identity)
+            detected_at = _timestamp(opportunity['detected_at'])
+            captured_at = _timestamp(opportunity['captured_at'])
+            lifecycle = self.open.get(identity)
+            if lifecycle is None:
+                self.open[identity] = Lifecycle(identity, detected_at, captured_at, opportunity['profit'])
+                self.latencies.append(detected_at - captured_at)
+                continue
+            lifecycle.last_seen = now
+            if captured_at > lifecycle.captured_at:
+                lifecycle.captured_at = captured_at
+                lifecycle.detections += 1
+                self.latencies.append(detected_at - captured_at)
+            if opportunity['profit'] > lifecycle.peak_profit:
+                lifecycle.peak_profit = opportunity['profit']
+                lifecycle.peak_at = now
+
+        finished = [self.open.pop(identity) for identity in list(self.open) if identity not in seen]
+        self.closed.extend(finished)
+        return finished
+
+    def stats(self):
+        durations = [lifecycle.duration for lifecycle in self.closed]
+        latency_p95 = _percentile(self.latencies, 0.95)
+        return {
+            'open': len(self.open),
+            'closed': len(self.closed),
+            'latency_p50': _percentile(self.latencies, 0.5),
+            'latency_p95': latency_p95,
+            'latency_max': max(self.latencies) if self.latencies else None,
+            'duration_p50': _percentile(durations, 0.5),
+            'duration_p95': _percentile(durations, 0.95),
+            'peak_profit_p50': _percentile([lifecycle.peak_profit for lifecycle in self.closed], 0.5),
+            # Opportunities that lived shorter than our typical lag were mostly seen after the fact
+            'outpaced': (sum(d < latency_p95 for d in durations) / len(durations)
+                         if durations and latency_p95 is not None else None)
+        }
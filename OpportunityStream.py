@@ -0,0 +1,106 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+
+import websockets
+
+logger = logging.getLogger(__name__)
+
+
+class OpportunityPublisher:
+    """
+    Publishes structured arbitrage opportunity events (opened / updated / closed)
+    and odds movement signals to any number of local WebSocket subscribers.
+    Every subscriber has its own bounded queue, so a slow consumer only loses its
+    own oldest events and never stalls detection.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, queue_size=256):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.server = None
+        self.clients = set()
+        self.open_opportunities = {}
+        self.dropped_events = 0
+
+    async def start(self):
+        """Start listening for subscribers on the running event loop."""
+        self.server = await websockets.serve(self._handle_client, self.host, self.port)
+        logger.info(f"📡 Opportunity stream listening on ws://{self.host}:{self.port}")
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        self.clients.clear()
+
+    async def _handle_client(self, websocket, path=None):
+        """Drain this subscriber's queue; new subscribers first receive every open opportunity."""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        for opportunity in self.open_opportunities.values():
+            self._offer(queue, self._encode("opened", opportunity))
+        self.clients.add(queue)
+        try:
+            while True:
+                message = await queue.get()
+                await websocket.send(message)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.clients.discard(queue)
+
+    @staticmethod
+    def _encode(event, opportunity):
+        return json.dumps({"event": event, **opportunity}, ensure_ascii=False)
+
+    def _offer(self, queue, message):
+        """Enqueue without blocking; when the queue is full the oldest event is dropped."""
+        if queue.full():
+            try:
+                queue.get_nowait()
+                self.dropped_events += 1
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(message)
+
+    @staticmethod
+    def _changed(previous, current):
+        return (previous["providers"] != current["providers"]
+                or previous["odds"] != current["odds"]
+                or previous["profit"] != current["profit"]
+                or previous.get("max_stake") != current.get("max_stake"))
+
+    def publish(self, opportunities):
+        """
+        Diff the freshly detected opportunities against the currently open set and
+        fan out the resulting events. Must run on the event loop thread
+        (use loop.call_soon_threadsafe from other threads).
+        """
+        current = {(o["sport"], o["match_key"], o["market"], o["line"], o["outcome"]): o for o in opportunities}
+        events = []
+        for key, opportunity in current.items():
+            previous = self.open_opportunities.get(key)
+            if previous is None:
+                events.append(("opened", opportunity))
+            elif self._changed(previous, opportunity):
+                events.append(("updated", opportunity))
+        closed_at = datetime.now().isoformat()
+        for key, opportunity in self.open_opportunities.items():
+            if key not in current:
+                events.append(("closed", {**opportunity, "detected_at": closed_at}))
+        self.open_opportunities = current
+
+        for event, opportunity in events:
+            message = self._encode(event, opportunity)
+            for queue in self.clients:
+                self._offer(queue, message)
+
+    def publish_signals(self, signals):
+        """Fan out odds movement signals (steam, drift, off_mid) as "signal" events; same threading rule as publish."""
+        for signal in signals:
+            message = self._encode("signal", signal)
+            for queue in self.clients:
+                self._offer(queue, message)
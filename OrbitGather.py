@@ -1,31 +1,133 @@
 import asyncio
 import re
 import json
+import logging
 import os
 from datetime import datetime
 from pyppeteer import launch
 from bs4 import BeautifulSoup
 
+logger = logging.getLogger(__name__)
+
 
 class OrbitXScraper:
     """
     A scraper class for extracting and continuously saving live match data from the OrbitX exchange website.
     """
+    LADDER_DEPTH = 3  # visible price levels per side (biab_back-0..2 / biab_lay-0..2)
 
-    def __init__(self, executable_path=r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe", headless=True):
+    def __init__(self, executable_path=r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe", headless=True,
+                 sport_id=1, outcome_labels=('1', 'X', '2'),
+                 output_file=os.path.join('D:/autochrome/gdata', 'orbitx_latest.json')):
         self.executable_path = executable_path
         self.headless = headless
-        self.url = 'https://www.orbitxch.com/customer/sport/1'
+        self.url = f'https://www.orbitxch.com/customer/sport/{sport_id}'
+        self.outcome_labels = outcome_labels  # ('1', '2') for sports without a draw
+        self.output_file = output_file
+        self.last_html = None  # markup of the latest scrape, for the capture archive
 
     @staticmethod
     def safe_text(element, default="N/A"):
         return element.text.strip() if element else default
 
+    @staticmethod
+    def parse_amount(text):
+        """Parse a ladder amount such as '€1,234' or '1.2K' to a number; None when unavailable."""
+        cleaned = re.sub(r'[^\d.,KkMm]', '', text or '').replace(',', '')
+        multiplier = 1
+        if cleaned.endswith(('K', 'k')):
+            multiplier, cleaned = 1000, cleaned[:-1]
+        elif cleaned.endswith(('M', 'm')):
+            multiplier, cleaned = 1000000, cleaned[:-1]
+        try:
+            return float(cleaned) * multiplier
+        except ValueError:
+            return None
+
+    def extract_ladder(self, container, side):
+        """All visible levels of one side, best price first: [[odds, amount], ...]."""
+        ladder = []
+        for level in range(self.LADDER_DEPTH):
+            cell = container.select_one(f'.biab_{side}-{level}')
+            if not cell:
+                continue
+            try:
+                odds = float(self.safe_text(cell.select_one('.styles_betOdds__bxapE')))
+            except ValueError:
+                continue
+            ladder.append([odds, self.parse_amount(self.safe_text(cell.select_one('.biab_bet-amount'), ''))])
+        return ladder
+
     @staticmethod
     def extract_time_minutes(time_str):
         match = re.search(r'(\d+)', time_str)
         return int(match.group(1)) if match else None
 
+    @staticmethod
+    def extract_market_id(match):
+        """Exchange market id (e.g. 1.234567890) from the row's market link."""
+        link = match.select_one('a[href*="market"]')
+        found = re.search(r'market/([\d.]+)', link['href']) if link else None
+        return found.group(1) if found else None
+
+    def parse_html(self, content):
+        """Parse the market list markup into match dicts (also used to replay captured pages)."""
+        data = []
+        soup = BeautifulSoup(content, 'html.parser')
+        matches = soup.select('.biab_group-markets-table-row')
+
+        valid_matches = []
+        for match in matches:
+            # Hashed class names differ per sport (styles_soccer__time__W39zL, ...)
+            time_str = self.safe_text(match.select_one('span[class*="__time__"]'))
+            minutes = self.extract_time_minutes(time_str)
+            if minutes is not None:
+                valid_matches.append((minutes, match))
+
+        valid_matches.sort(key=lambda x: x[0], reverse=True)
+
+        # Extract structured data
+        for minutes, match in valid_matches:
+            time_str = self.safe_text(match.select_one('span[class*="__time__"]'))
+            scores = match.select('span[class*="__score__"]')
+            score = f"{self.safe_text(scores[0])}-{self.safe_text(scores[1])}" if len(scores) >= 2 else 'N/A-N/A'
+            teams = [self.safe_text(p) for p in match.select('.styles_participantsNames__-aY7w p')[:2]]
+            matched = self.safe_text(match.find('span', class_='cursor-help'))
+
+            outcomes = []
+            containers = match.select('.betContentContainer')[:len(self.outcome_labels)]
+            for outcome, container in zip(self.outcome_labels, containers):
+                back = container.select_one('.biab_back-0')
+                lay = container.select_one('.biab_lay-0')
+
+                b_odds = self.safe_text(back.select_one('.styles_betOdds__bxapE')) if back else 'N/A'
+                b_amt = self.parse_amount(self.safe_text(back.select_one('.biab_bet-amount'), '')) if back else None
+                l_odds = self.safe_text(lay.select_one('.styles_betOdds__bxapE')) if lay else 'N/A'
+                l_amt = self.parse_amount(self.safe_text(lay.select_one('.biab_bet-amount'), '')) if lay else None
+
+                outcomes.append({
+                    'outcome': outcome,
+                    'back_odds': b_odds,
+                    'back_amount': b_amt,
+                    'lay_odds': l_odds,
+                    'lay_amount': l_amt,
+                    'back_ladder': self.extract_ladder(container, 'back'),
+                    'lay_ladder': self.extract_ladder(container, 'lay')
+                })
+
+            data.append({
+                'event_id': self.extract_market_id(match),
+                'time_str': time_str,
+                'minutes': minutes,
+                'team1': teams[0],
+                'team2': teams[1],
+                'score': score,
+                'matched': matched,
+                'outcomes': outcomes
+            })
+        soup.decompose()  # free the tree now instead of waiting for the cycle collector
+        return data
+
     async def scrape_once(self, verbose=True, page=None):
         """
         Performs a single scrape and returns structured data.
@@ -65,60 +167,14 @@ class OrbitXScraper:
             await asyncio.sleep(3)  # Wait for final rendering
 
             content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-            matches = soup.select('.biab_group-markets-table-row')
-
-            valid_matches = []
-            for match in matches:
-                time_str = self.safe_text(match.find('span', class_='styles_soccer__time__W39zL'))
-                minutes = self.extract_time_minutes(time_str)
-                if minutes is not None:
-                    valid_matches.append((minutes, match))
-
-            valid_matches.sort(key=lambda x: x[0], reverse=True)
-
-            # Extract structured data
-            for minutes, match in valid_matches:
-                time_str = self.safe_text(match.find('span', class_='styles_soccer__time__W39zL'))
-                scores = match.find_all('span', class_='styles_soccer__score__CWJPr')
-                score = f"{self.safe_text(scores[0])}-{self.safe_text(scores[1])}" if len(scores) >= 2 else 'N/A-N/A'
-                teams = [self.safe_text(p) for p in match.select('.styles_participantsNames__-aY7w p')[:2]]
-                matched = self.safe_text(match.find('span', class_='cursor-help'))
-
-                outcomes = []
-                for idx, container in enumerate(match.select('.betContentContainer')[:3], 1):
-                    back = container.select_one('.biab_back-0')
-                    lay = container.select_one('.biab_lay-0')
-
-                    b_odds = self.safe_text(back.select_one('.styles_betOdds__bxapE')) if back else 'N/A'
-                    b_amt = self.safe_text(back.select_one('.biab_bet-amount')) if back else 'N/A'
-                    l_odds = self.safe_text(lay.select_one('.styles_betOdds__bxapE')) if lay else 'N/A'
-                    l_amt = self.safe_text(lay.select_one('.biab_bet-amount')) if lay else 'N/A'
-
-                    outcome = '1' if idx == 1 else 'X' if idx == 2 else '2'
-                    outcomes.append({
-                        'outcome': outcome,
-                        'back_odds': b_odds,
-                        'back_amount': b_amt,
-                        'lay_odds': l_odds,
-                        'lay_amount': l_amt
-                    })
-
-                data.append({
-                    'time_str': time_str,
-                    'minutes': minutes,
-                    'team1': teams[0],
-                    'team2': teams[1],
-                    'score': score,
-                    'matched': matched,
-                    'outcomes': outcomes
-                })
+            self.last_html = content
+            data = self.parse_html(content)
 
             if verbose:
                 self.print_data(data)
 
         except Exception as e:
-            print(f"\n❌ Scraping error: {str(e)}")
+            logger.warning(f"❌ Scraping error: {str(e)}", extra={'rate_key': ('OrbitX scrape', self.url)})
         finally:
             # Only close the browser if we created it in this call.
             if created_browser and browser:
@@ -133,8 +189,10 @@ class OrbitXScraper:
             print(f"⏱️ {match['time_str']}' | 📊 {match['score']} | 💰 {match['matched']}")
             print(f"{'─' * 50}")
             for outcome in match['outcomes']:
+                back_amt = outcome['back_amount'] if outcome['back_amount'] is not None else 'N/A'
+                lay_amt = outcome['lay_amount'] if outcome['lay_amount'] is not None else 'N/A'
                 print(
-                    f"│ {outcome['outcome']} │ Back: {outcome['back_odds']:<5} ({outcome['back_amount']:<3}) │ Lay: {outcome['lay_odds']:<5} ({outcome['lay_amount']:<3}) │")
+                    f"│ {outcome['outcome']} │ Back: {outcome['back_odds']:<5} ({back_amt:<3}) │ Lay: {outcome['lay_odds']:<5} ({lay_amt:<3}) │")
             print(f"╰─────────────────────────────────────────────╯")
 
     def save_data(self, data):
@@ -142,7 +200,7 @@ class OrbitXScraper:
         if not data:
             return
         try:
-            filename = os.path.join('D:/autochrome/gdata', 'orbitx_latest.json')  # Fixed filename
+            filename = self.output_file
 
             # Write fresh data instead of appending
             with open(filename, 'w', encoding='utf-8') as f:
@@ -151,9 +209,9 @@ class OrbitXScraper:
                     entry = {'timestamp': timestamp, 'match_data': match}
                     f.write(json.dumps(entry) + '\n')
 
-            print(f"✅ Successfully OVERWROTE {len(data)} matches to {filename}")
+            logger.debug(f"✅ Successfully OVERWROTE {len(data)} matches to {filename}")
         except Exception as e:
-            print(f"❌ Error saving data: {str(e)}")
+            logger.warning(f"❌ Error saving data: {str(e)}")
 
     async def _run_continuous(self, interval, verbose, page=None):
         """Async continuous scraping loop.
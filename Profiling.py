@@ -0,0 +1,148 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "profile": [],  # section names to sample, e.g. ["analysis", "Betano/soccer"]
+    "sample_every": 10,  # profile one run in N of each section
+    "dump_seconds": 300,
+    "tracemalloc": False,
+    "tracemalloc_frames": 10,
+    "snapshot_seconds": 600
+}
+
+# cProfile can only be active once per interpreter (sys.monitoring in 3.12+)
+_profiler_busy = threading.Lock()
+
+
+class ProfilingHooks:
+    """
+    Opt-in CPU and memory diagnostics for long sessions, switched at runtime.
+    Settings are read from a JSON control file whenever it changes; with no file
+    everything is off and the hooks cost one dict lookup. Selected sections get
+    one in sample_every runs profiled with cProfile, accumulated and dumped every
+    dump_seconds as .prof plus a text top list; tracemalloc snapshots are dumped
+    every snapshot_seconds together with a diff against the previous one.
+    Profiling an async section also counts whatever other tasks run during its
+    awaits, so profile one provider loop at a time for clean numbers.
+    """
+
+    def __init__(self, control_file, dump_dir):
+        self.control_file = control_file
+        self.dump_dir = dump_dir
+        self.settings = dict(DEFAULTS)
+        self.control_mtime = None
+        self.calls = {}
+        self.stats = {}  # section -> accumulated pstats.Stats
+        self.lock = threading.Lock()
+        self.last_dump = time.time()
+        self.last_snapshot_at = 0
+        self.last_snapshot = None
+
+    def reload(self):
+        try:
+            mtime = os.path.getmtime(self.control_file)
+        except OSError:
+            mtime = None
+        if mtime == self.control_mtime:
+            return
+        self.control_mtime = mtime
+        settings = dict(DEFAULTS)
+        if mtime is not None:
+            try:
+                with open(self.control_file, 'r', encoding='utf-8') as f:
+                    settings.update(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.error(f"Ignoring profiling settings in {self.control_file}: {e}")
+        self.settings = settings
+        logger.info(f"Profiling: sections {settings['profile'] or 'off'}, "
+                    f"tracemalloc {'on' if settings['tracemalloc'] else 'off'}")
+
+        if settings['tracemalloc'] and not tracemalloc.is_tracing():
+            tracemalloc.start(settings['tracemalloc_frames'])
+            self.last_snapshot = None
+        elif not settings['tracemalloc'] and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def profile(self, section):
+        """Wrap one run of a section; only sampled runs of enabled sections are profiled."""
+        if section not in self.settings['profile']:
+            yield
+            return
+        count = self.calls[section] = self.calls.get(section, 0) + 1
+        if count % max(self.settings['sample_every'], 1) or not _profiler_busy.acquire(blocking=False):
+            yield
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+        finally:
+            _profiler_busy.release()
+        with self.lock:
+            if section in self.stats:
+                self.stats[section].add(profiler)
+            else:
+                self.stats[section] = pstats.Stats(profiler)
+
+    def tick(self):
+        """Call periodically: picks up control-file changes and writes due dumps."""
+        self.reload()
+        now = time.time()
+        if now - self.last_dump >= self.settings['dump_seconds']:
+            self.last_dump = now
+            self.dump_profiles()
+        if tracemalloc.is_tracing() and now - self.last_snapshot_at >= self.settings['snapshot_seconds']:
+            self.last_snapshot_at = now
+            self.dump_snapshot()
+
+    def _base_path(self, name):
+        """Dump path without extension; the .prof/.snapshot and its .txt share the stamp."""
+        os.makedirs(self.dump_dir, exist_ok=True)
+        return os.path.join(self.dump_dir, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+    def dump_profiles(self):
+        with self.lock:
+            collected, self.stats = self.stats, {}
+        for section, stats in collected.items():
+            base = self._base_path("profile_" + section.replace('/', '_'))
+            stats.dump_stats(base + ".prof")
+            text = io.StringIO()
+            stats.stream = text
+            stats.sort_stats('cumulative').print_stats(40)
+            with open(base + ".txt", 'w', encoding='utf-8') as f:
+                f.write(text.getvalue())
+            logger.info(f"Wrote profile of {section}")
+
+    def dump_snapshot(self):
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        base = self._base_path("tracemalloc")
+        snapshot.dump(base + ".snapshot")
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"traced {current / 2 ** 20:.1f} MB, peak {peak / 2 ** 20:.1f} MB"]
+        if self.last_snapshot is not None:
+            lines.append("Growth since previous snapshot:")
+            lines.extend(str(stat) for stat in snapshot.compare_to(self.last_snapshot, 'lineno')[:25])
+        lines.append("Largest allocations:")
+        lines.extend(str(stat) for stat in snapshot.statistics('lineno')[:25])
+        with open(base + ".txt", 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        self.last_snapshot = snapshot
+        logger.info(f"Wrote tracemalloc snapshot ({current / 2 ** 20:.1f} MB traced)")
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+OPENING = "opening"
+NAVIGATING = "navigating"
+READY = "ready"
+FAILED = "failed"
+STOPPED = "stopped"
+
+
+class ProviderController:
+    """
+    Non-blocking start/stop/restart of provider monitors.
+    The public methods may be called from any thread (e.g. Tk) and return at once;
+    the work runs on the event loop and progress is reported through on_state
+    (called on the loop thread) as opening -> navigating -> ready, or failed.
+    """
+
+    def __init__(self, loop, tasks, open_page, build_monitor, on_state=None, release_page=None):
+        self.loop = loop
+        self.tasks = tasks  # key -> (task, page); only touched on the loop thread
+        self.open_page = open_page  # async key -> new page for that provider
+        self.release_page = release_page  # page -> None, once it is closed
+        self.build_monitor = build_monitor  # (key, page, report, warm) -> monitor coroutine
+        self.on_state = on_state
+        self.states = {}
+        self.pending = set()
+        self.recycling = set()
+
+    def report(self, key, state, detail=""):
+        self.states[key] = state
+        if detail:
+            logger.info(f"{key}: {state} ({detail})")
+        if self.on_state is not None:
+            self.on_state(key, state, detail)
+
+    # Thread-safe entry points
+    def start(self, key):
+        return asyncio.run_coroutine_threadsafe(self._start(key), self.loop)
+
+    def stop(self, key):
+        return asyncio.run_coroutine_threadsafe(self._stop(key), self.loop)
+
+    def restart(self, key):
+        return asyncio.run_coroutine_threadsafe(self._restart(key), self.loop)
+
+    def stop_all(self):
+        return asyncio.run_coroutine_threadsafe(self._stop_all(), self.loop)
+
+    def detach_all(self):
+        """Cancel every monitor but leave its tab open for the next session's warm start."""
+        return asyncio.run_coroutine_threadsafe(self._detach_all(), self.loop)
+
+    # Loop-side implementation
+    def _launch(self, key, page, report=None, warm=False):
+        if report is None:
+            report = lambda state, detail="": self.report(key, state, detail)
+        task = asyncio.ensure_future(self.build_monitor(key, page, report, warm))
+        task.add_done_callback(lambda t: self._finished(key, t))
+        return task
+
+    def _finished(self, key, task):
+        if task.cancelled():
+            return
+        error = task.exception()
+        self.report(key, FAILED, str(error) if error else "monitor exited")
+
+    async def _start(self, key):
+        if key in self.tasks or key in self.pending:
+            return
+        self.pending.add(key)
+        self.report(key, OPENING)
+        try:
+            page = await self.open_page(key)
+        except Exception as e:
+            self.pending.discard(key)
+            self.report(key, FAILED, str(e))
+            return
+        if key not in self.pending:
+            # Stopped while the tab was opening
+            await self._close_page(page)
+            return
+        self.pending.discard(key)
+        self.tasks[key] = (self._launch(key, page), page)
+
+    def adopt(self, key, page):
+        """Run key's monitor on a tab already showing its page (loop thread); False when key is running."""
+        if key in self.tasks or key in self.pending:
+            return False
+        self.report(key, OPENING, "reattached")
+        self.tasks[key] = (self._launch(key, page, warm=True), page)
+        return True
+
+    async def _close_page(self, page):
+        try:
+            await asyncio.wait_for(page.close(), 5)
+        except Exception:
+            pass  # page already gone with its renderer or connection
+        if self.release_page is not None:
+            self.release_page(page)
+
+    async def _stop(self, key):
+        self.pending.discard(key)
+        entry = self.tasks.pop(key, None)
+        if entry is not None:
+            task, page = entry
+            task.cancel()
+            await self._close_page(page)
+        self.report(key, STOPPED)
+
+    async def _stop_all(self):
+        await asyncio.gather(*(self._stop(key) for key in list(self.tasks)))
+
+    async def _detach_all(self):
+        self.pending.clear()
+        for key in list(self.tasks):
+            task, page = self.tasks.pop(key)
+            task.cancel()
+            if self.release_page is not None:
+                self.release_page(page)
+
+    async def replace(self, key, task, page):
+        """Swap in a fresh page and monitor for key; returns the new (task, page)."""
+        task.cancel()
+        if page is not None:
+            await self._close_page(page)
+        self.report(key, OPENING)
+        new_page = await self.open_page(key)
+        return self._launch(key, new_page), new_page
+
+    async def _restart(self, key):
+        entry = self.tasks.get(key)
+        if entry is None:
+            await self._start(key)
+            return
+        try:
+            self.tasks[key] = await self.replace(key, *entry)
+        except Exception as e:
+            self.report(key, FAILED, str(e))
+
+    async def recycle(self, key, ready_timeout=90, overlap=15):
+        """
+        Replace key's page with a fresh tab without a gap in data: the new monitor
+        starts alongside the old one, which is only cancelled and closed once the
+        new page is ready and has had `overlap` seconds to extract.
+        Returns True when the swap happened.
+        """
+        entry = self.tasks.get(key)
+        if entry is None or key in self.recycling:
+            return False
+        self.recycling.add(key)
+        try:
+            ready = asyncio.Event()
+
+            def report(state, detail=""):
+                self.report(key, state, detail)
+                if state == READY:
+                    ready.set()
+
+            new_page = await self.open_page(key)
+            new_task = self._launch(key, new_page, report)
+            try:
+                await asyncio.wait_for(ready.wait(), ready_timeout)
+                await asyncio.sleep(overlap)
+            except asyncio.TimeoutError:
+                pass
+            if not ready.is_set() or new_task.done() or self.tasks.get(key) is not entry:
+                # New page never came up, or the task was stopped / restarted meanwhile
+                new_task.cancel()
+                await self._close_page(new_page)
+                return False
+            old_task, old_page = entry
+            self.tasks[key] = (new_task, new_page)
+            old_task.cancel()
+            await self._close_page(old_page)
+            return True
+        except Exception as e:
+            logger.error(f"Recycling {key} failed: {e}")
+            return False
+        finally:
+            self.recycling.discard(key)
@@ -0,0 +1,334 @@
+import asyncio
+import importlib
+import importlib.util
+import json
+import logging
+import os
+
+from utils.MatchRecords import (ProviderMatch, ExchangeMatch, normalize_market, build_prices, main_market_prices,
+                                main_market_keys, parse_capture_time, parse_ladder)
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/91.0.4472.124 Safari/537.36')
+
+
+def get_minutes(match):
+    try:
+        time_str = str(match.get("minutes", 0))
+        # Handle cases like '45+2' => 47
+        if '+' in time_str:
+            parts = time_str.split('+')
+            base = int(parts[0]) if parts[0] else 0
+            added = sum(int(p) for p in parts[1:] if p)
+            return base + added
+        return int(time_str)
+    except:
+        return 0
+
+
+def outcome_labels(sport):
+    return tuple(key[2] for key in main_market_keys(sport))
+
+
+class Provider:
+    """
+    Declaration of one odds source: where its pages live, how a page is set up
+    and scraped, and how its output file turns into match records.
+    The scraper module is only imported when the provider is first started,
+    so providers that stay disabled cost nothing at startup.
+    """
+    name = None
+    module = None  # scraper module under utils
+    class_name = None
+    scraper_path = None  # load the scraper module from this directory instead (replaying with another parser)
+    data_file = None  # output file stem; sports other than soccer get a _<sport> suffix
+    urls = {}  # sport -> live list page
+    exchange = False  # exchanges quote lay prices and produce ExchangeMatch records
+    interval = 10  # seconds between extractions
+    ready_on_data = False  # page counts as ready only after the first non-empty extraction
+    heading = None  # column title, "<name> Odds" by default
+    column_width = 150
+
+    def scraper_class(self):
+        if self.scraper_path is None:
+            return getattr(importlib.import_module(f"utils.{self.module}"), self.class_name)
+        spec = importlib.util.spec_from_file_location(f"replay_{self.module}",
+                                                      os.path.join(self.scraper_path, f"{self.module}.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return getattr(module, self.class_name)
+
+    def create(self, sport, output_file, page):
+        """Scraper for one sport; page is None when it only parses captured markup."""
+        raise NotImplementedError
+
+    async def setup(self, scraper, page):
+        await page.goto(scraper.url, {'waitUntil': 'networkidle2', 'timeout': 60000})
+
+    async def attach(self, scraper, page):
+        """Pick up a tab that already shows the live list (warm start); raise to fall back to setup."""
+        pass
+
+    async def extract(self, scraper, page):
+        raise NotImplementedError
+
+    async def parse(self, scraper, html):
+        """Rows parsed from raw page markup, as extract would return them (used to replay captures)."""
+        raise NotImplementedError
+
+    def save(self, scraper, data):
+        raise NotImplementedError
+
+    def rows(self, data):
+        """Extracted data as the rows read() returns, for publishing through a transport."""
+        return data
+
+    def read(self, file_path):
+        """Rows of one output file, each passed to normalize."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def normalize(self, row, sport, file_time):
+        """(event id, teams, record) for one output row, or None to skip it."""
+        raise NotImplementedError
+
+
+class WinBet(Provider):
+    name = "WinBet"
+    module = "WinBetGather"
+    class_name = "LiveWinBetMonitor"
+    data_file = "winbet_odds"
+    urls = {
+        "soccer": "https://winbet.bg/in-play?sportId=soccer-1001",
+        "tennis": "https://winbet.bg/in-play?sportId=tennis-1003",
+        "basketball": "https://winbet.bg/in-play?sportId=basketball-1002"
+    }
+
+    def create(self, sport, output_file, page):
+        scraper = self.scraper_class()(file_path=output_file, url=self.urls[sport],
+                                       odds_count=len(outcome_labels(sport)))
+        scraper.browser = page.browser if page is not None else None
+        scraper.page = page
+        return scraper
+
+    async def extract(self, scraper, page):
+        return await scraper.extract_live_matches()
+
+    async def parse(self, scraper, html):
+        return scraper.parse_html(html)
+
+    def save(self, scraper, data):
+        scraper.save_to_file(data)
+
+    def normalize(self, row, sport, file_time):
+        teams = row.get("teams", [])
+        record = ProviderMatch(teams, main_market_prices(row.get("odds"), sport), get_minutes(row),
+                               row.get("score", "N/A"), parse_capture_time(row.get("timestamp"), file_time))
+        return row.get("event_id"), teams, record
+
+
+class Betano(Provider):
+    name = "Betano"
+    module = "BetanoGather"
+    class_name = "BetanoScraper"
+    data_file = "betano_data"
+    urls = {
+        "soccer": "https://www.betano.bg/en/live/",
+        "tennis": "https://www.betano.bg/en/live/tennis/",
+        "basketball": "https://www.betano.bg/en/live/basketball/"
+    }
+
+    def create(self, sport, output_file, page):
+        return self.scraper_class()(output_file=output_file, url=self.urls[sport], sport=sport)
+
+    async def setup(self, scraper, page):
+        await page.setUserAgent(USER_AGENT)
+        await page.setViewport({'width': 1920, 'height': 1080})
+        await page.goto(scraper.url, {'waitUntil': 'networkidle2', 'timeout': 60000})
+        try:
+            await page.click('button#CybotCookiebotDialogBodyButtonAccept', timeout=5000)
+            await asyncio.sleep(3)
+        except Exception:
+            pass
+
+    async def extract(self, scraper, page):
+        return await scraper.get_live_matches(page)
+
+    async def parse(self, scraper, html):
+        return await scraper.parse_html(html)
+
+    def save(self, scraper, data):
+        scraper.save_to_file(data)
+
+    normalize = WinBet.normalize
+
+
+class Efbet(Provider):
+    name = "Efbet"
+    module = "efbet"
+    class_name = "LiveEfbetMonitor"
+    data_file = "efbet_odds"
+    urls = {
+        "soccer": "https://www.efbet.com/UK/inplay#action=inplay",
+        "tennis": "https://www.efbet.com/UK/inplay#action=inplay&sport=TENN",
+        "basketball": "https://www.efbet.com/UK/inplay#action=inplay&sport=BASK"
+    }
+
+    def create(self, sport, output_file, page):
+        scraper = self.scraper_class()(url=self.urls[sport], output_file=output_file, interval=self.interval)
+        scraper.page = page
+        scraper.browser = page.browser if page is not None else None
+        return scraper
+
+    async def setup(self, scraper, page):
+        await page.setViewport({"width": 1920, "height": 1080})
+        await page.setUserAgent(USER_AGENT)
+        await page.goto(scraper.url, {'waitUntil': 'networkidle2', 'timeout': 60000})
+        logger.info("✅ Efbet in-play page loaded.")
+        await self.attach(scraper, page)
+
+    async def attach(self, scraper, page):
+        """The odds live in the inplayAppMain iframe; fall back to the main page carousel without it."""
+        iframe_selector = '#inplayAppMain'
+        max_attempts = 3
+        for attempt in range(max_attempts):
+            try:
+                await page.waitForSelector(iframe_selector, {'timeout': 10000})
+                iframe_element = await page.querySelector(iframe_selector)
+                scraper.frame = await iframe_element.contentFrame()
+                if scraper.frame:
+                    logger.debug("Switched to iframe: inplayAppMain")
+                    await scraper.frame.waitForSelector('.sportEvents', {'timeout': 10000})
+                    logger.debug("Found sportEvents inside iframe")
+                    await scraper.frame.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+                    await asyncio.sleep(2)
+                    break
+                else:
+                    logger.warning(f"Attempt {attempt + 1}/{max_attempts}: Iframe found but contentFrame "
+                                   f"returned None.")
+            except Exception as e:
+                logger.warning(f"Attempt {attempt + 1}/{max_attempts}: Error accessing iframe - {str(e)}")
+            if attempt == max_attempts - 1:
+                logger.info("Falling back to main page carousel data.")
+                await page.waitForSelector('#SideCarouselMarketGroupListComponent26-carousel-items',
+                                           {'timeout': 10000})
+                logger.debug("Found carousel items on main page as fallback.")
+                scraper.frame = None
+            await asyncio.sleep(10)
+
+    async def extract(self, scraper, page):
+        return await scraper.extract_betting_data()
+
+    async def parse(self, scraper, html):
+        return scraper.parse_betting_data(html)
+
+    def save(self, scraper, data):
+        scraper.save_to_json(data)
+
+    def normalize(self, row, sport, file_time):
+        teams = row.get("teams", "")
+        if isinstance(teams, str):
+            teams = [t.strip() for t in teams.split(" - ")]
+
+        # Keep every market as (market, line, outcome) -> odds
+        prices = {}
+        for market in row.get("markets", []):
+            selections = market.get("selections", [])
+            keys = normalize_market(market.get("market", ""), [s.get("outcome", "") for s in selections], sport)
+            prices.update(build_prices(keys, [s.get("odds", "N/A") for s in selections]))
+
+        minutes = 0
+        time_str = row.get("time", "")
+        if "minute" in time_str.lower():
+            try:
+                minutes = int(''.join(filter(str.isdigit, time_str)))
+            except:
+                minutes = 0
+        elif "half" in time_str.lower():
+            minutes = 45
+
+        record = ProviderMatch(teams, prices, minutes, row.get("score", "N/A"),
+                               parse_capture_time(row.get("timestamp"), file_time))
+        return row.get("event_id"), teams, record
+
+
+class OrbitX(Provider):
+    name = "OrbitX"
+    module = "OrbitGather"
+    class_name = "OrbitXScraper"
+    data_file = "orbitx_latest"
+    urls = {
+        "soccer": "https://www.orbitxch.com/customer/sport/1",
+        "tennis": "https://www.orbitxch.com/customer/sport/2",
+        "basketball": "https://www.orbitxch.com/customer/sport/7522"
+    }
+    exchange = True
+    interval = 30
+    ready_on_data = True  # scrape_once navigates by itself
+    heading = "OrbitX (Back/Lay)"
+    column_width = 200
+
+    def create(self, sport, output_file, page):
+        scraper = self.scraper_class()(headless=True, outcome_labels=outcome_labels(sport), output_file=output_file)
+        scraper.url = self.urls[sport]
+        return scraper
+
+    async def setup(self, scraper, page):
+        pass
+
+    async def extract(self, scraper, page):
+        return await scraper.scrape_once(verbose=False, page=page)
+
+    async def parse(self, scraper, html):
+        return scraper.parse_html(html)
+
+    def save(self, scraper, data):
+        scraper.save_data(data)
+
+    def rows(self, data):
+        return [{'match_data': match} for match in data]
+
+    def read(self, file_path):
+        # One JSON object per line: {'timestamp', 'match_data'}
+        with open(file_path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def normalize(self, row, sport, file_time):
+        match_data = row.get("match_data", {})
+        teams = [match_data.get("team1", ""), match_data.get("team2", "")]
+        outcomes = match_data.get("outcomes", [])
+        main_market = main_market_keys(sport)[0][0]
+        keys = [(main_market, "", oc_data.get("outcome")) for oc_data in outcomes]
+        record = ExchangeMatch(
+            teams,
+            back_prices=build_prices(keys, [oc_data.get("back_odds", "N/A") for oc_data in outcomes]),
+            lay_prices=build_prices(keys, [oc_data.get("lay_odds", "N/A") for oc_data in outcomes]),
+            lay_ladders={key: parse_ladder(oc_data.get("lay_ladder")) for key, oc_data in zip(keys, outcomes)},
+            minutes=match_data.get("minutes", 0),
+            score=match_data.get("score", "N/A"),
+            captured_at=parse_capture_time(row.get("timestamp"), file_time)
+        )
+        return match_data.get("event_id"), teams, record
+
+
+# Display order of the provider columns; add a provider by declaring it above and listing it here
+PROVIDERS = {provider.name: provider for provider in (WinBet(), Efbet(), Betano(), OrbitX())}
+
+
+def provider_for_url(url):
+    """(provider name, sport) of the live page a tab shows, longest URL match first; None for other tabs."""
+    found, length = None, 0
+    for name, provider in PROVIDERS.items():
+        for sport, page_url in provider.urls.items():
+            page_url = page_url.rstrip('/')
+            if url.rstrip('/').startswith(page_url) and len(page_url) > length:
+                found, length = (name, sport), len(page_url)
+    return found
+
+
+def point_providers_at(base_url):
+    """Serve every provider's pages from base_url/<provider>/<sport> (e.g. the stand-in sites of LatencyHarness.py)."""
+    for name, provider in PROVIDERS.items():
+        provider.urls = {sport: f"{base_url.rstrip('/')}/{name.lower()}/{sport}" for sport in provider.urls}
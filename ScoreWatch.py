@@ -0,0 +1,119 @@
+import asyncio
+import re
+import time
+
+NUMBER = re.compile(r'\d+')
+
+
+def parse_score(score):
+    """(home, away, ...) numbers of a score string in any provider's format ('1-0', '1:0', '2 - 1'), or None."""
+    numbers = tuple(int(n) for n in NUMBER.findall(str(score)))
+    return numbers or None
+
+
+def scores_agree(records):
+    """
+    False when two providers show different scores for the match.
+    Only scores of the same shape are compared, since providers differ in how
+    much of a tennis or basketball score they show.
+    """
+    seen = {}
+    for record in records:
+        score = parse_score(record.score)
+        if score is not None and seen.setdefault(len(score), score) != score:
+            return False
+    return True
+
+
+class ScoreWatch:
+    """
+    Fast path for score changes.
+    Every extraction's scores are compared with the previous extraction of the
+    same provider; a changed score wakes the other providers of that sport out
+    of their sleep so their prices are re-read within seconds instead of on
+    their next 10-30 s cycle. A re-extraction that was itself woken does not
+    wake anyone else, so one goal costs each provider one extra extraction.
+    """
+
+    def __init__(self, sports, min_gap=3.0):
+        self.sports = set(sports)  # sports with the fast path on
+        self.min_gap = min_gap  # seconds between two wake-ups of the same provider
+        self.scores = {}  # (site, sport) -> {match id: parsed score}
+        self.events = {}  # (site, sport) -> asyncio.Event
+        self.woken_at = {}
+        self.changes = 0
+        self.wakeups = 0
+        self.held = {}  # merged key -> (held since, last checked)
+
+    def _event(self, site, sport):
+        event = self.events.get((site, sport))
+        if event is None:
+            event = self.events[(site, sport)] = asyncio.Event()
+        return event
+
+    async def wait(self, site, sport, timeout):
+        """Sleep for timeout seconds or until woken; True when woken."""
+        event = self._event(site, sport)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            event.clear()
+
+    def observe(self, site, sport, matches, propagate=True):
+        """
+        Record one extraction's scores ({match id: score}); wakes the sport's other
+        providers when a known match's score changed. Returns the changed match ids.
+        """
+        previous = self.scores.get((site, sport), {})
+        current = {}
+        changed = []
+        for match_id, score in matches.items():
+            parsed = parse_score(score)
+            if parsed is None:
+                continue
+            current[match_id] = parsed
+            before = previous.get(match_id)
+            if before is not None and before != parsed:
+                changed.append(match_id)
+        self.scores[(site, sport)] = current
+        if changed:
+            self.changes += len(changed)
+            if propagate and sport in self.sports:
+                self.wake_others(site, sport)
+        return changed
+
+    def wake_others(self, site, sport):
+        now = time.time()
+        for (other, other_sport), event in self.events.items():
+            if other_sport != sport or other == site:
+                continue
+            if now - self.woken_at.get((other, other_sport), 0) < self.min_gap:
+                continue
+            self.woken_at[(other, other_sport)] = now
+            self.wakeups += 1
+            event.set()
+
+    def hold(self, key, sport, records, now=None):
+        """
+        True while the providers listing the match disagree on its score.
+        Only sports with the fast path are held: in high-scoring sports the
+        providers rarely show the same score at once, so nothing would ever pass.
+        """
+        now = time.time() if now is None else now
+        if sport not in self.sports or scores_agree(records):
+            self.held.pop(key, None)
+            return False
+        since = self.held.get(key, (now, now))[0]
+        self.held[key] = (since, now)
+        return True
+
+    def held_count(self, max_age=120):
+        """Matches currently held; ones not re-checked for max_age seconds have left the board."""
+        now = time.time()
+        for key, (_, checked) in list(self.held.items()):
+            if now - checked > max_age:
+                self.held.pop(key, None)
+        return len(self.held)
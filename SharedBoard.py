@@ -0,0 +1,119 @@
+import json
+import logging
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct('<5Q')  # seq, then (seq, length) of slot 0 and slot 1
+SLOTS = 2
+
+
+def _attach(name):
+    """Map an existing block without letting this process's resource tracker unlink it on exit."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if sys.platform != 'win32':
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+class SharedBoardWriter:
+    """
+    Publishes board snapshots into a double-buffered shared memory block.
+    Each snapshot is serialized once into the slot readers are not pointed at,
+    then the header sequence is bumped to flip them over. The writer never
+    waits for or even knows about readers, so a slow or crashed viewer cannot
+    hold back analysis.
+    """
+
+    def __init__(self, name, slot_size=8 * 2 ** 20):
+        self.name = name
+        self.slot_size = slot_size
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER.size + SLOTS * slot_size)
+        except FileExistsError:
+            # Left behind by a previous run that did not shut down cleanly
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER.size + SLOTS * slot_size)
+        HEADER.pack_into(self.shm.buf, 0, 0, 0, 0, 0, 0)
+        self.seq = 0
+
+    def publish(self, snapshot):
+        """Write one snapshot; returns its sequence number, or None when it does not fit a slot."""
+        payload = json.dumps(snapshot, separators=(',', ':')).encode('utf-8')
+        if len(payload) > self.slot_size:
+            logger.warning(f"Board snapshot of {len(payload)} bytes exceeds the {self.slot_size} byte slot, skipped",
+                           extra={'rate_key': ('board oversize', self.name)})
+            return None
+        seq = self.seq + 1
+        slot = seq % SLOTS
+        offset = HEADER.size + slot * self.slot_size
+        # Invalidate the slot, fill it, stamp it, then flip the sequence readers poll
+        struct.pack_into('<Q', self.shm.buf, 8 + 16 * slot, 0)
+        self.shm.buf[offset:offset + len(payload)] = payload
+        struct.pack_into('<2Q', self.shm.buf, 8 + 16 * slot, seq, len(payload))
+        struct.pack_into('<Q', self.shm.buf, 0, seq)
+        self.seq = seq
+        return seq
+
+    def close(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedBoardReader:
+    """Maps a writer's block; read() returns the newest consistent snapshot."""
+
+    def __init__(self, name):
+        self.shm = _attach(name)
+        self.slot_size = (self.shm.size - HEADER.size) // SLOTS
+        self.seq = 0
+
+    def read(self, retries=5):
+        """(seq, snapshot) when a newer snapshot is available, else None."""
+        for _ in range(retries):
+            seq, = struct.unpack_from('<Q', self.shm.buf, 0)
+            if seq == 0 or seq == self.seq:
+                return None
+            slot = seq % SLOTS
+            slot_seq, length = struct.unpack_from('<2Q', self.shm.buf, 8 + 16 * slot)
+            offset = HEADER.size + slot * self.slot_size
+            payload = bytes(self.shm.buf[offset:offset + length])
+            # A writer reusing this slot zeroes its stamp first, so a torn copy fails this check
+            if struct.unpack_from('<Q', self.shm.buf, 8 + 16 * slot)[0] == slot_seq == seq:
+                self.seq = seq
+                return seq, json.loads(payload)
+        return None
+
+    def close(self):
+        self.shm.close()
+
+
+if __name__ == "__main__":
+    # Minimal viewer: python SharedBoard.py [block name]
+    reader = SharedBoardReader(sys.argv[1] if len(sys.argv) > 1 else "mbot_board")
+    try:
+        while True:
+            update = reader.read()
+            if update is not None:
+                seq, snapshot = update
+                print(f"\n#{seq} {time.strftime('%H:%M:%S', time.localtime(snapshot['published_at']))}")
+                for sport, board in snapshot['sports'].items():
+                    print(f"  {sport}: {len(board['rows'])} matches, {len(board['opportunities'])} opportunities")
+                    for o in board['opportunities'][:5]:
+                        print(f"    {' vs '.join(o['teams'])} {o['market']} {o['outcome']} "
+                              f"{o['providers']} ${o['profit']:.2f}")
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        reader.close()
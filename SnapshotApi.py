@@ -0,0 +1,209 @@
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+GZIP_MIN_BYTES = 1024  # smaller bodies are sent as they are
+
+
+def _encode(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+class SnapshotApi:
+    """
+    Read-only local HTTP API over the published board, for tools that want the
+    merged data without the Tk window or the raw provider files.
+
+        GET /board[?sport=soccer]            merged rows, opportunities and signals
+        GET /board?since=<seq>[&sport=...]   only rows changed or removed after seq
+        GET /opportunities[?sport=soccer]    open opportunities, most profitable first
+        GET /providers/<name>[?sport=...]    one provider's quotes of the merged matches
+
+    Deltas group changed rows and removed match keys by sport, like the
+    opportunities. Sports and providers outside the known names get a 404; a
+    known one that is idle gets an empty result.
+
+    Every response carries the board sequence (X-Board-Seq) and an ETag of its
+    body; a poller sending If-None-Match gets an empty 304 until that resource
+    actually changes. Bodies are encoded (and gzipped) once per sequence however
+    many clients ask. Deltas reach back history sequences; older since values
+    get the full board with "full": true.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8766, history=200, sports=(), providers=()):
+        self.host = host
+        self.port = port
+        self.history = history
+        self.sports = set(sports)  # known besides the ones on the board
+        self.providers = set(providers)
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.snapshot = {'published_at': None, 'sports': {}}
+        self.rows = {}  # (sport, match key) -> row
+        self.changed = {}  # (sport, match key) -> seq of its last change
+        self.removed = {}  # (sport, match key) -> seq it left the board
+        self.floor = 0  # oldest since a delta can still be served for
+        self.cache = {}  # (resource, sport, provider) -> (etag, body, gzipped body) of the current seq
+        self.server = None
+
+    def publish(self, snapshot):
+        """
+        Swap in a new board snapshot (as produced by mBot.board_snapshot); returns its sequence.
+        The sequence only advances when a row, opportunity or signal changed.
+        """
+        with self.lock:
+            seq = self.seq + 1
+            current = set()
+            dirty = any(self.snapshot['sports'].get(sport, {}).get(part) != board.get(part)
+                        for sport, board in snapshot['sports'].items() for part in ('opportunities', 'signals'))
+            dirty = dirty or snapshot['sports'].keys() != self.snapshot['sports'].keys()
+            for sport, board in snapshot['sports'].items():
+                for row in board['rows']:
+                    key = (sport, row['match_key'])
+                    current.add(key)
+                    if self.rows.get(key) != row:
+                        dirty = True
+                        self.rows[key] = row
+                        self.changed[key] = seq
+                        self.removed.pop(key, None)
+            for key in self.rows.keys() - current:
+                dirty = True
+                del self.rows[key]
+                del self.changed[key]
+                self.removed[key] = seq
+            if not dirty:
+                return self.seq
+            self.floor = max(0, seq - self.history)
+            for key in [k for k, removed_at in self.removed.items() if removed_at <= self.floor]:
+                del self.removed[key]
+            self.seq = seq
+            self.snapshot = snapshot
+            self.cache = {}
+        return seq
+
+    def _sports(self, sport):
+        sports = self.snapshot['sports']
+        return {sport: sports[sport]} if sport in sports else {} if sport else sports
+
+    def _body(self, resource, sport, name=None):
+        """(etag, body, gzipped body) of a full resource, built once per sequence."""
+        cache_key = (resource, sport, name)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        sports = self._sports(sport)
+        if resource == 'board':
+            value = {'seq': self.seq, 'published_at': self.snapshot['published_at'], 'full': True, 'sports': sports}
+        elif resource == 'opportunities':
+            value = {'opportunities': sorted(
+                (o for board in sports.values() for o in board['opportunities']), key=lambda o: -o['profit'])}
+        else:
+            value = {'provider': name, 'sports': {
+                sport_name: [{'match_key': row['match_key'], 'teams': row['teams'], 'minutes': row['minutes'],
+                              'odds': row['odds'][name]}
+                             for row in board['rows'] if name in row['odds']]
+                for sport_name, board in sports.items()}}
+        body = _encode(value)
+        cached = (f'"{hashlib.sha1(body).hexdigest()[:20]}"', body,
+                  gzip.compress(body, 6) if len(body) >= GZIP_MIN_BYTES else None)
+        self.cache[cache_key] = cached
+        return cached
+
+    def _delta(self, since, sport):
+        rows = {}
+        for key, changed_at in self.changed.items():
+            if changed_at > since and (sport is None or key[0] == sport):
+                rows.setdefault(key[0], []).append(self.rows[key])
+        removed = {}
+        for key, removed_at in self.removed.items():
+            if removed_at > since and (sport is None or key[0] == sport):
+                removed.setdefault(key[0], []).append(key[1])
+        sports = self._sports(sport)
+        body = _encode({
+            'seq': self.seq, 'since': since, 'published_at': self.snapshot['published_at'], 'full': False,
+            'rows': rows, 'removed': removed,
+            'opportunities': {name: board['opportunities'] for name, board in sports.items()},
+            'signals': {name: board.get('signals', []) for name, board in sports.items()}
+        })
+        # The sequence only moves when the board changes, so the span names the content
+        etag = f'"d{since}-{self.seq}-{sport or "all"}"'
+        return etag, body, gzip.compress(body, 6) if len(body) >= GZIP_MIN_BYTES else None
+
+    def _known_provider(self, name):
+        return name in self.providers or any(name in row['odds'] for row in self.rows.values())
+
+    def respond(self, path, query):
+        """(status, etag, body, gzipped body) for one GET."""
+        sport = query.get('sport', [None])[0]
+        with self.lock:
+            if sport is not None and sport not in self.sports and sport not in self.snapshot['sports']:
+                return 404, None, _encode({'error': f'unknown sport {sport}',
+                                           'sports': sorted(self.sports | self.snapshot['sports'].keys())}), None
+            if path == '/board':
+                since = query.get('since', [None])[0]
+                if since is not None:
+                    try:
+                        since = int(since)
+                    except ValueError:
+                        return 400, None, _encode({'error': 'since must be a sequence number'}), None
+                    if self.floor <= since <= self.seq:
+                        return (200, *self._delta(since, sport))
+                return (200, *self._body('board', sport))
+            if path == '/opportunities':
+                return (200, *self._body('opportunities', sport))
+            if path.startswith('/providers/'):
+                name = path[len('/providers/'):]
+                if not self._known_provider(name):
+                    return 404, None, _encode({'error': f'unknown provider {name}'}), None
+                return (200, *self._body('providers', sport, name))
+        return 404, None, _encode({'error': 'unknown resource',
+                                   'resources': ['/board', '/opportunities', '/providers/<name>']}), None
+
+    def start(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                status, etag, body, gzipped = api.respond(url.path.rstrip('/'), parse_qs(url.query))
+                if etag is not None and etag in self.headers.get('If-None-Match', ''):
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('X-Board-Seq', str(api.seq))
+                    self.end_headers()
+                    return
+                if gzipped is not None and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    body = gzipped
+                    self.send_response(status)
+                    self.send_header('Content-Encoding', 'gzip')
+                else:
+                    self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Vary', 'Accept-Encoding')
+                self.send_header('X-Board-Seq', str(api.seq))
+                if etag is not None:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        logger.info(f"🌐 Snapshot API listening on http://{self.host}:{self.port}/board")
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import logging
+import queue
+import socket
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+def row_digest(row):
+    return hashlib.sha1(json.dumps(row, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+
+
+class InProcessChannel:
+    """Stand-in for a broker inside one process: every message goes straight to the receiver."""
+
+    def __init__(self, receiver):
+        self.receiver = receiver
+        self.generation = 0  # bumped whenever messages may have been lost; never, here
+        self.dropped = 0
+
+    def send(self, message):
+        self.receiver.receive(message)
+        return True
+
+
+class SocketChannel:
+    """
+    Newline-delimited JSON over TCP to a TransportServer.
+    send() only queues, so a slow or unreachable analysis node never blocks a
+    monitor; a background thread connects, reconnects and writes. Whatever it
+    has to drop bumps generation, which makes the publisher send full
+    snapshots again.
+    """
+
+    def __init__(self, host, port, queue_size=256, timeout=5):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.generation = 0
+        self.dropped = 0
+        self.sock = None
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def send(self, message):
+        try:
+            self.queue.put_nowait((json.dumps(message, separators=(',', ':'), ensure_ascii=False) + '\n')
+                                  .encode('utf-8'))
+            return True
+        except queue.Full:
+            self._lost()
+            return False
+
+    def _lost(self):
+        self.dropped += 1
+        self.generation += 1
+
+    def _run(self):
+        while True:
+            data = self.queue.get()
+            if self.sock is None:
+                try:
+                    self.sock = socket.create_connection((self.host, self.port), self.timeout)
+                    self.sock.settimeout(self.timeout)
+                    # Whatever was sent before this connection may not have arrived
+                    self.generation += 1
+                except OSError as e:
+                    logger.debug(f"Analysis node {self.host}:{self.port} unreachable: {e}")
+                    self._lost()
+                    time.sleep(1)
+                    continue
+            try:
+                self.sock.sendall(data)
+            except OSError as e:
+                logger.warning(f"Lost connection to the analysis node: {e}")
+                self.sock.close()
+                self.sock = None
+                self._lost()
+
+
+class SnapshotPublisher:
+    """
+    Sender side of one monitor process: turns each extraction into a numbered
+    message per (site, sport) stream. Every keyframe_every-th message, and the
+    first one after the channel lost anything, is a full snapshot; the rest are
+    deltas (rows added / removed since the previous message). Rows are compared
+    without their 'timestamp', which the receiver derives from captured_at.
+    """
+
+    def __init__(self, channel, keyframe_every=10):
+        self.channel = channel
+        self.keyframe_every = keyframe_every
+        self.epoch = uuid.uuid4().hex  # a restarted sender starts a new numbering
+        self.streams = {}  # (site, sport) -> {'seq', 'digests', 'generation'}
+
+    def publish(self, site, sport, rows, captured_at=None):
+        rows = [{k: v for k, v in row.items() if k != 'timestamp'} for row in rows]
+        current = {row_digest(row): row for row in rows}
+        state = self.streams.setdefault((site, sport), {'seq': 0, 'digests': set(), 'generation': None})
+        seq = state['seq'] + 1
+        message = {'source': [site, sport], 'epoch': self.epoch, 'seq': seq,
+                   'captured_at': time.time() if captured_at is None else captured_at}
+        if (seq - 1) % self.keyframe_every == 0 or state['generation'] != self.channel.generation:
+            message.update(kind='snapshot', rows=rows)
+        else:
+            message.update(kind='delta', add=[row for digest, row in current.items() if digest not in state['digests']],
+                           remove=[digest for digest in state['digests'] if digest not in current])
+        state['generation'] = self.channel.generation
+        state['seq'] = seq
+        state['digests'] = set(current)
+        self.channel.send(message)
+        return seq
+
+
+class SnapshotReceiver:
+    """
+    Analysis side: rebuilds every stream's current rows from its messages.
+    A stream whose sequence skips a number has lost a delta; it keeps its last
+    consistent rows and ignores deltas until the next full snapshot arrives.
+    rows() hands out (version, rows, captured_at); version only moves when the
+    stream changed, so callers can cache whatever they derive from it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.streams = {}
+        self.gaps = 0
+
+    def receive(self, message):
+        stream = tuple(message['source'])
+        with self.lock:
+            state = self.streams.get(stream)
+            if state is None or state['epoch'] != message['epoch']:
+                state = self.streams[stream] = {'epoch': message['epoch'], 'seq': 0, 'rows': {}, 'synced': False,
+                                                'version': state['version'] if state else 0, 'gaps': 0,
+                                                'captured_at': 0.0, 'received_at': 0.0, 'lag': None}
+            seq = message['seq']
+            if seq <= state['seq']:
+                return  # duplicate or out of date
+            if state['synced'] and seq != state['seq'] + 1:
+                self.gaps += 1
+                state['gaps'] += 1
+                state['synced'] = False
+                logger.warning(f"{'/'.join(stream)}: {seq - state['seq'] - 1} message(s) missing before #{seq}, "
+                               f"waiting for the next full snapshot")
+            state['seq'] = seq
+            if message['kind'] == 'snapshot':
+                state['rows'] = {row_digest(row): row for row in message['rows']}
+                state['synced'] = True
+            elif not state['synced']:
+                return
+            else:
+                for digest in message['remove']:
+                    state['rows'].pop(digest, None)
+                for row in message['add']:
+                    state['rows'][row_digest(row)] = row
+            now = time.time()
+            state['captured_at'] = message['captured_at']
+            state['received_at'] = now
+            state['lag'] = now - message['captured_at']
+            state['version'] += 1
+
+    def rows(self, site, sport):
+        """(version, rows, captured_at) of a stream, or None before its first full snapshot."""
+        with self.lock:
+            state = self.streams.get((site, sport))
+            if state is None or not state['version']:
+                return None
+            return state['version'], list(state['rows'].values()), state['captured_at']
+
+    def metrics(self):
+        with self.lock:
+            return {stream: {'seq': s['seq'], 'gaps': s['gaps'], 'synced': s['synced'], 'lag': s['lag'],
+                             'age': time.time() - s['received_at'] if s['received_at'] else None}
+                    for stream, s in self.streams.items()}
+
+
+class TransportServer:
+    """Accepts SocketChannel connections from monitor processes and feeds their messages to a receiver."""
+
+    def __init__(self, receiver, host="127.0.0.1", port=8767):
+        self.receiver = receiver
+        self.host = host
+        self.port = port
+        self.sock = None
+
+    def start(self):
+        self.sock = socket.create_server((self.host, self.port))
+        threading.Thread(target=self._accept, daemon=True).start()
+        logger.info(f"📥 Accepting monitor workers on {self.host}:{self.port}")
+        return self
+
+    def _accept(self):
+        while self.sock is not None:
+            try:
+                connection, address = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(connection, address), daemon=True).start()
+
+    def _serve(self, connection, address):
+        logger.info(f"Monitor worker connected from {address[0]}:{address[1]}")
+        try:
+            with connection, connection.makefile('r', encoding='utf-8') as lines:
+                for line in lines:
+                    try:
+                        self.receiver.receive(json.loads(line))
+                    except (ValueError, KeyError) as e:
+                        logger.warning(f"Malformed message from {address[0]}: {e}")
+        except OSError:
+            pass
+        logger.info(f"Monitor worker {address[0]}:{address[1]} disconnected")
+
+    def stop(self):
+        if self.sock is not None:
+            sock, self.sock = self.sock, None
+            sock.close()
@@ -0,0 +1,76 @@
+class VirtualTable:
+    """
+    Windowed view of a large row list on a ttk.Treeview.
+    Only the rows that fit in the viewport exist as tree items; scrolling and
+    refreshes re-fill those items in place, so Tk layout cost stays constant
+    however many rows the board has. Rows are formatted lazily by formatter(row)
+    -> (values, tags), i.e. only when they become visible.
+    """
+
+    HEADING_HEIGHT = 25
+
+    def __init__(self, tree, scrollbar, formatter, row_height):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.formatter = formatter
+        self.row_height = row_height
+        self.rows = []
+        self.offset = 0
+        self.visible = 1
+        self.iids = []
+
+        scrollbar.configure(command=self.on_scrollbar)
+        tree.configure(yscrollcommand=lambda *args: None)  # the tree never scrolls by itself
+        tree.bind("<Configure>", self.on_resize)
+        tree.bind("<MouseWheel>", self.on_wheel)  # Windows / macOS
+        tree.bind("<Button-4>", lambda event: self.scroll(-3) or "break")  # X11
+        tree.bind("<Button-5>", lambda event: self.scroll(3) or "break")
+
+    def _clamp(self, offset):
+        return max(0, min(offset, len(self.rows) - self.visible))
+
+    def set_rows(self, rows):
+        """Replace the full row list, keeping the scroll position where possible."""
+        self.rows = rows
+        self.offset = self._clamp(self.offset)
+        self.render()
+
+    def scroll(self, delta):
+        offset = self._clamp(self.offset + delta)
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.offset = self._clamp(int(float(value) * len(self.rows)))
+            self.render()
+        elif action == "scroll":
+            self.scroll(int(value) * (self.visible if unit == "pages" else 1))
+
+    def on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def on_resize(self, event):
+        visible = max(1, (event.height - self.HEADING_HEIGHT) // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.offset = self._clamp(self.offset)
+            self.render()
+
+    def render(self):
+        window = self.rows[self.offset:self.offset + self.visible]
+        while len(self.iids) < len(window):
+            self.iids.append(self.tree.insert("", "end"))
+        while len(self.iids) > len(window):
+            self.tree.delete(self.iids.pop())
+        for iid, row in zip(self.iids, window):
+            values, tags = self.formatter(row)
+            self.tree.item(iid, values=values, tags=tags)
+
+        total = len(self.rows)
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(window)) / total)
+        else:
+            self.scrollbar.set(0, 1)
@@ -1,17 +1,23 @@
 import asyncio
 import json
+import logging
 import re
 from pyppeteer import launch
 from bs4 import BeautifulSoup
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 class LiveWinBetMonitor:
-    def __init__(self):
+    def __init__(self, file_path="D:/autochrome/gdata/winbet_odds.json",
+                 url="https://winbet.bg/in-play?sportId=soccer-1001", odds_count=3):
         self.browser = None
         self.page = None
-        self.file_path = "D:/autochrome/gdata/winbet_odds.json"
-        self.url = "https://winbet.bg/in-play?sportId=soccer-1001"
+        self.file_path = file_path
+        self.url = url
+        self.odds_count = odds_count  # 3 for 1/X/2 sports, 2 for sports without a draw
+        self.last_html = None  # markup of the latest extraction, for the capture archive
 
     async def initialize_browser(self):
         """Launch browser and open WinBet live page."""
@@ -51,51 +57,68 @@ class LiveWinBetMonitor:
         match = re.search(r'\d+', time_str)
         return int(match.group(0)) if match else 0
 
+    @staticmethod
+    def parse_event_id(match):
+        """Stable WinBet event id from the accordion's data attribute or its event link."""
+        event_id = match.get('data-event-id') or match.get('data-id')
+        if event_id:
+            return str(event_id)
+        link = match.select_one('a[href]')
+        found = re.search(r'(\d{5,})', link['href']) if link else None
+        return found.group(1) if found else None
+
     async def extract_live_matches(self):
         """Extract updated odds dynamically without refreshing."""
         try:
             content = await self.page.evaluate('document.documentElement.outerHTML')
-            soup = BeautifulSoup(content, 'html.parser')
-
-            matches = []
-            for match in soup.select('div.egtd-s-accordion--level-2'):
-                try:
-                    teams = [t.get_text(strip=True) for t in match.select('span.team')[:2]]
-                    scores = [s.get_text(strip=True) for s in match.select('div.score')[:2]]
-                    score = f"{scores[0]}-{scores[1]}" if len(scores) == 2 else 'N/A-N/A'
-
-                    time_element = match.select_one('span.egtd-s-clock, span.part.event-meta__item')
-                    time_str = time_element.get_text(strip=True) if time_element else 'N/A'
-
-                    odds = [odd.get_text(strip=True) for odd in match.select('span.egtd-odds__odd')[:3]]
-                    if len(odds) < 3:
-                        odds += ['N/A'] * (3 - len(odds))
-
-                    match_data = {
-                        'teams': teams,
-                        'score': score,
-                        'time': time_str,
-                        'minutes': self.parse_time(time_str),
-                        'odds': odds,
-                        'timestamp': datetime.now().strftime('%H:%M:%S')
-                    }
-                    matches.append(match_data)
-                except Exception as e:
-                    print(f"⚠️ Error parsing match: {e}")
-
-            return sorted(matches, key=lambda x: x['minutes'], reverse=True)
+            self.last_html = content
+            return self.parse_html(content)
         except Exception as e:
-            print(f"⚠️ Data extraction error: {e}")
+            logger.warning(f"⚠️ Data extraction error: {e}", extra={'rate_key': ('WinBet extract', self.url)})
             return []
 
+    def parse_html(self, content):
+        """Parse the in-play list markup into match dicts (also used to replay captured pages)."""
+        soup = BeautifulSoup(content, 'html.parser')
+
+        matches = []
+        for match in soup.select('div.egtd-s-accordion--level-2'):
+            try:
+                teams = [t.get_text(strip=True) for t in match.select('span.team')[:2]]
+                scores = [s.get_text(strip=True) for s in match.select('div.score')[:2]]
+                score = f"{scores[0]}-{scores[1]}" if len(scores) == 2 else 'N/A-N/A'
+
+                time_element = match.select_one('span.egtd-s-clock, span.part.event-meta__item')
+                time_str = time_element.get_text(strip=True) if time_element else 'N/A'
+
+                odds = [odd.get_text(strip=True) for odd in match.select('span.egtd-odds__odd')[:self.odds_count]]
+                if len(odds) < self.odds_count:
+                    odds += ['N/A'] * (self.odds_count - len(odds))
+
+                match_data = {
+                    'event_id': self.parse_event_id(match),
+                    'teams': teams,
+                    'score': score,
+                    'time': time_str,
+                    'minutes': self.parse_time(time_str),
+                    'odds': odds,
+                    'timestamp': datetime.now().isoformat()
+                }
+                matches.append(match_data)
+            except Exception as e:
+                logger.warning(f"⚠️ Error parsing match: {e}", extra={'rate_key': ('WinBet parse', self.url)})
+        soup.decompose()  # free the tree now instead of waiting for the cycle collector
+
+        return sorted(matches, key=lambda x: x['minutes'], reverse=True)
+
     def save_to_file(self, matches):
         """Save live match data to JSON file."""
         try:
             with open(self.file_path, "w", encoding="utf-8") as file:
                 json.dump(matches, file, indent=4, ensure_ascii=False)
-            print(f"💾 Data saved to {self.file_path}")
+            logger.debug(f"💾 Data saved to {self.file_path}")
         except Exception as e:
-            print(f"⚠️ Error saving file: {e}")
+            logger.warning(f"⚠️ Error saving file: {e}")
 
     def display_matches(self, matches):
         """Print extracted matches in a readable format."""
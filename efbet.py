@@ -17,6 +17,7 @@ class LiveEfbetMonitor:
         self.browser = None
         self.page = None
         self.frame = None
+        self.last_html = None  # markup of the latest extraction, for the capture archive
 
     async def initialize_browser(self):
         """Launch browser and open Efbet in-play page."""
@@ -68,13 +69,19 @@ class LiveEfbetMonitor:
             return []
 
         soup = BeautifulSoup(html_content, 'html.parser')
+        try:
+            return self.parse_soup(soup)
+        finally:
+            soup.decompose()  # free the tree now instead of waiting for the cycle collector
+
+    def parse_soup(self, soup):
         betting_data = []
 
         # Try parsing from sportEvents (iframe content)
         sport_events = soup.find('div', class_='sportEvents')
         if sport_events:
             event_containers = sport_events.find_all('div', class_='eventTbl', recursive=True)
-            logger.info(f"Found {len(event_containers)} eventTbl containers.")
+            logger.debug(f"Found {len(event_containers)} eventTbl containers.")
             for container in event_containers:
                 if 'loading' in container.get('class', []):
                     continue
@@ -128,14 +135,14 @@ class LiveEfbetMonitor:
                                 'selections': selections
                             })
                 betting_data.append(event_data)
-            logger.info(f"✅ Parsed {len(betting_data)} in-play events from sportEvents.")
+            logger.debug(f"✅ Parsed {len(betting_data)} in-play events from sportEvents.")
             return betting_data
 
         # Fallback: Parse from carousel items (main page)
         carousel_items = soup.find('div', id='SideCarouselMarketGroupListComponent26-carousel-items')
         if carousel_items:
             carousel_elements = carousel_items.find_all('div', class_='carousel-item')  # Parse all items, not just first
-            logger.info(f"Found {len(carousel_elements)} carousel items.")
+            logger.debug(f"Found {len(carousel_elements)} carousel items.")
             for item in carousel_elements:
                 market_group = item.find('p').find('span').get_text(strip=True)
                 event_data = {
@@ -160,7 +167,7 @@ class LiveEfbetMonitor:
                             'selections': selections
                         })
                 betting_data.append(event_data)
-            logger.info(f"✅ Parsed {len(betting_data)} events from carousel items.")
+            logger.debug(f"✅ Parsed {len(betting_data)} events from carousel items.")
             return betting_data
 
         logger.warning("⚠️ No sportEvents or carousel items found in the HTML.")
@@ -171,7 +178,7 @@ class LiveEfbetMonitor:
         try:
             with open(self.output_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=4)
-            logger.info(f"✅ Data saved to {self.output_file}")
+            logger.debug(f"✅ Data saved to {self.output_file}")
         except Exception as e:
             logger.error(f"⚠️ Error saving file: {e}")
 
@@ -180,6 +187,7 @@ class LiveEfbetMonitor:
         try:
             target = self.frame if self.frame else self.page
             html_content = await target.content()
+            self.last_html = html_content
             odds_data = self.parse_betting_data(html_content)
             return odds_data
         except Exception as e:
@@ -1,72 +1,169 @@
-import asyncio, json, os, subprocess
+import argparse, asyncio, json, logging, os, subprocess
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading, unicodedata, re
+import threading, unicodedata, re, time, queue
+from datetime import datetime
 from pyppeteer import connect
 from fuzzywuzzy import fuzz
-from utils.WinBetGather import LiveWinBetMonitor
-from utils.BetanoGather import BetanoScraper
-from utils.OrbitGather import OrbitXScraper
-from utils.efbet import LiveEfbetMonitor
+from utils.OpportunityStream import OpportunityPublisher
+from utils.OpportunityLifecycle import OpportunityTracker
+from utils.SharedBoard import SharedBoardWriter
+from utils.SnapshotApi import SnapshotApi
+from utils.Transport import InProcessChannel, SocketChannel, SnapshotPublisher, SnapshotReceiver, TransportServer
+from utils.Profiling import ProfilingHooks
+from utils.LogPipeline import DUMPS, setup_logging
+from utils.MatchRecords import NAN, MARKET_OUTCOMES, main_market_keys, format_odds, describe_selection
+from utils.Providers import PROVIDERS, point_providers_at, provider_for_url
+from utils.MatchIdentity import MatchIdentityCache
+from utils.MonitorSupervisor import MonitorSupervisor
+from utils.IncrementalBoard import IncrementalBoard
+from utils.VirtualTable import VirtualTable
+from utils.ProviderControl import ProviderController, NAVIGATING, READY, STOPPED
+from utils.BrowserPool import BrowserPool
+from utils.MemoryWatchdog import MemoryWatchdog
+from utils.CaptureArchive import CaptureArchive
+from utils.ScoreWatch import ScoreWatch
+try:
+    from utils.OddsMovement import OddsMovement
+except ImportError:  # numpy missing: no movement analytics
+    OddsMovement = None
 
 # === Configuration ===
 CHROME_PATH = r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"
-REMOTE_DEBUGGING_PORT = 9222
+REMOTE_DEBUGGING_PORTS = [9222, 9223]  # one Chrome instance per port; pages are spread across them
 DATA_DIR = r"D:\autochrome\gdata"
-
-SITE_URLS = {
-    "WinBet": "https://winbet.bg/in-play?sportId=soccer-1001",
-    "Betano": "https://www.betano.bg/en/live/",
-    "Efbet": "https://www.efbet.com/UK/inplay#action=inplay"
-}
+STREAM_HOST = "127.0.0.1"
+STREAM_PORT = 8765
+SHARED_BOARD_NAME = "mbot_board"  # viewers attach with: python SharedBoard.py mbot_board
+API_HOST = "127.0.0.1"
+API_PORT = 8766  # GET /board, /board?since=<seq>, /opportunities, /providers/<name>
+ROW_HEIGHT = 50
+CAPTURE_SKEW_SECONDS = 20  # only compare odds captured this close together
+AGED_RECORD_SECONDS = 30  # flag provider data older than this in the view
+RECORD_TTL_SECONDS = 120  # drop provider data older than this entirely
+PAGE_MEMORY_BUDGET_MB = 400  # JS heap per provider tab before it is recycled
+PROCESS_MEMORY_BUDGET_MB = 1500  # RSS of this process (needs psutil); over it the parsed-record caches are dropped
+# How monitor output reaches analysis: "files" (DATA_DIR, as the standalone scrapers write it), "inprocess"
+# (handed over in memory) or "socket" (TCP on TRANSPORT_PORT, which also accepts worker processes:
+# python mBot.py --worker Betano:soccer Efbet:soccer --analysis <this host>:8767)
+TRANSPORT = "files"
+TRANSPORT_HOST = "127.0.0.1"  # 0.0.0.0 to accept workers from other machines
+TRANSPORT_PORT = 8767
+WARM_START = True  # keep Chrome and the provider tabs open on exit and reattach to them on the next start
+CAPTURE_PAGES = False  # archive the markup of every extraction; replay with: python CaptureArchive.py <dir>
+CAPTURE_DIR = os.path.join(DATA_DIR, "captures")
+CAPTURE_MAX_MB = 2048  # oldest captures are deleted beyond this
+CAPTURE_MAX_AGE_HOURS = 48
+SCORE_FAST_PATH_SPORTS = ["soccer"]  # a goal re-scrapes the other providers; basketball scores too often for that
+LOG_LEVEL = "INFO"
+LOG_FILE = os.path.join(DATA_DIR, "mbot.log")  # JSON lines, rotated at 20 MB; None for the console only
+LOG_SUMMARY_SECONDS = 60  # one extraction summary per provider and sport per interval
+LOG_FULL_DUMPS = False  # also log every extraction's rows (mbot.dumps, DEBUG); large, for debugging parsers
+
+SPORTS = ["soccer", "tennis", "basketball"]
+# Provider URLs, page setup, extraction and parsing are declared in Providers.py
+SITES = list(PROVIDERS)
+# e.g. http://127.0.0.1:8700 to run against the stand-in sites of LatencyHarness.py --serve
+SITE_BASE_URL = os.environ.get("MBOT_SITE_BASE_URL")
+if SITE_BASE_URL:
+    point_providers_at(SITE_BASE_URL)
 
 # Global variables
+logger = logging.getLogger("mbot")
+dumps = logging.getLogger(DUMPS)
+log_listener = None
+launched_at = time.time()
+worker_mode = False  # headless monitors only, see run_worker
+snapshot_receiver = SnapshotReceiver() if TRANSPORT != "files" else None
+snapshot_sender = None  # SnapshotPublisher when monitors publish through a transport
+transport_server = None
+stream_cache = {}  # (site, sport) -> (stream version, parsed records)
 async_loop = None
-browser = None
-browser_connected = False
-chrome_process = None
+browser_pool = None
+chrome_profile_dir = None
+supervisor = None
+controller = None
+memory_watchdog = None
+provider_states = queue.Queue()  # (key, state, detail) from the loop thread to Tk
 site_tasks = {}
 checkbox_vars = {}
 checkbox_widgets = {}
 status_label = None
 analysis_tree = None
+analysis_table = None
 analysis_frame = None
+filter_arbitrage = None
+filter_exchange = None
+filter_min_profit = None
+metrics_label = None
+view_sport = None
+sport_boards = {}  # sport -> IncrementalBoard
+sport_metrics = {}  # sport -> analysis throughput of the last refresh
+extraction_metrics = {}  # (site, sport) -> scrape throughput
+warmup_metrics = {}  # (site, sport) -> time from monitor start to first data
+opportunity_publisher = OpportunityPublisher(host=STREAM_HOST, port=STREAM_PORT)
+opportunity_tracker = OpportunityTracker()
+shared_board = None
+snapshot_api = None
+# Edit profiling.json at runtime to sample sections ("analysis", "Betano/soccer", ...) or enable tracemalloc
+profiling = ProfilingHooks(os.path.join(DATA_DIR, "profiling.json"), os.path.join(DATA_DIR, "diagnostics"))
+file_cache = {}  # path -> (mtime, parsed records)
+capture_archive = CaptureArchive(CAPTURE_DIR, max_bytes=CAPTURE_MAX_MB * 2 ** 20,
+                                 max_age=CAPTURE_MAX_AGE_HOURS * 3600) if CAPTURE_PAGES else None
+score_watch = ScoreWatch(SCORE_FAST_PATH_SPORTS)
+odds_movement = OddsMovement() if OddsMovement is not None else None
 
 if not os.path.exists(DATA_DIR):
     os.makedirs(DATA_DIR)
 
 
-def load_orbitx_data():
-    orbitx_dict = {}
-    try:
-        with open(os.path.join(DATA_DIR, "orbitx_latest.json"), "r", encoding="utf-8") as f:
-            for line in f:
-                entry = json.loads(line)
-                match_data = entry.get("match_data", {})
-                teams = [match_data.get("team1", ""), match_data.get("team2", "")]
-                normalized_key = tuple(sorted([normalize_team_name(t) for t in teams]))
-
-                outcomes = {}
-                for oc_data in match_data.get("outcomes", []):
-                    oc = oc_data.get("outcome")
-                    outcomes[oc] = {
-                        "back_odds": oc_data.get("back_odds", "N/A"),
-                        "lay_odds": oc_data.get("lay_odds", "N/A")
-                    }
-
-                orbitx_dict[normalized_key] = {
-                    "outcomes": {
-                        "1": outcomes.get("1", {"back_odds": "N/A", "lay_odds": "N/A"}),
-                        "X": outcomes.get("X", {"back_odds": "N/A", "lay_odds": "N/A"}),
-                        "2": outcomes.get("2", {"back_odds": "N/A", "lay_odds": "N/A"}),
-                    },
-                    "minutes": match_data.get("minutes", 0),
-                    "original_teams": teams
-                }
-        return orbitx_dict
-    except Exception as e:
-        print(f"Error loading OrbitX data: {e}")
-        return {}
+def data_file(site_name, sport):
+    """Soccer keeps the original file names so the standalone scrapers still line up."""
+    suffix = "" if sport == "soccer" else f"_{sport}"
+    return os.path.join(DATA_DIR, f"{PROVIDERS[site_name].data_file}{suffix}.json")
+
+
+def record_extraction(site_name, sport, match_count, started):
+    """Track per provider/sport scrape throughput (called from the monitor loops)."""
+    stats = extraction_metrics.setdefault((site_name, sport), {
+        'cycles': 0, 'matches': 0, 'last_ms': 0.0, 'since': time.time(), 'empty_cycles': 0})
+    stats['cycles'] += 1
+    stats['matches'] += match_count
+    stats['last_ms'] = (time.perf_counter() - started) * 1000
+    # A sport with no live events is healthy; consecutive empty boards are tracked on their own
+    stats['empty_cycles'] = 0 if match_count else stats['empty_cycles'] + 1
+    if supervisor is not None:
+        supervisor.heartbeat((site_name, sport))
+
+
+def log_extraction(site_name, sport, data):
+    """Rate-limited summary of one extraction; the rows themselves only go out with LOG_FULL_DUMPS."""
+    stats = extraction_metrics[(site_name, sport)]
+    logger.info("extracted", extra={'rate_key': ('extracted', site_name, sport), 'fields': {
+        'provider': site_name, 'sport': sport, 'matches': len(data), 'ms': round(stats['last_ms'], 1),
+        'cycles': stats['cycles']}})
+    if dumps.isEnabledFor(logging.DEBUG):
+        dumps.debug("rows", extra={'fields': {'provider': site_name, 'sport': sport, 'rows': data}})
+
+
+def cached_by_mtime(loader):
+    """Parse each scraper output file only when it changes on disk."""
+    def wrapper(file_path, *args):
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            return {}  # provider/sport not scraped yet
+        if time.time() - mtime > RECORD_TTL_SECONDS:
+            # Scraper stopped writing: forget its data instead of merging dead odds
+            file_cache.pop(file_path, None)
+            return {}
+        cached = file_cache.get(file_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        records = loader(file_path, *args)
+        file_cache[file_path] = (mtime, records)
+        return records
+    return wrapper
 
 
 # -----------------------
@@ -97,21 +194,7 @@ def normalize_team_name(name):
     return normalized
 
 
-# -----------------------
-# Improved Minute Parsing
-# -----------------------
-def get_minutes(match):
-    try:
-        time_str = str(match.get("minutes", 0))
-        # Handle cases like '45+2' => 47
-        if '+' in time_str:
-            parts = time_str.split('+')
-            base = int(parts[0]) if parts[0] else 0
-            added = sum(int(p) for p in parts[1:] if p)
-            return base + added
-        return int(time_str)
-    except:
-        return 0
+identity_cache = MatchIdentityCache(os.path.join(DATA_DIR, "match_identity.json"), normalize_team_name)
 
 
 # -----------------------
@@ -125,245 +208,435 @@ def match_teams(team1, team2, threshold=85):
 # -----------------------
 # Advanced Match Merging
 # -----------------------
-def merge_matches(wb_dict, bt_dict, ef_dict, orbitx_dict):
-    all_keys = set(wb_dict.keys()) | set(bt_dict.keys()) | set(ef_dict.keys()) | set(orbitx_dict.keys())
-
-    orbitx_matches = []
-    all_three = []
-    two_providers = []
-    unique = []
-
-    for key in all_keys:
-        providers = []
-        if key in wb_dict: providers.append('wb')
-        if key in bt_dict: providers.append('bt')
-        if key in ef_dict: providers.append('ef')
-        orbitx_data = orbitx_dict.get(key, None)
-
-        entry = {
-            'wb': wb_dict.get(key),
-            'bt': bt_dict.get(key),
-            'ef': ef_dict.get(key),
-            'orbitx': orbitx_data,
-            'minutes': max(
-                wb_dict.get(key, {}).get('minutes', 0),
-                bt_dict.get(key, {}).get('minutes', 0),
-                ef_dict.get(key, {}).get('minutes', 0),
-                orbitx_data.get('minutes', 0) if orbitx_data else 0
-            ),
-            'provider_count': len(providers),
-            'original_teams': next(
-                (m['original_teams'] for m in [wb_dict.get(key), bt_dict.get(key), ef_dict.get(key), orbitx_data] if m),
-                []
-            )
-        }
-
-        # Prioritize OrbitX matches
-        if orbitx_data:
-            orbitx_matches.append(entry)
-        else:
-            if len(providers) == 3:
-                all_three.append(entry)
-            elif len(providers) == 2:
-                two_providers.append(entry)
-            else:
-                unique.append(entry)
-
-    # Sort OrbitX matches by number of supporting providers
-    orbitx_matches.sort(key=lambda x: (-x['provider_count'], -x['minutes']))
-
-    # Sort other groups
-    all_three.sort(key=lambda x: -x['minutes'])
-    two_providers.sort(key=lambda x: -x['minutes'])
-    unique.sort(key=lambda x: -x['minutes'])
-
-    return orbitx_matches, all_three, two_providers, unique
+def row_sort_key(entry):
+    """
+    Display priority: exchange-listed matches first (most supporting bookmakers first),
+    then matches on more bookmakers before fewer; latest minutes first within a group.
+    """
+    if entry.exchanges:
+        return 0, -entry.provider_count, -entry.minutes
+    return 1, -entry.provider_count, -entry.minutes
+
+
+def normalize_rows(provider, rows, sport, capture_time):
+    """{canonical key: record} of one provider's rows through its normalizer."""
+    site_dict = {}
+    for row in rows:
+        normalized = provider.normalize(row, sport, capture_time)
+        if normalized is None:
+            continue
+        event_id, teams, record = normalized
+        # Resolve the canonical key (event id lookup, names only for unseen ids)
+        if len(teams) == 2:
+            site_dict[identity_cache.resolve(provider.name, event_id, teams)] = record
+    return site_dict
+
+
+@cached_by_mtime
+def load_provider_data(file_path, site_name, sport="soccer"):
+    """Parse one provider's output file into {canonical key: record} through its normalizer."""
+    provider = PROVIDERS[site_name]
+    try:
+        return normalize_rows(provider, provider.read(file_path), sport, os.path.getmtime(file_path))
+    except Exception as e:
+        logger.warning(f"Error loading {site_name} data: {e}", extra={'rate_key': ('load', site_name, sport)})
+        return {}
 
 
-def load_site_data(file_path, site_name):
+def load_stream_data(site_name, sport="soccer"):
+    """load_provider_data for a provider whose snapshots arrive through the transport."""
+    stream = snapshot_receiver.rows(site_name, sport)
+    if stream is None:
+        return {}
+    version, rows, captured_at = stream
+    if time.time() - captured_at > RECORD_TTL_SECONDS:
+        stream_cache.pop((site_name, sport), None)
+        return {}
+    cached = stream_cache.get((site_name, sport))
+    if cached and cached[0] == version:
+        return cached[1]
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            site_dict = {}
-
-            for match in data:
-                processed_match = {
-                    "teams": [],
-                    "odds": ["N/A", "N/A", "N/A"],
-                    "minutes": 0,
-                    "score": "N/A",
-                    "original_teams": []
-                }
-
-                # Common structure for WinBet and Betano
-                if site_name in ["WinBet", "Betano"]:
-                    processed_match["teams"] = match.get("teams", [])
-                    processed_match["odds"] = match.get("odds", ["N/A", "N/A", "N/A"])
-                    processed_match["minutes"] = get_minutes(match)
-                    processed_match["score"] = match.get("score", "N/A")
-                    processed_match["original_teams"] = processed_match["teams"]
-
-                # Efbet-specific processing
-                elif site_name == "Efbet":
-                    # Extract and split teams
-                    teams = match.get("teams", "")
-                    if isinstance(teams, str):
-                        processed_match["teams"] = [t.strip() for t in teams.split(" - ")]
-                    else:
-                        processed_match["teams"] = teams
-
-                    # Extract match result odds
-                    for market in match.get("markets", []):
-                        if market.get("market", "").lower() == "match result":
-                            selections = market.get("selections", [])
-                            if len(selections) >= 3:
-                                processed_match["odds"] = [
-                                    selections[0].get("odds", "N/A"),
-                                    selections[1].get("odds", "N/A"),
-                                    selections[2].get("odds", "N/A")
-                                ]
-
-                    # Parse time to minutes
-                    time_str = match.get("time", "")
-                    if "minute" in time_str.lower():
-                        try:
-                            processed_match["minutes"] = int(''.join(filter(str.isdigit, time_str)))
-                        except:
-                            processed_match["minutes"] = 0
-                    elif "half" in time_str.lower():
-                        processed_match["minutes"] = 45
-                    else:
-                        processed_match["minutes"] = 0
-
-                    processed_match["score"] = match.get("score", "N/A")
-                    processed_match["original_teams"] = processed_match["teams"]
-
-                # Create normalized key if valid teams exist
-                if len(processed_match["teams"]) == 2:
-                    normalized_key = tuple(sorted([normalize_team_name(t) for t in processed_match["teams"]]))
-                    site_dict[normalized_key] = processed_match
-
-            return site_dict
+        records = normalize_rows(PROVIDERS[site_name], rows, sport, captured_at)
     except Exception as e:
-        print(f"Error loading {site_name} data: {e}")
-        return {}
+        logger.warning(f"Error loading {site_name} data: {e}", extra={'rate_key': ('load', site_name, sport)})
+        records = {}
+    stream_cache[(site_name, sport)] = (version, records)
+    return records
+
+
+def trim_caches():
+    """Drop the parsed-record caches (rebuilt on the next load); returns how many entries went."""
+    dropped = len(file_cache) + len(stream_cache)
+    file_cache.clear()
+    stream_cache.clear()
+    return dropped
 
 
 # -----------------------
 # Data Processing & Analysis View Update
 # -----------------------
-def load_betting_data():
-    return (
-        load_site_data(os.path.join(DATA_DIR, "winbet_odds.json"), "WinBet"),
-        load_site_data(os.path.join(DATA_DIR, "betano_data.json"), "Betano"),
-        load_site_data(os.path.join(DATA_DIR, "efbet_odds.json"), "Efbet"),
-        load_orbitx_data()  # Must be 4th return value
-    )
+def load_betting_data(sport="soccer"):
+    """{provider name: {canonical key: record}} for every provider serving the sport."""
+    if snapshot_receiver is not None:
+        return {name: load_stream_data(name, sport) for name, provider in PROVIDERS.items() if sport in provider.urls}
+    return {name: load_provider_data(data_file(name, sport), name, sport)
+            for name, provider in PROVIDERS.items() if sport in provider.urls}
 
 
-def format_orbitx(data):
-    if not data or not data.get('outcomes'):
+def format_exchange_odds(data, keys, marks=None):
+    if not data:
         return "N/A"
 
     odds_str = []
-    for outcome in ['1', 'X', '2']:
-        oc_data = data['outcomes'].get(outcome, {})
-        back = oc_data.get('back_odds', 'N/A')
-        lay = oc_data.get('lay_odds', 'N/A')
-        odds_str.append(f"{outcome}: {back}/{lay}")
+    for key in keys:
+        back = format_odds(data.back_prices.get(key, NAN))
+        lay = format_odds(data.lay_prices.get(key, NAN))
+        odds_str.append(f"{key[2]}: {back}/{lay}{marks.get(key, '') if marks else ''}")
     return "\n".join(odds_str)
 
 
-def get_max_back_odds(entry, outcome_index):
-    odds_list = []
-    for provider in ['wb', 'ef', 'bt']:  # WinBet, Efbet, Betano
-        if entry.get(provider):
-            odds = entry[provider].get('odds', ["N/A", "N/A", "N/A"])[outcome_index]
-            if odds != "N/A":
-                try:
-                    odds_list.append(float(odds))
-                except ValueError:
-                    pass
-    return max(odds_list) if odds_list else None
+def get_best_back_prices(entry, reference_time=None):
+    """
+    Best bookmaker back price per selection: {(market, line, outcome): (odds, provider name, captured_at)}.
+    With a reference_time, only records captured within CAPTURE_SKEW_SECONDS of it compete.
+    """
+    best = {}
+    for provider, record in entry.bookmakers.items():
+        if reference_time is not None and abs(record.captured_at - reference_time) > CAPTURE_SKEW_SECONDS:
+            continue
+        for selection, odds in record.prices.items():
+            current = best.get(selection)
+            if current is None or odds > current[0]:
+                best[selection] = (odds, provider, record.captured_at)
+    return best
+
+
+def size_back_lay(back_odds, lay_ladder):
+    """
+    Walk the lay ladder (best first) while the price is still below the back odds.
+    Laying s at L against a back stake of s * L / B locks in s * (B - L) / B whatever happens.
+    Returns (max back stake, total lay stake, expected profit), or Nones without liquidity data.
+    """
+    if not lay_ladder:
+        return None, None, None
+    back_stake = lay_stake = profit = 0.0
+    for lay_odds, amount in lay_ladder:
+        if lay_odds >= back_odds:
+            break
+        back_stake += amount * lay_odds / back_odds
+        lay_stake += amount
+        profit += amount * (back_odds - lay_odds) / back_odds
+    return round(back_stake, 2), round(lay_stake, 2), round(profit, 2)
+
+
+def find_arbitrage(entry, sport="soccer"):
+    """
+    Return structured opportunities over every market of one merged entry:
+    bookmaker back vs exchange lay per selection, and dutching all outcomes of a
+    complete market across bookmakers. One pass over the entry's providers,
+    linear in the number of selections.
+    Legs are only combined when captured within CAPTURE_SKEW_SECONDS of each other,
+    and in SCORE_FAST_PATH_SPORTS nothing is reported while the providers disagree on the score.
+    """
+    if score_watch.hold(entry.key, sport, entry.records.values()):
+        return []  # a score just changed and not every provider has caught up; prices are in flux
+    best = get_best_back_prices(entry)
+    opportunities = []
+    detected_at = datetime.now().isoformat()
+    match_key = "|".join(entry.key)
+
+    def opportunity(market, line, outcome, providers, odds, profit, captured_at, sizing=(None, None, None)):
+        return {
+            'sport': sport,
+            'match_key': match_key,
+            'teams': entry.original_teams,
+            'market': market,
+            'line': line,
+            'outcome': outcome,
+            'providers': providers,
+            'odds': odds,
+            'profit': round(profit, 2),
+            'max_stake': sizing[0],
+            'lay_stake': sizing[1],
+            'expected_profit': sizing[2],
+            'captured_at': datetime.fromtimestamp(captured_at).isoformat(),
+            'detected_at': detected_at
+        }
+
+    # Back at the best bookmaker, lay on each exchange
+    for exchange_name, exchange in entry.exchanges.items():
+        aligned = get_best_back_prices(entry, reference_time=exchange.captured_at)
+        for selection, lay_odds in exchange.lay_prices.items():
+            back = aligned.get(selection)
+            if back is not None and back[0] > lay_odds:
+                market, line, outcome = selection
+                opportunities.append(opportunity(
+                    market, line, outcome,
+                    {'back': back[1], 'lay': exchange_name},
+                    {'back': back[0], 'lay': lay_odds},
+                    1000 * (back[0] / lay_odds - 1),
+                    max(back[2], exchange.captured_at),
+                    size_back_lay(back[0], exchange.lay_ladders.get(selection))))
+
+    # Dutch every outcome of a complete market at the best bookmaker prices
+    markets = {}
+    for (market, line, outcome), back in best.items():
+        markets.setdefault((market, line), {})[outcome] = back
+    for (market, line), backs in markets.items():
+        outcomes = MARKET_OUTCOMES.get(market)
+        if not outcomes or any(oc not in backs for oc in outcomes):
+            continue
+        captured = [backs[oc][2] for oc in outcomes]
+        if max(captured) - min(captured) > CAPTURE_SKEW_SECONDS:
+            continue
+        book = sum(1 / backs[oc][0] for oc in outcomes)
+        if book < 1:
+            opportunities.append(opportunity(
+                market, line, 'all',
+                {oc: backs[oc][1] for oc in outcomes},
+                {oc: backs[oc][0] for oc in outcomes},
+                1000 * (1 / book - 1),
+                max(captured)))
+    return opportunities
 
 
 # -----------------------
 # Updated Analysis View with Arbitrage
 # -----------------------
-def update_analysis_view():
-    wb_dict, bt_dict, ef_dict, orbitx_dict = load_betting_data()
-    orbitx_matches, all_three, two_providers, unique = merge_matches(wb_dict, bt_dict, ef_dict, orbitx_dict)
-
-    analysis_tree.delete(*analysis_tree.get_children())
-
-    def format_provider_odds(data):
-        """Return only the odds lines for a given provider."""
-        if not data:
-            return "N/A"
-        odds = data.get("odds", ["N/A", "N/A", "N/A"])
-        return f"1: {odds[0]}\nX: {odds[1]}\n2: {odds[2]}"
-
-    # Build the Match column string
-    def format_match_column(entry):
-        teams = entry.get('original_teams', [])
-        minutes = entry.get('minutes', 0)
-        # Try to get a score from one of the providers; here we pick from WinBet as an example
-        score = "N/A"
-        if entry.get('wb') and entry['wb'].get('score'):
-            score = entry['wb'].get('score')
-        elif entry.get('bt') and entry['bt'].get('score'):
-            score = entry['bt'].get('score')
-        elif entry.get('ef') and entry['ef'].get('score'):
-            score = entry['ef'].get('score')
-        elif entry.get('orbitx') and entry['orbitx'].get('score'):
-            score = entry['orbitx'].get('score')
-        return f"{teams[0]} vs {teams[1]} ({minutes}')\nScore: {score}"
-
-    # Insert matches in priority order
-    for group in [orbitx_matches, all_three, two_providers, unique]:
-        for entry in group:
-            teams = entry.get('original_teams', [])
-            if not teams or len(teams) != 2:
-                continue
+def analyze_sport(sport):
+    """
+    Fold the latest provider data into the sport's incremental board; only entries
+    whose inputs changed are re-merged and re-analyzed. Partitions are independent.
+    """
+    started = time.perf_counter()
+    board = sport_boards.get(sport)
+    if board is None:
+        board = sport_boards[sport] = IncrementalBoard(
+            [name for name, provider in PROVIDERS.items() if sport in provider.urls],
+            analyze=lambda entry: find_arbitrage(entry, sport), row_sort_key=row_sort_key,
+            ttl=RECORD_TTL_SECONDS, skew=CAPTURE_SKEW_SECONDS)
+    recomputed = board.apply(load_betting_data(sport), time.time())
+    if odds_movement is not None:
+        # Only entries whose quotes changed can have moved
+        selections = main_market_keys(sport)
+        for key in recomputed:
+            entry = board.entries.get(key)
+            if entry is not None:
+                odds_movement.update(sport, entry, selections)
+
+    sport_metrics[sport] = {
+        'matches': len(board.rows),
+        'opportunities': len(board.ranked),
+        'recomputed': len(recomputed),
+        'analysis_ms': (time.perf_counter() - started) * 1000
+    }
+    return board.ranked_opportunities()
+
+
+def active_sports():
+    """Sports with a running monitor, plus the one currently on screen."""
+    running = {sport for (_, sport) in list(site_tasks)}
+    return [sport for sport in SPORTS if sport in running or sport == view_sport.get()]
+
+
+def format_metrics():
+    parts = []
+    for sport in active_sports():
+        stats = sport_metrics.get(sport, {})
+        scraped = [m for (_, sp), m in extraction_metrics.items() if sp == sport]
+        rate = sum(m['matches'] / max(time.time() - m['since'], 1) for m in scraped) * 60
+        parts.append(f"{sport}: {stats.get('matches', 0)} matches ({stats.get('recomputed', 0)} changed), "
+                     f"{stats.get('opportunities', 0)} arbs, {stats.get('analysis_ms', 0):.0f} ms, "
+                     f"{rate:.0f} events/min")
+    text = " | ".join(parts)
+    empty = [f"{site}/{sp} {m['empty_cycles']}x" for (site, sp), m in extraction_metrics.items()
+             if m['empty_cycles'] >= 3]
+    if empty:
+        text += "\nEmpty boards: " + " | ".join(empty)
+    if supervisor is not None:
+        recovered = [f"{'/'.join(key) if isinstance(key, tuple) else key} {m['restarts']}x, "
+                     f"last {m['last_recovery_s']:.0f}s"
+                     for key, m in supervisor.metrics.items() if m['last_recovery_s'] is not None]
+        if recovered:
+            text += "\nRecoveries: " + " | ".join(recovered)
+    lifecycle = opportunity_tracker.stats()
+    if lifecycle['latency_p50'] is not None:
+        text += (f"\nDetection latency p50 {lifecycle['latency_p50']:.1f}s / p95 {lifecycle['latency_p95']:.1f}s"
+                 f" | {lifecycle['open']} open")
+        if lifecycle['duration_p50'] is not None:
+            text += (f", {lifecycle['closed']} closed: lifetime p50 {lifecycle['duration_p50']:.0f}s"
+                     f" / p95 {lifecycle['duration_p95']:.0f}s, {lifecycle['outpaced']:.0%} shorter than p95 latency")
+    if memory_watchdog is not None and memory_watchdog.pages:
+        pages = [f"{'/'.join(key)} {sample['heap_mb']:.0f} MB" + (f" ♻{memory_watchdog.recycled[key]}"
+                                                                  if key in memory_watchdog.recycled else "")
+                 for key, sample in list(memory_watchdog.pages.items())]
+        rss = f"process {memory_watchdog.rss_mb:.0f} MB | " if memory_watchdog.rss_mb is not None else ""
+        text += "\nMemory: " + rss + " | ".join(pages)
+    if browser_pool is not None and len(browser_pool.endpoints) > 1:
+        instances = []
+        for m in browser_pool.metrics():
+            usage = f", {m['cpu']:.0f}% CPU, {m['rss_mb']:.0f} MB" if m['cpu'] is not None else ""
+            instances.append(f":{m['port']} {m['pages']} pages{usage}" + ("" if m['connected'] else " (down)"))
+        text += "\nChrome: " + " | ".join(instances)
+    if odds_movement is not None:
+        movement = odds_movement.metrics()
+        if movement['signals']:
+            kinds = ", ".join(f"{count} {kind.replace('_', '-')}" for kind, count in movement['signals'].items())
+            text += f"\nMoves (▼ steam ▲ drift ◆ off-mid): {kinds} over {movement['series']} price series"
+    if warmup_metrics:
+        first = min(m['after_launch'] for m in warmup_metrics.values())
+        warmups = [f"{'/'.join(key)} {m['seconds']:.1f}s{' warm' if m['warm'] else ''}"
+                   for key, m in list(warmup_metrics.items())]
+        text += f"\nStartup: first data {first:.1f}s after launch | " + " | ".join(warmups)
+    if snapshot_receiver is not None:
+        streams = [f"{'/'.join(stream)} #{m['seq']}" + (f" {m['lag']:.1f}s lag" if m['lag'] is not None else "")
+                   + ("" if m['synced'] else " (resyncing)")
+                   for stream, m in snapshot_receiver.metrics().items()]
+        if streams:
+            text += f"\nTransport ({snapshot_receiver.gaps} gaps): " + " | ".join(streams)
+    held = score_watch.held_count()
+    if score_watch.changes or held:
+        text += (f"\nScores: {score_watch.changes} changes, {score_watch.wakeups} early re-scrapes, "
+                 f"{held} matches held until providers agree")
+    if capture_archive is not None:
+        captures = capture_archive.metrics()
+        ratio = f", {captures['ratio']:.0f}x compressed" if captures['ratio'] else ""
+        text += (f"\nCaptures: {captures['stored']} stored, {captures['deduped']} unchanged{ratio}, "
+                 f"{captures['mb_on_disk']:.0f} MB kept, {captures['pruned']} segments expired")
+    return text
+
+
+def format_opportunity(o):
+    text = f"{describe_selection(o['market'], o['line'], o['outcome'])}: ${o['profit']:.2f}"
+    if o['max_stake'] is not None:
+        # What the visible lay liquidity actually allows
+        text += f" (max €{o['max_stake']:.0f} → €{o['expected_profit']:.2f})"
+    return text
+
+
+def format_provider_odds(data, keys, marks=None):
+    """Return only the main market odds lines for a given provider, with movement arrows."""
+    if not data:
+        return "N/A"
+    return "\n".join(f"{key[2]}: {format_odds(data.prices.get(key, NAN))}{marks.get(key, '') if marks else ''}"
+                     for key in keys)
+
+
+# Build the Match column string
+def format_match_column(entry, now):
+    teams = entry.original_teams
+    minutes = entry.minutes
+    # Take the score from the first provider that reports one
+    score = "N/A"
+    for record in entry.records.values():
+        if record.score:
+            score = record.score
+            break
+    text = f"{teams[0]} vs {teams[1]} ({minutes}')\nScore: {score}"
+    # Flag providers whose odds are getting old
+    aged = [f"{name} {now - record.captured_at:.0f}s"
+            for name, record in entry.records.items()
+            if now - record.captured_at > AGED_RECORD_SECONDS]
+    if aged:
+        text += f"\n⚠ Aged: {', '.join(aged)}"
+    return text
+
+
+def format_board_row(row):
+    """Tree values for one (entry, opportunities) row; only called for rows in the viewport."""
+    entry, opportunities = row
+    sport = view_sport.get()
+    keys = main_market_keys(sport)
+    arbitrage_text = [format_opportunity(o) for o in opportunities]
+    arbitrage_str = ", ".join(arbitrage_text) if arbitrage_text else "N/A"
+
+    def marks(name):
+        if odds_movement is None:
+            return None
+        return {key: odds_movement.mark(sport, entry.key, name, key) for key in keys}
+
+    odds = [(format_exchange_odds if provider.exchange else format_provider_odds)(entry.records.get(name), keys,
+                                                                                   marks(name))
+            for name, provider in PROVIDERS.items()]
+    values = (format_match_column(entry, time.time()), *odds, arbitrage_str)
+    return values, ('arbitrage',) if opportunities else ()
+
+
+def passes_filters(entry, opportunities):
+    if filter_arbitrage.get() and not opportunities:
+        return False
+    if filter_exchange.get() and not entry.exchanges:
+        return False
+    try:
+        min_profit = float(filter_min_profit.get() or 0)
+    except ValueError:
+        min_profit = 0
+    if min_profit > 0 and not any(o['profit'] >= min_profit for o in opportunities):
+        return False
+    return True
+
+
+def selection_prices(prices):
+    return {"/".join(selection): odds for selection, odds in prices.items()}
+
+
+def board_snapshot():
+    """Every active sport's merged rows and ranked opportunities, as plain JSON-ready data."""
+    sports = {}
+    for sport in active_sports():
+        board = sport_boards.get(sport)
+        if board is None:
+            continue
+        rows = []
+        for entry, _ in board.board_rows():
+            odds = {}
+            for name, record in entry.records.items():
+                if name in entry.exchanges:
+                    odds[name] = {'back': selection_prices(record.back_prices),
+                                  'lay': selection_prices(record.lay_prices)}
+                else:
+                    odds[name] = selection_prices(record.prices)
+            rows.append({'match_key': "|".join(entry.key), 'teams': entry.original_teams,
+                         'minutes': entry.minutes, 'odds': odds})
+        sports[sport] = {'rows': rows, 'opportunities': board.ranked_opportunities(),
+                         'signals': odds_movement.active(sport) if odds_movement is not None else []}
+    return {'published_at': time.time(), 'sports': sports}
+
+
+def render_board():
+    """Show the selected sport's partition, filtered, through the virtualized table."""
+    board = sport_boards.get(view_sport.get())
+    rows = [row for row in (board.board_rows() if board else []) if passes_filters(*row)]
+    analysis_table.set_rows(rows)
+
 
-            # Get OrbitX lay odds
-            orbitx_lay_odds = {}
-            if entry.get('orbitx'):
-                for oc in ['1', 'X', '2']:
-                    lay_odds = entry['orbitx']['outcomes'].get(oc, {}).get('lay_odds', 'N/A')
-                    if lay_odds != 'N/A':
-                        try:
-                            orbitx_lay_odds[oc] = float(lay_odds)
-                        except ValueError:
-                            orbitx_lay_odds[oc] = 'N/A'
-                    else:
-                        orbitx_lay_odds[oc] = 'N/A'
-            else:
-                orbitx_lay_odds = {'1': 'N/A', 'X': 'N/A', '2': 'N/A'}
-
-            # Calculate arbitrage for each outcome
-            arbitrage_text = []
-            for oc_idx, oc_name in zip([0, 1, 2], ['1', 'X', '2']):
-                max_back_odds = get_max_back_odds(entry, oc_idx)
-                if max_back_odds is None:
-                    continue
-                lay_odds = orbitx_lay_odds.get(oc_name, 'N/A')
-                if lay_odds == 'N/A':
-                    continue
-                if max_back_odds > lay_odds:
-                    profit = 1000 * (max_back_odds / lay_odds - 1)
-                    arbitrage_text.append(f"{oc_name}: ${profit:.2f}")
-
-            arbitrage_str = ", ".join(arbitrage_text) if arbitrage_text else "N/A"
-
-            analysis_tree.insert("", "end", values=(
-                format_match_column(entry),
-                format_provider_odds(entry.get('wb')),
-                format_provider_odds(entry.get('ef')),
-                format_provider_odds(entry.get('bt')),
-                format_orbitx(entry.get('orbitx')),
-                arbitrage_str
-            ))
+def update_analysis_view():
+    profiling.tick()
+    all_opportunities = []
+    with profiling.profile("analysis"):
+        for sport in active_sports():
+            all_opportunities.extend(analyze_sport(sport))
+    identity_cache.save()
+    opportunity_tracker.observe(all_opportunities, time.time())
+    signals = []
+    if odds_movement is not None:
+        odds_movement.prune()
+        signals = odds_movement.take_new()
+    if shared_board is not None or snapshot_api is not None:
+        snapshot = board_snapshot()
+        if shared_board is not None:
+            shared_board.publish(snapshot)
+        if snapshot_api is not None:
+            snapshot_api.publish(snapshot)
+
+    render_board()
+    metrics_label.config(text=format_metrics())
+
+    # Push structured events to stream subscribers without touching the Tk thread
+    if async_loop is not None and opportunity_publisher.server is not None:
+        async_loop.call_soon_threadsafe(opportunity_publisher.publish, all_opportunities)
+        if signals:
+            async_loop.call_soon_threadsafe(opportunity_publisher.publish_signals, signals)
 
     analysis_frame.after(10000, update_analysis_view)
 
@@ -411,189 +684,179 @@ def select_profile_gui():
     root.mainloop()
 
     if selected_profile is None:
-        print("No profile selected. Exiting...")
+        logger.info("No profile selected. Exiting...")
         exit(1)
-    print(f"Selected profile: {selected_profile}")
+    logger.info(f"Selected profile: {selected_profile}")
     return selected_profile
 
 
 # -----------------------
 # Async Monitoring Functions (Unchanged)
 # -----------------------
-async def monitor_winbet(live_monitor, page):
-    url = SITE_URLS["WinBet"]
-    await page.goto(url, {'waitUntil': 'networkidle2', 'timeout': 60000})
-    while True:
-        try:
-            matches = await live_monitor.extract_live_matches()
-            live_monitor.display_matches(matches)
-            live_monitor.save_to_file(matches)
-        except Exception as e:
-            print(f"Error in WinBet monitoring: {e}")
-        await asyncio.sleep(10)
-
-
-async def monitor_betano(betano_scraper, page):
-    await page.setUserAgent(
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-        'AppleWebKit/537.36 (KHTML, like Gecko) '
-        'Chrome/91.0.4472.124 Safari/537.36'
-    )
-    await page.setViewport({'width': 1920, 'height': 1080})
-    await page.goto(SITE_URLS["Betano"], {'waitUntil': 'networkidle2', 'timeout': 60000})
-    try:
-        await page.click('button#CybotCookiebotDialogBodyButtonAccept', timeout=5000)
-        await asyncio.sleep(3)
-    except Exception:
-        pass
-    while True:
-        try:
-            matches = await betano_scraper.get_live_matches(page)
-            betano_scraper.print_data(matches)
-            betano_scraper.save_to_file(matches)
-        except Exception as e:
-            print(f"Error in Betano monitoring: {e}")
-        await asyncio.sleep(10)
+def no_report(state, detail=""):
+    pass
+
+
+def match_scores(rows):
+    """{match id: score} of one extraction; rows without a usable event id are keyed by their teams."""
+    return {row.get('event_id') if row.get('event_id') not in (None, 'N/A') else str(row.get('teams')):
+            row.get('score') for row in rows}
 
 
-async def monitor_efbet(live_efbet_monitor, page):
-    live_efbet_monitor.page = page
-    live_efbet_monitor.browser = browser
+def record_warmup(site_name, sport, started, warm):
+    seconds = time.time() - started
+    warmup_metrics[(site_name, sport)] = {'seconds': seconds, 'warm': warm,
+                                          'after_launch': time.time() - launched_at}
+    logger.info(f"{site_name} ({sport}): first data {seconds:.1f}s after "
+                f"{'reattaching' if warm else 'opening'} the tab")
 
-    await page.setViewport({"width": 1920, "height": 1080})
-    await page.setUserAgent(
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    )
-    await page.goto(SITE_URLS["Efbet"], {'waitUntil': 'networkidle2', 'timeout': 60000})
-    print("✅ Efbet in-play page loaded.")
 
-    iframe_selector = '#inplayAppMain'
-    max_attempts = 3
-    for attempt in range(max_attempts):
+async def monitor_provider(provider, scraper, page, sport="soccer", report=no_report, warm=False):
+    """
+    Set a provider page up once, then extract and save on the provider's interval.
+    A warm page was left on the live list by the previous session and is only reattached.
+    """
+    started = time.time()
+    report(NAVIGATING)
+    if warm:
         try:
-            await page.waitForSelector(iframe_selector, {'timeout': 10000})
-            iframe_element = await page.querySelector(iframe_selector)
-            live_efbet_monitor.frame = await iframe_element.contentFrame()
-            if live_efbet_monitor.frame:
-                print("Switched to iframe: inplayAppMain")
-                await live_efbet_monitor.frame.waitForSelector('.sportEvents', {'timeout': 10000})
-                print("Found sportEvents inside iframe")
-                await live_efbet_monitor.frame.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                await asyncio.sleep(2)
-                break
-            else:
-                print(f"Attempt {attempt + 1}/{max_attempts}: Iframe found but contentFrame returned None.")
+            await provider.attach(scraper, page)
         except Exception as e:
-            print(f"Attempt {attempt + 1}/{max_attempts}: Error accessing iframe - {str(e)}")
-        if attempt == max_attempts - 1:
-            print("Falling back to main page carousel data.")
-            await page.waitForSelector('#SideCarouselMarketGroupListComponent26-carousel-items', {'timeout': 10000})
-            print("Found carousel items on main page as fallback.")
-            live_efbet_monitor.frame = None
-        await asyncio.sleep(10)
-
+            logger.warning(f"Reattaching {provider.name} failed ({e}), reloading the page")
+            warm = False
+            await provider.setup(scraper, page)
+    else:
+        await provider.setup(scraper, page)
+    first_data = False
+    ready = not provider.ready_on_data
+    if ready:
+        report(READY)
+    woken = False
     while True:
         try:
-            matches = await live_efbet_monitor.extract_betting_data()
-            print("Efbet data:", matches)
-            live_efbet_monitor.save_to_json(matches)
+            with profiling.profile(f"{provider.name}/{sport}"):
+                extract_started = time.perf_counter()
+                data = await provider.extract(scraper, page)
+                record_extraction(provider.name, sport, len(data), extract_started)
+                if data and not first_data:
+                    first_data = True
+                    record_warmup(provider.name, sport, started, warm)
+                if data and not ready:
+                    ready = True
+                    report(READY)
+                provider.save(scraper, data)
+            log_extraction(provider.name, sport, data)
+            if snapshot_sender is not None:
+                # Empty boards too, so the receiver drops the rows as a fresh file would
+                snapshot_sender.publish(provider.name, sport, provider.rows(data))
+            if data:
+                score_watch.observe(provider.name, sport, match_scores(data), propagate=not woken)
+            if capture_archive is not None:
+                # Compression runs off the loop; the parsed rows are kept for replay comparisons
+                await asyncio.get_event_loop().run_in_executor(
+                    None, capture_archive.store, provider.name, sport, scraper.last_html, time.time(), data)
         except Exception as e:
-            print(f"Error in Efbet monitoring: {e}")
-        await asyncio.sleep(live_efbet_monitor.interval)
+            logger.error(f"Error in {provider.name} monitoring: {e}",
+                         extra={'rate_key': ('monitor', provider.name, sport)})
+        # A score change seen by another provider cuts the sleep short
+        woken = await score_watch.wait(provider.name, sport, provider.interval)
 
 
 # -----------------------
-# Browser Management (Unchanged)
+# Browser Management
 # -----------------------
-async def init_browser():
-    global browser, browser_connected
-    for _ in range(10):
-        try:
-            browser = await connect(browserURL=f'http://127.0.0.1:{REMOTE_DEBUGGING_PORT}')
-            print("Connected to Chrome.")
-            browser_connected = True
-            return
-        except Exception as e:
-            print(f"Connection attempt failed: {e}")
-            await asyncio.sleep(1)
-    print("Failed to connect to Chrome after multiple attempts.")
-    browser_connected = False
+async def connect_chrome(port):
+    return await connect(browserURL=f'http://127.0.0.1:{port}')
 
 
-def start_async_loop_thread(profile_dir):
-    global async_loop, chrome_process
-    async_loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(async_loop)
+def launch_chrome(port):
+    """The first instance runs the selected profile; the others need a user-data-dir of their own."""
     chrome_args = [
         CHROME_PATH,
-        f'--remote-debugging-port={REMOTE_DEBUGGING_PORT}',
-        f'--profile-directory={profile_dir}',
+        f'--remote-debugging-port={port}',
         '--window-size=1920,1080',
         '--window-position=0,0',
         '--force-device-scale-factor=1'
     ]
-    print("Launching Chrome with remote debugging...")
-    chrome_process = subprocess.Popen(chrome_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    async_loop.run_until_complete(init_browser())
-    if browser_connected:
-        async_loop.run_forever()
+    if port == REMOTE_DEBUGGING_PORTS[0] and chrome_profile_dir:
+        chrome_args.append(f'--profile-directory={chrome_profile_dir}')
     else:
-        print("Browser connection failed. Exiting...")
-        chrome_process.terminate()
-        exit(1)
+        chrome_args.append(f'--user-data-dir={os.path.join(DATA_DIR, f"chrome-{port}")}')
+    logger.info(f"Launching Chrome with remote debugging on port {port}...")
+    return subprocess.Popen(chrome_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def browser_ready():
+    return browser_pool is not None and browser_pool.is_connected()
+
+
+def start_async_loop_thread(profile_dir):
+    global async_loop, chrome_profile_dir, supervisor, controller, browser_pool, memory_watchdog
+    async_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(async_loop)
+    chrome_profile_dir = profile_dir
+    browser_pool = BrowserPool(REMOTE_DEBUGGING_PORTS, launch_chrome, connect_chrome)
+    if async_loop.run_until_complete(browser_pool.start()):
+        logger.info("Connected to Chrome.")
+    else:
+        logger.warning("Browser connection failed. The supervisor keeps retrying in the background...")
+    if not worker_mode:
+        async_loop.run_until_complete(opportunity_publisher.start())
+    controller = ProviderController(async_loop, site_tasks, browser_pool.new_page, create_monitor,
+                                    on_state=lambda key, state, detail: provider_states.put((key, state, detail)),
+                                    release_page=browser_pool.release)
+    supervisor = MonitorSupervisor(site_tasks, controller.replace, browser_pool.reconnect, browser_pool.probe,
+                                   release_page=browser_pool.release)
+    async_loop.create_task(supervisor.run())
+    async_loop.create_task(browser_pool.run(controller.restart))
+    memory_watchdog = MemoryWatchdog(site_tasks, controller.recycle, page_budget_mb=PAGE_MEMORY_BUDGET_MB,
+                                     process_budget_mb=PROCESS_MEMORY_BUDGET_MB, trim=trim_caches)
+    async_loop.create_task(memory_watchdog.run())
+    if WARM_START and browser_pool.is_connected():
+        adopted = async_loop.run_until_complete(reattach_tabs())
+        if adopted:
+            logger.info(f"Reattached {len(adopted)} provider tab(s): " + ", ".join(f"{s} ({sp})" for s, sp in adopted))
+    async_loop.run_forever()
 
 
 # -----------------------
 # GUI Setup (Modified for Arbitrage)
 # -----------------------
-def toggle_site(site_name):
-    global future
-    state = checkbox_vars[site_name].get()
+def create_monitor(task_key, page, report=no_report, warm=False):
+    """Build the scraper for one provider/sport page and return its monitor coroutine."""
+    site_name, sport = task_key
+    provider = PROVIDERS[site_name]
+    scraper = provider.create(sport, data_file(site_name, sport), page)  # first use imports the scraper module
+    return monitor_provider(provider, scraper, page, sport, report=report, warm=warm)
+
+
+async def reattach_tabs():
+    """Adopt the provider tabs a previous session left open; their monitors all warm up at once."""
+    adopted = []
+    for page, endpoint in await browser_pool.existing_pages():
+        key = provider_for_url(page.url)
+        if key is None or key in site_tasks:
+            continue  # another tab, or a duplicate of one already adopted
+        browser_pool.adopt(page, key, endpoint)
+        if controller.adopt(key, page):
+            adopted.append(key)
+    return adopted
+
+
+def toggle_site(site_name, sport="soccer"):
+    """Ask the controller to start/stop a provider; returns immediately, progress arrives via provider_states."""
+    task_key = (site_name, sport)
+    state = checkbox_vars[task_key].get()
     if state:
-        if not browser_connected:
-            print("Browser is not ready yet. Please wait a moment.")
-            checkbox_vars[site_name].set(False)
-            return
-        if site_name in site_tasks:
-            print(f"{site_name} is already being monitored.")
+        if not browser_ready() or controller is None:
+            logger.info("Browser is not ready yet. Please wait a moment.")
+            checkbox_vars[task_key].set(False)
             return
-        # For the other sites, a new page is created from the existing browser
-        if site_name in ["WinBet", "Betano", "Efbet"]:
-            page_future = asyncio.run_coroutine_threadsafe(browser.newPage(), async_loop)
-            page = page_future.result()
-            if site_name == "WinBet":
-                live_monitor = LiveWinBetMonitor()
-                live_monitor.browser = browser
-                live_monitor.page = page
-                future = asyncio.run_coroutine_threadsafe(monitor_winbet(live_monitor, page), async_loop)
-            elif site_name == "Betano":
-                betano_scraper = BetanoScraper(output_file=os.path.join(DATA_DIR, "betano_data.json"))
-                future = asyncio.run_coroutine_threadsafe(monitor_betano(betano_scraper, page), async_loop)
-            elif site_name == "Efbet":
-                live_efbet_monitor = LiveEfbetMonitor(
-                    url=SITE_URLS["Efbet"],
-                    output_file=os.path.join(DATA_DIR, "efbet_odds.json"))
-                future = asyncio.run_coroutine_threadsafe(monitor_efbet(live_efbet_monitor, page), async_loop)
-            site_tasks[site_name] = (future, page)
-            print(f"Started monitoring {site_name}.")
-        elif site_name == "OrbitX":
-            # Create an instance of OrbitXScraper and pass the shared browser page
-            page_future = asyncio.run_coroutine_threadsafe(browser.newPage(), async_loop)
-            page = page_future.result()
-            orbitx_scraper = OrbitXScraper(executable_path=CHROME_PATH, headless=True)
-            future = asyncio.run_coroutine_threadsafe(
-                orbitx_scraper._run_continuous(interval=30, verbose=True, page=page), async_loop)
-            site_tasks[site_name] = (future, page)
-            print("Started monitoring OrbitX.")
+        controller.start(task_key)
     else:
-        if site_name in site_tasks:
-            future, page = site_tasks.pop(site_name)
-            future.cancel()
-            if page is not None:
-                asyncio.run_coroutine_threadsafe(page.close(), async_loop)
-            print(f"Stopped monitoring {site_name}.")
-        else:
-            print(f"{site_name} was not being monitored.")
+        controller.stop(task_key)
+        if supervisor is not None:
+            async_loop.call_soon_threadsafe(supervisor.forget, task_key)
 
 
 def create_gui():
@@ -603,9 +866,10 @@ def create_gui():
     gui.attributes("-topmost", True)
 
     style = ttk.Style()
-    style.configure("Treeview", rowheight=50)
+    style.configure("Treeview", rowheight=ROW_HEIGHT)
 
-    global status_label, analysis_tree, analysis_frame
+    global status_label, analysis_tree, analysis_table, analysis_frame, metrics_label, view_sport
+    global filter_arbitrage, filter_exchange, filter_min_profit
 
     top_frame = tk.Frame(gui)
     top_frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=10)
@@ -614,40 +878,63 @@ def create_gui():
     status_label.pack(pady=5)
     ttk.Label(top_frame, text="Select Site(s) to Monitor:").pack(pady=5)
 
-    for site in ["WinBet", "Efbet", "Betano", "OrbitX"]:
-        var = tk.BooleanVar()
-        checkbox_vars[site] = var
-        cb = ttk.Checkbutton(top_frame, text=site, variable=var, command=lambda s=site: toggle_site(s))
-        cb.pack(side=tk.LEFT, padx=20)
-        checkbox_widgets[site] = cb
+    sites_frame = tk.Frame(top_frame)
+    sites_frame.pack(pady=5)
+    for row, sport in enumerate(SPORTS):
+        ttk.Label(sites_frame, text=sport.capitalize()).grid(row=row, column=0, sticky='w', padx=10)
+        for col, site in enumerate(SITES, 1):
+            if sport not in PROVIDERS[site].urls:
+                continue
+            var = tk.BooleanVar()
+            checkbox_vars[(site, sport)] = var
+            cb = ttk.Checkbutton(sites_frame, text=site, variable=var,
+                                 command=lambda s=site, sp=sport: toggle_site(s, sp))
+            cb.grid(row=row, column=col, padx=20)
+            checkbox_widgets[(site, sport)] = cb
+
+    view_frame = tk.Frame(top_frame)
+    view_frame.pack(pady=5)
+    ttk.Label(view_frame, text="Show sport:").pack(side=tk.LEFT)
+    view_sport = tk.StringVar(value=SPORTS[0])
+    sport_box = ttk.Combobox(view_frame, textvariable=view_sport, values=SPORTS, state="readonly", width=12)
+    sport_box.pack(side=tk.LEFT, padx=5)
+    sport_box.bind("<<ComboboxSelected>>", lambda _: render_board())
+
+    filter_arbitrage = tk.BooleanVar()
+    filter_exchange = tk.BooleanVar()
+    filter_min_profit = tk.StringVar()
+    ttk.Checkbutton(view_frame, text="Arbitrage only", variable=filter_arbitrage,
+                    command=render_board).pack(side=tk.LEFT, padx=10)
+    ttk.Checkbutton(view_frame, text="Exchange-listed only", variable=filter_exchange,
+                    command=render_board).pack(side=tk.LEFT, padx=10)
+    ttk.Label(view_frame, text="Min profit $:").pack(side=tk.LEFT)
+    min_profit_entry = ttk.Entry(view_frame, textvariable=filter_min_profit, width=6)
+    min_profit_entry.pack(side=tk.LEFT, padx=5)
+    min_profit_entry.bind("<KeyRelease>", lambda _: render_board())
+    metrics_label = ttk.Label(top_frame, text="")
+    metrics_label.pack(pady=5)
 
     analysis_frame = tk.Frame(gui)
     analysis_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-    columns = ("Match", "WinBet", "Efbet", "Betano", "OrbitX", "Arbitrage")
+    columns = ("Match", *PROVIDERS, "Arbitrage")
     analysis_tree = ttk.Treeview(analysis_frame, columns=columns, show="headings")
     analysis_tree.heading("Match", text="Match (Time & Score)", anchor='w')
-    analysis_tree.heading("WinBet", text="WinBet Odds", anchor='center')
-    analysis_tree.heading("Efbet", text="Efbet Odds", anchor='center')
-    analysis_tree.heading("Betano", text="Betano Odds", anchor='center')
-    analysis_tree.heading("OrbitX", text="OrbitX (Back/Lay)", anchor='center')
-    analysis_tree.heading("Arbitrage", text="Arbitrage Opportunities", anchor='center')
-
     analysis_tree.column("Match", width=300, anchor='w')
-    analysis_tree.column("WinBet", width=150, anchor='center')
-    analysis_tree.column("Efbet", width=150, anchor='center')
-    analysis_tree.column("Betano", width=150, anchor='center')
-    analysis_tree.column("OrbitX", width=200, anchor='center')
+    for name, provider in PROVIDERS.items():
+        analysis_tree.heading(name, text=provider.heading or f"{name} Odds", anchor='center')
+        analysis_tree.column(name, width=provider.column_width, anchor='center')
+    analysis_tree.heading("Arbitrage", text="Arbitrage Opportunities", anchor='center')
     analysis_tree.column("Arbitrage", width=200, anchor='center')
 
     analysis_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
     analysis_tree.tag_configure('arbitrage', background='lightgreen')
-    scrollbar = ttk.Scrollbar(analysis_frame, orient="vertical", command=analysis_tree.yview)
-    analysis_tree.configure(yscrollcommand=scrollbar.set)
+    scrollbar = ttk.Scrollbar(analysis_frame, orient="vertical")
     scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    analysis_table = VirtualTable(analysis_tree, scrollbar, format_board_row, ROW_HEIGHT)
 
     def check_browser_status():
-        if browser_connected:
+        if browser_ready():
             status_label.config(text="Browser Status: Ready")
             for cb in checkbox_widgets.values():
                 cb.config(state="normal")
@@ -660,26 +947,105 @@ def create_gui():
     check_browser_status()
     update_analysis_view()
 
+    def poll_provider_states():
+        """Apply controller progress to the checkboxes on the Tk thread."""
+        while not provider_states.empty():
+            (site, sport), state, detail = provider_states.get_nowait()
+            checkbox_widgets[(site, sport)].config(text=site if state == STOPPED else f"{site} ({state})")
+            if state != STOPPED:
+                checkbox_vars[(site, sport)].set(True)  # reattached monitors were not ticked by hand
+            logger.info(f"{site} ({sport}): {state}" + (f" - {detail}" if detail else ""))
+        gui.after(100, poll_provider_states)
+
+    poll_provider_states()
+
     def on_closing():
-        for site_name, (future, page) in list(site_tasks.items()):
-            future.cancel()
-            asyncio.run_coroutine_threadsafe(page.close(), async_loop)
-        site_tasks.clear()
+        if controller is not None:
+            try:
+                (controller.detach_all() if WARM_START else controller.stop_all()).result(timeout=10)
+            except Exception as e:
+                logger.error(f"Error stopping monitors: {e}")
         if async_loop is not None:
             async_loop.call_soon_threadsafe(async_loop.stop)
-        if chrome_process is not None:
-            chrome_process.terminate()
-            chrome_process.wait()
+        if browser_pool is not None and not WARM_START:
+            browser_pool.terminate()
+        if shared_board is not None:
+            shared_board.close()
+        if snapshot_api is not None:
+            snapshot_api.stop()
+        if transport_server is not None:
+            transport_server.stop()
         gui.destroy()
+        if log_listener is not None:
+            log_listener.stop()
 
     gui.protocol("WM_DELETE_WINDOW", on_closing)
     gui.mainloop()
 
 
+def run_worker(keys, profile_dir):
+    """Headless monitors for the given (site, sport) keys; their snapshots go to the analysis node."""
+    threading.Thread(target=start_async_loop_thread, args=(profile_dir,), daemon=True).start()
+    while not (controller is not None and browser_ready()):
+        time.sleep(1)
+    for key in keys:
+        controller.start(key)
+    try:
+        while True:
+            while not provider_states.empty():
+                (site, sport), state, detail = provider_states.get_nowait()
+                logger.info(f"{site} ({sport}): {state}" + (f" - {detail}" if detail else ""))
+            time.sleep(1)
+    except KeyboardInterrupt:
+        (controller.detach_all() if WARM_START else controller.stop_all()).result(timeout=10)
+        if not WARM_START:
+            browser_pool.terminate()
+        log_listener.stop()
+
+
 # -----------------------
 # Main Program Flow
 # -----------------------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live odds comparator")
+    parser.add_argument("--worker", nargs="+", metavar="SITE:SPORT",
+                        help="only run these monitors, without the GUI, publishing to the analysis node")
+    parser.add_argument("--analysis", metavar="HOST:PORT", default=f"127.0.0.1:{TRANSPORT_PORT}")
+    parser.add_argument("--ports", nargs="+", type=int, default=[9322, 9323],
+                        help="Chrome debugging ports of a worker (kept apart from the GUI's on a shared machine)")
+    parser.add_argument("--profile", help="Chrome profile directory of a worker's first instance")
+    parser.add_argument("--dump-rows", action="store_true", help="log every extraction's rows (LOG_FULL_DUMPS)")
+    args = parser.parse_args()
+    log_file = LOG_FILE
+    if LOG_FILE and args.worker:  # workers sharing the machine keep files of their own, named by debugging port
+        log_file = f"{os.path.splitext(LOG_FILE)[0]}_worker_{args.ports[0]}.log"
+    log_listener = setup_logging(getattr(logging, LOG_LEVEL), log_file, LOG_FULL_DUMPS or args.dump_rows,
+                                 LOG_SUMMARY_SECONDS)
+
+    if args.worker:
+        keys = [tuple(key.split(":", 1)) for key in args.worker]
+        for site, sport in keys:
+            if site not in PROVIDERS or sport not in PROVIDERS[site].urls:
+                parser.error(f"unknown provider/sport {site}:{sport}")
+        worker_mode = True
+        REMOTE_DEBUGGING_PORTS = args.ports
+        host, port = args.analysis.rsplit(":", 1)
+        snapshot_sender = SnapshotPublisher(SocketChannel(host, int(port)))
+        run_worker(keys, args.profile)
+        raise SystemExit
+
+    if TRANSPORT == "socket":
+        transport_server = TransportServer(snapshot_receiver, TRANSPORT_HOST, TRANSPORT_PORT).start()
+        snapshot_sender = SnapshotPublisher(SocketChannel("127.0.0.1", TRANSPORT_PORT))
+    elif TRANSPORT == "inprocess":
+        snapshot_sender = SnapshotPublisher(InProcessChannel(snapshot_receiver))
     selected_profile_dir = select_profile_gui()
+    shared_board = SharedBoardWriter(SHARED_BOARD_NAME)
+    snapshot_api = SnapshotApi(API_HOST, API_PORT, sports=SPORTS, providers=SITES)
+    try:
+        snapshot_api.start()
+    except OSError as e:
+        logger.warning(f"Snapshot API not started on port {API_PORT}: {e}")
+        snapshot_api = None
     threading.Thread(target=start_async_loop_thread, args=(selected_profile_dir,), daemon=True).start()
     create_gui()
\ No newline at end of file
@@ -0,0 +1,11 @@
+import os
+import sys
+import types
+
+# The modules import each other as utils.<Module>; make the checkout importable under that name
+# whatever its directory is called.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if 'utils' not in sys.modules:
+    package = types.ModuleType('utils')
+    package.__path__ = [ROOT]
+    sys.modules['utils'] = package
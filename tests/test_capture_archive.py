@@ -0,0 +1,43 @@
+from utils.CaptureArchive import CaptureArchive, CaptureReader, fingerprint, rows_digest
+
+T = 1_800_000_000
+
+
+def page(i):
+    return f"<html>{' '.join(f'row {i} {j}' for j in range(200))}</html>"
+
+
+def test_fingerprint_and_digest_ignore_noise():
+    assert fingerprint("<p>a   b</p>\n") == fingerprint("<p>a b</p>")
+    assert rows_digest([{'a': 1, 'timestamp': "x"}]) == rows_digest([{'a': 1, 'timestamp': "y"}])
+
+
+def test_unchanged_pages_are_only_indexed(tmp_path):
+    archive = CaptureArchive(str(tmp_path))
+    first = archive.store("Betano", "soccer", page(1), T, [{'a': 1}])
+    again = archive.store("Betano", "soccer", page(1) + "  ", T + 10, [{'a': 1}])
+    assert again['same_as'] == first['id'] and again['bytes_stored'] == 0
+    reader = CaptureReader(str(tmp_path))
+    assert [reader.load(entry, by_id) for entry, by_id in reader.entries()] == [page(1), page(1)]
+
+
+def test_size_cap_deletes_the_oldest_segments(tmp_path):
+    archive = CaptureArchive(str(tmp_path), keyframe_every=1, max_bytes=3000)
+    for i in range(30):
+        archive.store("Betano", "soccer", page(i), T + i * 10, [])
+    assert archive.bytes_on_disk <= 3000 and archive.pruned
+    reader = CaptureReader(str(tmp_path))
+    kept = [(entry['captured_at'], reader.load(entry, by_id)) for entry, by_id in reader.entries()]
+    assert kept and kept[-1] == (T + 290, page(29))
+    assert all(html == page((at - T) // 10) for at, html in kept)
+    # A new session picks the kept segments up from the index
+    assert CaptureArchive(str(tmp_path), max_bytes=3000).bytes_on_disk == archive.bytes_on_disk
+
+
+def test_age_limit_keeps_the_segment_being_written(tmp_path):
+    archive = CaptureArchive(str(tmp_path), keyframe_every=1, max_age=3600, check_every=0)
+    archive.store("WinBet", "soccer", page(0), T, [])
+    archive.store("Betano", "soccer", page(1), T, [])
+    archive.store("Betano", "soccer", page(2), T + 7200, [])
+    reader = CaptureReader(str(tmp_path))
+    assert [(e['provider'], e['captured_at']) for e, _ in reader.entries()] == [("WinBet", T), ("Betano", T + 7200)]
@@ -0,0 +1,87 @@
+from utils.IncrementalBoard import IncrementalBoard, SortedIndex
+from utils.MatchRecords import ProviderMatch, MATCH_RESULT_KEYS
+
+HOME, DRAW, AWAY = MATCH_RESULT_KEYS
+KEY = ("away", "home")
+
+
+def record(home, captured_at=100.0, minutes=10):
+    return ProviderMatch(["Home", "Away"], {HOME: home, DRAW: 3.4, AWAY: 4.0}, minutes, "0-0", captured_at)
+
+
+class Analyzer:
+    """Reports one opportunity per entry whose Betano home price is above 2.5, and counts its calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, entry):
+        self.calls.append(entry.key)
+        quote = entry.records.get("Betano")
+        if quote is None or quote.prices[HOME] <= 2.5:
+            return []
+        return [{'match_key': "|".join(entry.key), 'market': "1x2", 'line': "", 'outcome': "1",
+                 'profit': quote.prices[HOME]}]
+
+
+def board(analyzer, ttl=60, skew=20):
+    return IncrementalBoard(["WinBet", "Betano"], analyzer, lambda entry: -entry.minutes, ttl, skew)
+
+
+def test_sorted_index_moves_items():
+    index = SortedIndex()
+    index.set("a", 2)
+    index.set("b", 1)
+    index.set("a", 0)
+    index.discard("missing")
+    assert list(index) == ["a", "b"]
+    index.discard("a")
+    assert list(index) == ["b"] and len(index) == 1
+
+
+def test_only_changed_entries_are_recomputed():
+    analyzer = Analyzer()
+    incremental = board(analyzer)
+    winbet = {KEY: record(2.0)}
+    assert incremental.apply({"WinBet": winbet, "Betano": {}}, now=100) == {KEY}
+    # The parse cache hands back the same object for an unchanged file
+    assert incremental.apply({"WinBet": winbet, "Betano": {}}, now=101) == set()
+    # Same prices, newer tick, no open opportunity: refreshed in place
+    assert incremental.apply({"WinBet": {KEY: record(2.0, captured_at=105)}, "Betano": {}}, now=105) == set()
+    assert incremental.entries[KEY].records["WinBet"].captured_at == 105
+    assert analyzer.calls == [KEY]
+
+
+def test_price_changes_rank_and_close_opportunities():
+    incremental = board(Analyzer())
+    other = ("b", "c")
+    incremental.apply({"WinBet": {}, "Betano": {KEY: record(2.6), other: record(3.0)}}, now=100)
+    assert [o['profit'] for o in incremental.ranked_opportunities()] == [3.0, 2.6]
+    incremental.apply({"WinBet": {}, "Betano": {KEY: record(3.5), other: record(2.0)}}, now=101)
+    assert [o['profit'] for o in incremental.ranked_opportunities()] == [3.5]
+
+
+def test_open_opportunity_is_rechecked_on_a_newer_tick():
+    analyzer = Analyzer()
+    incremental = board(analyzer)
+    incremental.apply({"WinBet": {}, "Betano": {KEY: record(3.0)}}, now=100)
+    assert incremental.apply({"WinBet": {}, "Betano": {KEY: record(3.0, captured_at=110)}}, now=110) == {KEY}
+
+
+def test_removed_and_expired_records_leave_the_board():
+    incremental = board(Analyzer(), ttl=30)
+    incremental.apply({"WinBet": {KEY: record(2.0)}, "Betano": {KEY: record(3.0)}}, now=100)
+    assert len(incremental.board_rows()) == 1 and incremental.ranked_opportunities()
+    incremental.apply({"WinBet": {KEY: record(2.0)}, "Betano": {}}, now=101)
+    assert incremental.ranked_opportunities() == []
+    assert list(incremental.entries[KEY].records) == ["WinBet"]
+    # A new snapshot whose record is older than the ttl drops the match entirely
+    assert incremental.apply({"WinBet": {KEY: record(2.0)}, "Betano": {}}, now=200) == {KEY}
+    assert incremental.board_rows() == []
+
+
+def test_legs_far_apart_in_time_are_tracked():
+    incremental = board(Analyzer(), skew=20)
+    incremental.apply({"WinBet": {KEY: record(2.0, captured_at=100)}, "Betano": {KEY: record(2.0, captured_at=70)}},
+                      now=100)
+    assert KEY in incremental.time_sensitive
@@ -0,0 +1,25 @@
+import pytest
+
+for dependency in ("pyppeteer", "fuzzywuzzy", "websockets"):
+    pytest.importorskip(dependency)
+
+from utils.mBot import size_back_lay  # noqa: E402
+
+
+def test_ladder_walk_stops_once_lay_reaches_back():
+    back_stake, lay_stake, profit = size_back_lay(2.5, [[2.0, 100], [2.2, 50], [2.5, 1000], [2.4, 10]])
+    assert lay_stake == 150
+    assert back_stake == pytest.approx(100 * 2.0 / 2.5 + 50 * 2.2 / 2.5, abs=0.01)
+    assert profit == pytest.approx(100 * 0.5 / 2.5 + 50 * 0.3 / 2.5, abs=0.01)
+
+
+def test_profit_is_locked_in_whichever_way_the_match_goes():
+    back_stake, lay_stake, profit = size_back_lay(3.0, [[2.0, 90]])
+    assert back_stake * 3.0 - back_stake - lay_stake * (2.0 - 1) == pytest.approx(profit, abs=0.01)
+    assert lay_stake - back_stake == pytest.approx(profit, abs=0.01)
+
+
+def test_no_ladder_or_no_cheaper_lay():
+    assert size_back_lay(2.0, []) == (None, None, None)
+    assert size_back_lay(2.0, None) == (None, None, None)
+    assert size_back_lay(2.0, [[2.1, 500]]) == (0.0, 0.0, 0.0)
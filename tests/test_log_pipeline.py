@@ -0,0 +1,61 @@
+import json
+import logging
+import queue
+import threading
+
+from utils.LogPipeline import DroppingQueueHandler, JsonFormatter, RateLimitFilter, StructuredFormatter
+
+
+def record(created, rate_key=None, level=logging.WARNING, msg="boom"):
+    entry = logging.LogRecord("mbot", level, __file__, 1, msg, None, None)
+    entry.created = created
+    if rate_key is not None:
+        entry.rate_key = rate_key
+    return entry
+
+
+def test_one_record_per_key_per_interval():
+    limit = RateLimitFilter(interval=60)
+    assert limit.filter(record(1000, "load"))
+    assert not limit.filter(record(1010, "load"))
+    assert not limit.filter(record(1059, "load"))
+    passed = record(1060, "load")
+    assert limit.filter(passed) and passed.suppressed == 2
+    assert not limit.filter(record(1070, "load"))
+
+
+def test_keys_and_levels_are_limited_separately():
+    limit = RateLimitFilter(interval=60)
+    assert limit.filter(record(1000, "load"))
+    assert limit.filter(record(1000, "save"))
+    assert limit.filter(record(1000, "load", level=logging.ERROR))
+    assert not limit.filter(record(1001, "load"))
+
+
+def test_records_without_a_key_always_pass():
+    limit = RateLimitFilter(interval=60)
+    assert all(limit.filter(record(1000)) for _ in range(5))
+    assert limit.suppressed == {}
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    done = threading.Event()
+
+    def flood():
+        for i in range(5):
+            handler.handle(record(1000, msg=f"line {i}"))
+        done.set()
+
+    threading.Thread(target=flood, daemon=True).start()
+    assert done.wait(2)
+    assert handler.dropped == 3 and handler.queue.qsize() == 2
+
+
+def test_formatters_report_fields_and_suppressed_count():
+    entry = record(1000, msg="extracted")
+    entry.fields = {'site': "Betano", 'league': "Premier League"}
+    entry.suppressed = 4
+    line = StructuredFormatter('%(message)s').format(entry)
+    assert line == 'extracted site=Betano league="Premier League" (+4 suppressed)'
+    assert json.loads(JsonFormatter().format(entry))['suppressed'] == 4
@@ -0,0 +1,47 @@
+import json
+import time
+
+from utils.MatchIdentity import MatchIdentityCache
+
+
+def cache(tmp_path):
+    return MatchIdentityCache(str(tmp_path / "identity.json"), str.lower)
+
+
+def test_renamed_team_keeps_its_original_key(tmp_path):
+    ids = cache(tmp_path)
+    first = ids.resolve("Betano", "e1", ["Arsenal", "Chelsea"])
+    assert first == ("arsenal", "chelsea")
+    assert ids.resolve("Betano", "e1", ["Arsenal FC", "Chelsea"]) == first
+
+
+def test_unseen_ids_fall_back_to_team_names(tmp_path):
+    ids = cache(tmp_path)
+    assert ids.resolve("Efbet", "x9", ["Chelsea", "Arsenal"]) == ("arsenal", "chelsea")
+    assert ids.resolve("Efbet", "N/A", ["B", "A"]) == ("a", "b")
+    assert ids.resolve("Efbet", None, ["B", "A"]) == ("a", "b")
+    assert list(ids.ids) == ["Efbet|x9"]
+
+
+def test_mapping_survives_save_and_reload(tmp_path):
+    ids = cache(tmp_path)
+    ids.resolve("WinBet", "7", ["Home", "Away"])
+    ids.save()
+    reloaded = cache(tmp_path)
+    assert reloaded.resolve("WinBet", "7", ["Home United", "Away"]) == ("away", "home")
+    assert not reloaded.dirty
+
+
+def test_ids_unseen_for_48_hours_are_pruned_on_save(tmp_path):
+    ids = cache(tmp_path)
+    ids.resolve("Betano", "old", ["A", "B"])
+    ids.resolve("Betano", "new", ["C", "D"])
+    ids.ids["Betano|old"][1] = time.time() - 49 * 3600
+    ids.save()
+    assert list(ids.ids) == ["Betano|new"]
+    assert list(json.loads((tmp_path / "identity.json").read_text())) == ["Betano|new"]
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    (tmp_path / "identity.json").write_text("{not json")
+    assert cache(tmp_path).ids == {}
@@ -0,0 +1,51 @@
+import math
+
+from utils.MatchRecords import (normalize_market, build_prices, main_market_prices, parse_odds, parse_ladder,
+                                MATCH_RESULT_KEYS, MONEYLINE_KEYS)
+
+
+def test_match_result_names_map_to_the_sports_main_market():
+    assert normalize_market("Match Result", ["Home", "Draw", "Away"]) == list(MATCH_RESULT_KEYS)
+    assert normalize_market("Match Winner", ["A", "B"], sport="tennis") == list(MONEYLINE_KEYS)
+
+
+def test_full_time_totals_map_to_ou():
+    assert normalize_market("Total Goals", ["Over 2.5", "Under 2.5"]) == [("ou", "2.5", "over"),
+                                                                         ("ou", "2.5", "under")]
+    # Line only in the market name
+    assert normalize_market("Over/Under 3.5", ["Over", "Under"]) == [("ou", "3.5", "over"), ("ou", "3.5", "under")]
+
+
+def test_other_totals_keep_their_own_market():
+    goals = normalize_market("Total Goals", ["Over 9.5", "Under 9.5"])
+    corners = normalize_market("Total Corners", ["Over 9.5", "Under 9.5"])
+    first_half = normalize_market("1st Half Total", ["Over 9.5", "Under 9.5"])
+    assert corners == [("total corners", "9.5", "over"), ("total corners", "9.5", "under")]
+    assert first_half == [("1st half total", "9.5", "over"), ("1st half total", "9.5", "under")]
+    assert not set(goals) & set(corners) and not set(goals) & set(first_half)
+
+
+def test_other_totals_do_not_overwrite_goal_prices():
+    prices = {}
+    prices.update(build_prices(normalize_market("Total Goals", ["Over 2.5", "Under 2.5"]), ["1.90", "1.95"]))
+    prices.update(build_prices(normalize_market("Total Corners", ["Over 2.5", "Under 2.5"]), ["1.01", "15.0"]))
+    assert prices[("ou", "2.5", "over")] == 1.90
+    assert prices[("ou", "2.5", "under")] == 1.95
+
+
+def test_btts_and_unknown_markets():
+    assert normalize_market("Both Teams To Score", ["Yes", "No", "Maybe"]) == [("btts", "", "yes"),
+                                                                              ("btts", "", "no"), None]
+    assert normalize_market("Double Chance", ["1X"]) == [("double chance", "", "1x")]
+
+
+def test_build_prices_drops_missing_odds():
+    assert build_prices(MATCH_RESULT_KEYS, ["2,10", "N/A", "3.4"]) == {MATCH_RESULT_KEYS[0]: 2.1,
+                                                                      MATCH_RESULT_KEYS[2]: 3.4}
+    assert main_market_prices(["1.5", "2.5", "9"], sport="tennis") == {MONEYLINE_KEYS[0]: 1.5,
+                                                                      MONEYLINE_KEYS[1]: 2.5}
+    assert math.isnan(parse_odds("-"))
+
+
+def test_parse_ladder_skips_unusable_levels():
+    assert parse_ladder([["2.0", "10"], ["x", "5"], ["2.1", "0"], [2.2]]) == ((2.0, 10.0),)
@@ -0,0 +1,69 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from utils.OddsMovement import OddsMovement  # noqa: E402
+
+KEY = ("soccer", ("a", "b"), "Betano", ("1x2", "", "1"))
+
+
+def window_volatility(prices):
+    returns = [math.log(b) - math.log(a) for a, b in zip(prices, prices[1:])]
+    if len(returns) < 2:
+        return 0.0
+    mean = sum(returns) / len(returns)
+    return math.sqrt(sum(r * r for r in returns) / len(returns) - mean * mean)
+
+
+def test_running_sums_match_the_window_after_eviction():
+    movement = OddsMovement(horizon=100, capacity=8, move_threshold=10, premium_threshold=10)
+    prices = [2.0, 2.1, 1.95, 2.05, 2.2, 2.0, 1.9, 2.3, 2.1, 2.4, 2.25, 2.15]
+    ticks = []
+    for i, price in enumerate(prices):
+        t = 1000 + i * 15
+        movement.tick(KEY, t, price)
+        ticks.append((t, price))
+        # What should be left: at most capacity samples, none older than the horizon
+        kept = [p for s, p in ticks if s >= t - 100][-8:]
+        row = movement.index[KEY]
+        assert movement.count[row] == len(kept)
+        assert movement.volatility[row] == pytest.approx(window_volatility(kept), abs=1e-9)
+
+
+def test_unchanged_quotes_and_stale_ticks_are_ignored():
+    movement = OddsMovement()
+    movement.tick(KEY, 1000, 2.0)
+    movement.tick(KEY, 1010, 2.0)
+    movement.tick(KEY, 995, 2.5)  # older than the last sample
+    assert movement.count[movement.index[KEY]] == 1
+
+
+def test_steam_and_drift_signals():
+    movement = OddsMovement(move_threshold=0.05)
+    movement.tick(KEY, 1000, 2.0)
+    movement.tick(KEY, 1030, 1.8)
+    assert [s['kind'] for s in movement.take_new()] == ['steam']
+    assert movement.mark(*KEY) == '▼'
+    movement.tick(KEY, 1060, 2.3)
+    assert [s['kind'] for s in movement.take_new()] == ['drift']
+    assert movement.take_new() == []
+
+
+def test_off_mid_signal_against_the_exchange():
+    movement = OddsMovement(move_threshold=1, premium_threshold=0.04)
+    movement.tick(KEY, 1000, 2.0, mid=2.0)
+    movement.tick(KEY, 1030, 2.0, mid=1.8)
+    assert movement.active()[0]['kind'] == 'off_mid'
+
+
+def test_prune_frees_rows_for_reuse_and_growth():
+    movement = OddsMovement(horizon=60, series=2)
+    keys = [KEY[:2] + (f"P{i}",) + KEY[3:] for i in range(3)]
+    for key in keys:
+        movement.tick(key, 1000, 2.0)
+    assert len(movement.keys) == 4  # grew past the initial two series
+    movement.tick(keys[0], 1100, 2.1)
+    movement.prune(now=1100)
+    assert set(movement.index) == {keys[0]}
+    assert len(movement.free) == 3
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from utils.OpportunityLifecycle import OpportunityTracker
+
+
+def iso(seconds):
+    return datetime.fromtimestamp(seconds).isoformat()
+
+
+def opportunity(profit, detected_at, captured_at, providers=None):
+    return {'sport': "soccer", 'match_key': "a|b", 'market': "1x2", 'line': "", 'outcome': "1",
+            'providers': providers or {'back': "Betano", 'lay': "OrbitX"}, 'profit': profit,
+            'detected_at': iso(detected_at), 'captured_at': iso(captured_at)}
+
+
+def test_lifecycle_from_first_detection_to_close():
+    tracker = OpportunityTracker()
+    t = 1_800_000_000
+    assert tracker.observe([opportunity(1.0, t, t - 2)], now=t) == []
+    tracker.observe([opportunity(3.0, t + 10, t + 7)], now=t + 10)
+    # Same tick again: no new latency sample
+    tracker.observe([opportunity(2.0, t + 20, t + 7)], now=t + 20)
+    closed = tracker.observe([], now=t + 30)
+    assert len(closed) == 1
+    lifecycle = closed[0]
+    assert lifecycle.duration == 20
+    assert lifecycle.peak_profit == 3.0 and lifecycle.peak_at == t + 10
+    assert lifecycle.detections == 2
+    assert list(tracker.latencies) == [2, 3]
+    stats = tracker.stats()
+    assert stats['open'] == 0 and stats['closed'] == 1
+    assert stats['latency_max'] == 3 and stats['duration_p50'] == 20
+
+
+def test_different_legs_are_different_opportunities():
+    tracker = OpportunityTracker()
+    t = 1_800_000_000
+    tracker.observe([opportunity(1.0, t, t), opportunity(1.0, t, t, {'back': "Efbet", 'lay': "OrbitX"})], now=t)
+    assert tracker.stats()['open'] == 2
+
+
+def test_outpaced_share():
+    tracker = OpportunityTracker()
+    t = 1_800_000_000
+    tracker.observe([opportunity(1.0, t, t - 5)], now=t)  # 5 s latency
+    tracker.observe([opportunity(1.0, t + 2, t - 5)], now=t + 2)
+    tracker.observe([], now=t + 4)  # lived 2 s, shorter than the latency
+    assert tracker.stats()['outpaced'] == 1.0
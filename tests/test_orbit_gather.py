@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("pyppeteer")
+pytest.importorskip("bs4")
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from utils.OrbitGather import OrbitXScraper  # noqa: E402
+
+
+def cell(side, level, odds, amount):
+    return (f'<div class="biab_{side}-{level}"><span class="styles_betOdds__bxapE">{odds}</span>'
+            f'<span class="biab_bet-amount">{amount}</span></div>')
+
+
+@pytest.mark.parametrize("text, amount", [
+    ("€1,234", 1234.0), ("1.2K", 1200.0), ("3M", 3000000.0), ("€ 15.50", 15.5), ("2k", 2000.0),
+    ("", None), ("N/A", None), (None, None),
+])
+def test_parse_amount(text, amount):
+    assert OrbitXScraper.parse_amount(text) == amount
+
+
+def test_ladder_keeps_every_priced_level_best_first():
+    markup = cell('lay', 0, "2.10", "€120") + cell('lay', 1, "-", "€5") + cell('lay', 2, "2.30", "1.5K")
+    container = BeautifulSoup(f'<div>{markup}</div>', 'html.parser')
+    assert OrbitXScraper().extract_ladder(container, 'lay') == [[2.1, 120.0], [2.3, 1500.0]]
+    assert OrbitXScraper().extract_ladder(container, 'back') == []
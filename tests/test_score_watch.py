@@ -0,0 +1,49 @@
+import asyncio
+
+from utils.MatchRecords import ProviderMatch
+from utils.ScoreWatch import ScoreWatch, parse_score, scores_agree
+
+
+def quotes(*scores):
+    return [ProviderMatch(["a", "b"], score=score) for score in scores]
+
+
+def test_scores_compare_only_when_shaped_alike():
+    assert parse_score("2 - 1") == (2, 1) and parse_score("N/A") is None
+    assert scores_agree(quotes("1-0", "1:0", "N/A"))
+    assert not scores_agree(quotes("1-0", "0-0"))
+    assert scores_agree(quotes("6-4 3-2", "1-0"))  # set score next to a games-only score
+
+
+def test_hold_only_applies_to_fast_path_sports():
+    watch = ScoreWatch(["soccer"])
+    assert watch.hold("a|b", "soccer", quotes("1-0", "0-0"))
+    assert not watch.hold("c|d", "basketball", quotes("50-48", "52-48"))
+    assert watch.held_count() == 1
+    assert not watch.hold("a|b", "soccer", quotes("1-0", "1-0"))
+    assert watch.held_count() == 0
+
+
+def test_score_change_wakes_the_other_providers_once():
+    async def scenario():
+        watch = ScoreWatch(["soccer"], min_gap=60)
+        sleepers = [asyncio.ensure_future(watch.wait(site, "soccer", 5)) for site in ("Betano", "Efbet")]
+        await asyncio.sleep(0)
+        watch.observe("WinBet", "soccer", {"m1": "0-0"})
+        assert watch.observe("WinBet", "soccer", {"m1": "1-0"}) == ["m1"]
+        return await asyncio.gather(*sleepers), watch.wakeups
+
+    woken, wakeups = asyncio.run(scenario())
+    assert woken == [True, True] and wakeups == 2
+
+
+def test_other_sports_are_not_woken():
+    async def scenario():
+        watch = ScoreWatch(["soccer"])
+        sleeper = asyncio.ensure_future(watch.wait("Betano", "basketball", 0.05))
+        await asyncio.sleep(0)
+        watch.observe("WinBet", "basketball", {"m1": "10-8"})
+        watch.observe("WinBet", "basketball", {"m1": "12-8"})
+        return await sleeper
+
+    assert asyncio.run(scenario()) is False
@@ -0,0 +1,49 @@
+import struct
+import sys
+import uuid
+
+import pytest
+
+from utils.SharedBoard import SharedBoardWriter, SharedBoardReader
+
+
+@pytest.fixture
+def block():
+    writer = SharedBoardWriter(f"mbot_test_{uuid.uuid4().hex[:8]}", slot_size=4096)
+    reader = SharedBoardReader(writer.name)
+    if sys.platform != 'win32':
+        # Reader and writer share this process's resource tracker, which attaching told to forget the block
+        from multiprocessing import resource_tracker
+        resource_tracker.register(writer.shm._name, 'shared_memory')
+    yield writer, reader
+    reader.close()
+    writer.close()
+
+
+def test_reader_sees_each_new_snapshot_once(block):
+    writer, reader = block
+    assert reader.read() is None
+    assert writer.publish({'n': 1}) == 1
+    assert reader.read() == (1, {'n': 1})
+    assert reader.read() is None
+    writer.publish({'n': 2})
+    writer.publish({'n': 3})
+    assert reader.read() == (3, {'n': 3})
+
+
+def test_torn_slot_is_retried_then_skipped(block):
+    writer, reader = block
+    writer.publish({'n': 1})
+    # A writer reusing slot 1 zeroes its stamp before copying the payload in
+    struct.pack_into('<Q', writer.shm.buf, 8 + 16 * 1, 0)
+    assert reader.read(retries=3) is None
+    assert reader.seq == 0
+    # Once the stamp is back the same snapshot reads fine
+    struct.pack_into('<Q', writer.shm.buf, 8 + 16 * 1, 1)
+    assert reader.read() == (1, {'n': 1})
+
+
+def test_snapshot_larger_than_a_slot_is_skipped(block):
+    writer, reader = block
+    assert writer.publish({'rows': "x" * 5000}) is None
+    assert writer.seq == 0 and reader.read() is None
@@ -0,0 +1,82 @@
+import gzip
+import json
+
+from utils.SnapshotApi import SnapshotApi
+
+
+def row(key, odds, provider="Betano"):
+    return {'match_key': key, 'teams': key.split("|"), 'minutes': 10, 'odds': {provider: {'1': odds}}}
+
+
+def snapshot(soccer_rows, opportunities=(), tennis_rows=None):
+    sports = {'soccer': {'rows': soccer_rows, 'opportunities': list(opportunities), 'signals': []}}
+    if tennis_rows is not None:
+        sports['tennis'] = {'rows': tennis_rows, 'opportunities': [], 'signals': []}
+    return {'published_at': 1.0, 'sports': sports}
+
+
+def api():
+    return SnapshotApi(sports=["soccer", "tennis", "basketball"], providers=["Betano", "OrbitX"])
+
+
+def get(api, path, **query):
+    status, etag, body, gzipped = api.respond(path, {k: [str(v)] for k, v in query.items()})
+    return status, etag, json.loads(body), gzipped
+
+
+def test_sequence_only_moves_when_the_board_changes():
+    board = api()
+    assert board.publish(snapshot([row("a|b", 2.0)])) == 1
+    _, etag, _, _ = get(board, '/board')
+    assert board.publish(snapshot([row("a|b", 2.0)])) == 1
+    assert get(board, '/board')[1] == etag
+    assert board.publish(snapshot([row("a|b", 2.1)])) == 2
+    assert get(board, '/board')[1] != etag
+
+
+def test_etag_names_the_content_of_each_resource():
+    board = api()
+    board.publish(snapshot([row("a|b", 2.0)], opportunities=[{'profit': 1.0}]))
+    opportunities = get(board, '/opportunities')[1]
+    board.publish(snapshot([row("a|b", 2.5)], opportunities=[{'profit': 1.0}]))
+    assert get(board, '/opportunities')[1] == opportunities
+
+
+def test_delta_groups_rows_and_removals_by_sport():
+    board = api()
+    board.publish(snapshot([row("a|b", 2.0), row("c|d", 3.0)], tennis_rows=[row("e|f", 1.5)]))
+    board.publish(snapshot([row("a|b", 2.2)], tennis_rows=[]))
+    status, _, delta, _ = get(board, '/board', since=1)
+    assert status == 200 and delta['full'] is False
+    assert delta['rows'] == {'soccer': [row("a|b", 2.2)]}
+    assert delta['removed'] == {'soccer': ["c|d"], 'tennis': ["e|f"]}
+    assert get(board, '/board', since=1, sport="tennis")[2]['rows'] == {}
+
+
+def test_since_outside_the_history_gets_the_full_board():
+    board = SnapshotApi(history=2)
+    for odds in (2.0, 2.1, 2.2, 2.3):
+        board.publish(snapshot([row("a|b", odds)]))
+    assert get(board, '/board', since=1)[2]['full'] is True
+    assert get(board, '/board', since=3)[2]['full'] is False
+    assert get(board, '/board', since=99)[2]['full'] is True
+
+
+def test_unknown_names_and_bad_input():
+    board = api()
+    board.publish(snapshot([row("a|b", 2.0)]))
+    assert get(board, '/board', sport="curling")[0] == 404
+    assert get(board, '/providers/Nobody')[0] == 404
+    assert get(board, '/nowhere')[0] == 404
+    assert get(board, '/board', since="x")[0] == 400
+    # Known but idle: empty, not missing
+    assert get(board, '/board', sport="basketball")[:1] == (200,)
+    assert get(board, '/providers/OrbitX')[2]['sports'] == {'soccer': []}
+
+
+def test_large_bodies_are_gzipped_once():
+    board = api()
+    board.publish(snapshot([row(f"home {i}|away {i}", 2.0) for i in range(100)]))
+    status, etag, body, gzipped = board.respond('/board', {})
+    assert json.loads(gzip.decompress(gzipped)) == json.loads(body)
+    assert board.respond('/board', {})[3] is gzipped
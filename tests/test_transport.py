@@ -0,0 +1,100 @@
+from utils.Transport import InProcessChannel, SnapshotPublisher, SnapshotReceiver, row_digest
+
+
+class Recorder:
+    """Channel that keeps the messages instead of delivering them."""
+
+    def __init__(self):
+        self.generation = 0
+        self.messages = []
+
+    def send(self, message):
+        self.messages.append(message)
+        return True
+
+
+def rows(*teams):
+    return [{'teams': [team, "x"], 'odds': ["2.0"], 'timestamp': "t"} for team in teams]
+
+
+def stream_rows(receiver, site="Betano", sport="soccer"):
+    return sorted(row['teams'][0] for row in receiver.rows(site, sport)[1])
+
+
+def test_sequence_numbers_and_keyframes():
+    channel = Recorder()
+    publisher = SnapshotPublisher(channel, keyframe_every=3)
+    for _ in range(7):
+        publisher.publish("Betano", "soccer", rows("a"))
+    publisher.publish("Efbet", "soccer", rows("a"))
+    assert [m['seq'] for m in channel.messages] == [1, 2, 3, 4, 5, 6, 7, 1]
+    assert [m['kind'] for m in channel.messages[:7]] == ['snapshot', 'delta', 'delta', 'snapshot', 'delta', 'delta',
+                                                          'snapshot']
+
+
+def test_keyframe_every_one_sends_only_snapshots():
+    channel = Recorder()
+    publisher = SnapshotPublisher(channel, keyframe_every=1)
+    for _ in range(3):
+        publisher.publish("Betano", "soccer", rows("a"))
+    assert {m['kind'] for m in channel.messages} == {'snapshot'}
+
+
+def test_lost_channel_messages_force_a_snapshot():
+    channel = Recorder()
+    publisher = SnapshotPublisher(channel, keyframe_every=10)
+    publisher.publish("Betano", "soccer", rows("a"))
+    channel.generation += 1
+    publisher.publish("Betano", "soccer", rows("a"))
+    assert channel.messages[-1]['kind'] == 'snapshot'
+
+
+def test_deltas_add_and_remove_rows_without_timestamps():
+    receiver = SnapshotReceiver()
+    publisher = SnapshotPublisher(InProcessChannel(receiver), keyframe_every=10)
+    publisher.publish("Betano", "soccer", rows("a", "b"), captured_at=100)
+    publisher.publish("Betano", "soccer", rows("b", "c"), captured_at=110)
+    version, kept, captured_at = receiver.rows("Betano", "soccer")
+    assert sorted(row['teams'][0] for row in kept) == ["b", "c"]
+    assert version == 2 and captured_at == 110
+    assert all('timestamp' not in row for row in kept)
+    publisher.publish("Betano", "soccer", [], captured_at=120)
+    assert receiver.rows("Betano", "soccer")[1] == []
+
+
+def test_gap_waits_for_the_next_snapshot():
+    channel = Recorder()
+    publisher = SnapshotPublisher(channel, keyframe_every=4)
+    for teams in (("a",), ("a", "b"), ("b",), ("b", "c"), ("c",)):
+        publisher.publish("Betano", "soccer", rows(*teams))
+    receiver = SnapshotReceiver()
+    first, second, third, keyframe, after = channel.messages
+    receiver.receive(first)
+    receiver.receive(third)  # second lost
+    assert receiver.gaps == 1
+    assert stream_rows(receiver) == ["a"]  # last consistent rows, the delta was not applied
+    assert receiver.metrics()[("Betano", "soccer")]['synced'] is False
+    receiver.receive(keyframe)
+    receiver.receive(after)
+    assert stream_rows(receiver) == ["c"]
+    assert receiver.metrics()[("Betano", "soccer")]['synced'] is True
+
+
+def test_duplicates_are_ignored_and_a_new_epoch_starts_over():
+    channel = Recorder()
+    SnapshotPublisher(channel).publish("Betano", "soccer", rows("a"))
+    receiver = SnapshotReceiver()
+    receiver.receive(channel.messages[0])
+    receiver.receive(channel.messages[0])
+    assert receiver.rows("Betano", "soccer")[0] == 1
+    # A restarted sender numbers from 1 again under a new epoch
+    restarted = SnapshotPublisher(channel)
+    restarted.publish("Betano", "soccer", rows("z"))
+    receiver.receive(channel.messages[-1])
+    version, kept, _ = receiver.rows("Betano", "soccer")
+    assert version == 2 and [row['teams'][0] for row in kept] == ["z"]
+    assert receiver.gaps == 0
+
+
+def test_row_digest_ignores_key_order():
+    assert row_digest({'a': 1, 'b': 2}) == row_digest({'b': 2, 'a': 1})